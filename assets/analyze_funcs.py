@@ -1,9 +1,22 @@
+import hashlib
+import io
 import itertools
+import json
 import numpy as np
 import pandas as pd
-import seaborn as sns
-import matplotlib.pyplot as plt
 import streamlit as st
+from models.schedule_quality import (matrices_conteo, matriz_parejas_mixtas,
+                                     indices_partidos, contar_simetrica, RIVALES)
+
+
+def _graficos():
+    """Importa matplotlib y seaborn recién cuando se dibuja (no en el arranque de la app).
+
+    numpy/pandas no se difieren: pandas ya importa numpy y los motores los usan.
+    """
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+    return plt, sns
 
 
 def get_unique_players(fixture):
@@ -12,43 +25,46 @@ def get_unique_players(fixture):
 
 
 def build_matrices(fixture, players):
-    """Construye matrices de parejas y enfrentamientos."""
-    matrix_parejas = pd.DataFrame(0, index=players, columns=players)
-    matrix_enfrentamientos = pd.DataFrame(0, index=players, columns=players)
+    """Construye matrices de parejas y enfrentamientos (conteo con NumPy, DataFrame al final)."""
+    parejas, enfrentamientos = matrices_conteo(fixture, players)
+    matrix_parejas = pd.DataFrame(parejas, index=players, columns=players)
+    matrix_enfrentamientos = pd.DataFrame(enfrentamientos, index=players, columns=players)
+    return matrix_parejas, matrix_enfrentamientos
 
-    for ronda in fixture:
-        for partido in ronda["partidos"]:
-            p1, p2 = partido["pareja1"], partido["pareja2"]
-
-            # compañeros
-            for a, b in itertools.combinations(p1, 2):
-                matrix_parejas.loc[a, b] += 1
-                matrix_parejas.loc[b, a] += 1
-            for a, b in itertools.combinations(p2, 2):
-                matrix_parejas.loc[a, b] += 1
-                matrix_parejas.loc[b, a] += 1
-
-            # enfrentamientos
-            for a in p1:
-                for b in p2:
-                    matrix_enfrentamientos.loc[a, b] += 1
-                    matrix_enfrentamientos.loc[b, a] += 1
 
-    return matrix_parejas, matrix_enfrentamientos
+def fixture_hash(fixture):
+    """Huella del fixture: clave de las figuras en cache (cambia si cambia cualquier ronda)."""
+    return hashlib.sha1(json.dumps(fixture, sort_keys=True, default=list).encode()).hexdigest()
 
 
-def plot_heatmap(matrix, title, cmap, cbar_label):
-    """Genera y muestra un mapa de calor triangular superior."""
+def figura_a_png(fig):
+    """Renderiza la figura a PNG (bytes) y la cierra para liberar memoria."""
+    plt, _ = _graficos()
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png", bbox_inches="tight")
+    plt.close(fig)
+    return buffer.getvalue()
+
+
+def crear_heatmap(matrix, title, cmap, cbar_label):
+    """Genera un mapa de calor triangular superior."""
+    plt, sns = _graficos()
     mask = np.tril(np.ones_like(matrix, dtype=bool))
     fig, ax = plt.subplots(figsize=(8, 6))
     sns.heatmap(matrix, mask=mask, annot=True, fmt="d", cmap=cmap, ax=ax,
                 cbar_kws={"label": cbar_label})
-    plt.title(title)
-    st.pyplot(fig)
+    ax.set_title(title)
+    return fig
 
 
-def analyze_descansos(fixture, players):
-    """Analiza descansos consecutivos y genera mapa de calor."""
+def plot_heatmap(matrix, title, cmap, cbar_label):
+    """Genera y muestra un mapa de calor triangular superior."""
+    st.pyplot(crear_heatmap(matrix, title, cmap, cbar_label))
+
+
+def descansos_consecutivos(fixture, players):
+    """Tabla de descansos consecutivos y figura del mapa de descansos por ronda."""
+    plt, sns = _graficos()
     descanso_data = []
     for p in players:
         pattern = [1 if p in r["descansan"] else 0 for r in fixture]
@@ -58,53 +74,66 @@ def analyze_descansos(fixture, players):
     df_desc["consec_descansos"] = df_desc.apply(
         lambda x: max((sum(1 for _ in g) for k, g in itertools.groupby(x) if k == 1), default=0), axis=1
     )
-
-    st.dataframe(df_desc[["consec_descansos"]].rename(columns={"consec_descansos": "Descansos consecutivos"}))
+    tabla = df_desc[["consec_descansos"]].rename(columns={"consec_descansos": "Descansos consecutivos"})
 
     fig, ax = plt.subplots(figsize=(8, 4))
     sns.heatmap(pd.DataFrame(descanso_data, index=players), cmap="YlOrRd", cbar=False, ax=ax)
-    plt.title("Mapa de descansos por ronda (1 = descanso)")
-    plt.xlabel("Ronda")
-    plt.ylabel("Jugador")
+    ax.set_title("Mapa de descansos por ronda (1 = descanso)")
+    ax.set_xlabel("Ronda")
+    ax.set_ylabel("Jugador")
+    return tabla, fig
+
+
+def analyze_descansos(fixture, players):
+    """Analiza descansos consecutivos y genera mapa de calor."""
+    tabla, fig = descansos_consecutivos(fixture, players)
+    st.dataframe(tabla)
     st.pyplot(fig)
 
 
+@st.cache_data(max_entries=16, show_spinner=False)
+def analisis_png(clave, _fixture):
+    """
+    Figuras del análisis ya renderizadas (PNG), en cache por fixture_hash.
+
+    El fixture no se hashea (prefijo _): la clave es 'clave', así un rerun
+    por cargar un resultado no vuelve a dibujar con seaborn.
+    """
+    players = get_unique_players(_fixture)
+    matrix_parejas, matrix_enfrentamientos = build_matrices(_fixture, players)
+    tabla, fig_descansos = descansos_consecutivos(_fixture, players)
+    return {
+        "parejas": figura_a_png(crear_heatmap(matrix_parejas, "Frecuencia de jugadores que compartieron pareja",
+                                              "PuBuGn", "Veces como pareja")),
+        "enfrentamientos": figura_a_png(crear_heatmap(matrix_enfrentamientos, "Frecuencia de jugadores que se enfrentaron",
+                                                      "OrRd", "Veces como oponentes")),
+        "descansos": figura_a_png(fig_descansos),
+        "tabla_descansos": tabla,
+    }
+
+
 def analyze_algorithm_results(fixture):
     """Ejecuta todo el análisis visual y estadístico del algoritmo."""
     st.markdown("## 🔍 Análisis de Resultados del Algoritmo")
 
-    players = get_unique_players(fixture)
-    matrix_parejas, matrix_enfrentamientos = build_matrices(fixture, players)
+    figuras = analisis_png(fixture_hash(fixture), fixture)
 
     st.markdown("#### 🤝 Mapa de calor: quién jugó con quién (parejas)")
-    plot_heatmap(matrix_parejas, "Frecuencia de jugadores que compartieron pareja", "PuBuGn", "Veces como pareja")
+    st.image(figuras["parejas"])
 
     st.markdown("#### ⚔️ Mapa de calor: quién jugó contra quién")
-    plot_heatmap(matrix_enfrentamientos, "Frecuencia de jugadores que se enfrentaron", "OrRd", "Veces como oponentes")
+    st.image(figuras["enfrentamientos"])
 
     st.markdown("#### 💤 Análisis de descansos consecutivos")
-    analyze_descansos(fixture, players)
+    st.dataframe(figuras["tabla_descansos"])
+    st.image(figuras["descansos"])
 
 
 def heatmap_parejas_mixtas(fixture, male_players, female_players):
+    plt, sns = _graficos()
     # Crear matriz mujer vs hombre
-    matrix = pd.DataFrame(0, index=female_players, columns=male_players)
-
-    for ronda in fixture:
-        for partido in ronda["partidos"]:
-            p1a, p1b = partido["pareja1"]
-            p2a, p2b = partido["pareja2"]
-
-            # --- Pareja 1 ---
-            # Detectar quién es mujer y quién es hombre
-            for f, m in [(p1a, p1b), (p1b, p1a)]:
-                if f in female_players and m in male_players:
-                    matrix.loc[f, m] += 1
-
-            # --- Pareja 2 ---
-            for f, m in [(p2a, p2b), (p2b, p2a)]:
-                if f in female_players and m in male_players:
-                    matrix.loc[f, m] += 1
+    matrix = pd.DataFrame(matriz_parejas_mixtas(fixture, female_players, male_players),
+                          index=female_players, columns=male_players)
 
     # === Heatmap ===
     fig, ax = plt.subplots(figsize=(6, 4))
@@ -115,6 +144,7 @@ def heatmap_parejas_mixtas(fixture, male_players, female_players):
 
 
 def heatmap_descansos_por_ronda(fixture, all_players):
+    plt, sns = _graficos()
     # Matriz jugadores x rondas
     matrix = pd.DataFrame(
         0,
@@ -137,22 +167,12 @@ def heatmap_descansos_por_ronda(fixture, all_players):
 
     return matrix, fig
 
-import itertools
-
 def heatmap_enfrentamientos(fixture, all_players):
-    # Matriz base
-    matrix = pd.DataFrame(0, index=all_players, columns=all_players)
-
+    plt, sns = _graficos()
     # Contabilizar enfrentamientos
-    for ronda in fixture:
-        for partido in ronda["partidos"]:
-            p1 = partido["pareja1"]
-            p2 = partido["pareja2"]
-
-            for a in p1:
-                for b in p2:
-                    matrix.loc[a, b] += 1
-                    matrix.loc[b, a] += 1
+    indices = indices_partidos(fixture, all_players)
+    matrix = pd.DataFrame(contar_simetrica(indices, RIVALES, len(all_players)),
+                          index=all_players, columns=all_players)
 
     # Mostrar solo parte superior para evitar duplicados
     mask = np.tril(np.ones_like(matrix, dtype=bool))
@@ -165,3 +185,74 @@ def heatmap_enfrentamientos(fixture, all_players):
     ax.set_ylabel("Jugador")
 
     return matrix, fig
+
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def analisis_mixto_png(clave, _fixture, male_players, female_players):
+    """Heatmaps del torneo mixto renderizados (PNG), en cache por fixture_hash."""
+    all_players = list(male_players) + list(female_players)
+    _, fig_mixtas = heatmap_parejas_mixtas(_fixture, male_players, female_players)
+    _, fig_enfrentamientos = heatmap_enfrentamientos(_fixture, all_players)
+    _, fig_descansos = heatmap_descansos_por_ronda(_fixture, all_players)
+    return {
+        "parejas_mixtas": figura_a_png(fig_mixtas),
+        "enfrentamientos": figura_a_png(fig_enfrentamientos),
+        "descansos": figura_a_png(fig_descansos),
+    }
+
+
+def analyze_mixto_results(fixture, male_players, female_players):
+    """Muestra el análisis del torneo mixto (figuras en cache por fixture)."""
+    st.markdown("## 🔍 Análisis del Fixture")
+    figuras = analisis_mixto_png(fixture_hash(fixture), fixture, male_players, female_players)
+
+    st.markdown("#### 🚺🚹 Parejas mixtas")
+    st.image(figuras["parejas_mixtas"])
+
+    st.markdown("#### ⚔️ Enfrentamientos")
+    st.image(figuras["enfrentamientos"])
+
+    st.markdown("#### 😴 Descansos por ronda")
+    st.image(figuras["descansos"])
+
+
+def heatmap_parejas_mixtas_visualizar(matrix, male_players, female_players):
+    """
+    Toma la matriz Hombre-Mujer y la grafica en Streamlit.
+    """
+    plt, sns = _graficos()
+    fig, ax = plt.subplots(figsize=(len(male_players) * 1.5, len(female_players) * 1.5))
+    sns.heatmap(matrix, annot=True, fmt="d", cmap="Purples", linewidths=.5, linecolor='black', ax=ax,
+                cbar_kws={"label": "Veces como Pareja Mixta"})
+    ax.set_title("Combinaciones de Parejas Mixtas (Hombre vs. Mujer) 🤝")
+    ax.set_xlabel("Hombres")
+    ax.set_ylabel("Mujeres")
+    st.pyplot(fig)
+
+
+def analyze_algorithm_results_mixto(fixture, male_players, female_players):
+    """Ejecuta todo el análisis visual y estadístico del algoritmo, incluyendo el análisis mixto."""
+    st.markdown("## 🔍 Análisis de Resultados del Algoritmo")
+
+    players = get_unique_players(fixture)
+    matrix_parejas, matrix_enfrentamientos = build_matrices(fixture, players)
+
+    st.markdown("### 1. Parejas Mixtas (Balanceo por género) 🚺🚹")
+    matrix_mixta, _ = heatmap_parejas_mixtas(fixture, male_players, female_players)
+    heatmap_parejas_mixtas_visualizar(matrix_mixta, male_players, female_players)
+    st.divider()
+
+    st.markdown("### 2. Parejas Generales (Compañeros totales)")
+    plot_heatmap(matrix_parejas,
+                 "Frecuencia de jugadores que compartieron pareja (General)",
+                 "PuBuGn", "Veces como pareja")
+    st.divider()
+
+    st.markdown("### 3. Enfrentamientos (Oponentes)")
+    plot_heatmap(matrix_enfrentamientos,
+                 "Frecuencia de jugadores que se enfrentaron",
+                 "OrRd", "Veces como oponentes")
+    st.divider()
+
+    st.markdown("### 4. Análisis de Descansos 😴")
+    analyze_descansos(fixture, players)
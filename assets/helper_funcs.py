@@ -1,7 +1,9 @@
 import streamlit as st
-import itertools,random
+import numpy as np
 import pandas as pd
-from typing import List, Dict, Tuple
+from models.match_store import RegistroPartidos
+from models.round_robin import round_robin
+from models.ranking import RankingIndividual
 
 #Streamlit Functions
 def initialize_vars(defaults:dict):
@@ -11,96 +13,90 @@ def initialize_vars(defaults:dict):
         else:
             pass
 
+# Fragmento de rerun aislado: un cambio adentro solo vuelve a correr esa función,
+# no la página entera (st.fragment desde streamlit 1.37, antes experimental_fragment).
+# Sin soporte queda como función normal y la página se re-ejecuta completa, como antes.
+fragmento = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None) or (lambda funcion: funcion)
+
+def fragmento_cada(segundos):
+    """Como fragmento, pero además se re-ejecuta solo cada 'segundos' (pantallas de espectadores)"""
+    decorador = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None)
+    if decorador is None:
+        return lambda funcion: funcion
+    return decorador(run_every=segundos)
+
+def _mover_ronda(clave, delta, num_rondas):
+    st.session_state[clave] = min(max(1, st.session_state[clave] + delta), num_rondas)
+
+def ventana_rondas(num_rondas, clave, actual=1, adelanto=1):
+    """
+    Navegación por rondas: dibuja anterior / selector / siguiente y devuelve
+    los índices (base 0) de las rondas a mostrar, la actual y 'adelanto' más.
+    Las demás rondas no crean widgets, así que el costo de dibujar la página
+    no crece con el fixture; sus resultados quedan en el registro de partidos.
+
+    Args:
+        num_rondas: Rondas del fixture
+        clave: Key de session_state con la ronda actual (base 1)
+        actual: Ronda inicial si la clave todavía no existe (ej. registro.ronda_pendiente())
+        adelanto: Rondas siguientes que se muestran junto a la actual
+    """
+    if num_rondas <= 0:
+        return range(0)
+    if not 1 <= st.session_state.get(clave, 0) <= num_rondas:
+        st.session_state[clave] = min(max(1, actual), num_rondas)
+
+    col_ant, col_sel, col_sig = st.columns([1, 4, 1])
+    with col_ant:
+        st.button("◀", key=f"{clave}_anterior", use_container_width=True,
+                  disabled=st.session_state[clave] == 1,
+                  on_click=_mover_ronda, args=(clave, -1, num_rondas))
+    with col_sel:
+        if num_rondas > 1:
+            st.select_slider("Ronda", options=list(range(1, num_rondas + 1)), key=clave)
+    with col_sig:
+        st.button("▶", key=f"{clave}_siguiente", use_container_width=True,
+                  disabled=st.session_state[clave] == num_rondas,
+                  on_click=_mover_ronda, args=(clave, 1, num_rondas))
+
+    inicio = st.session_state[clave] - 1
+    return range(inicio, min(num_rondas, inicio + 1 + adelanto))
+
 #Tournament Logic Functions
-def generar_fixture_parejas(parejas, num_canchas):
-    """Genera las rondas con máximo num_canchas partidos por ronda.Parejas fijas previamente establecidas"""
-    enfrentamientos = list(itertools.combinations(parejas, 2))
-    random.shuffle(enfrentamientos)
-    rondas = []
-    pendientes = enfrentamientos.copy()
+def generar_fixture_parejas(parejas, num_canchas, seed=None):
+    """
+    Genera las rondas con máximo num_canchas partidos por ronda. Parejas fijas previamente establecidas.
+    Round Robin por el método del círculo (models.round_robin): O(M), mismo
+    fixture para la misma semilla y descansos repartidos entre las parejas.
+    """
+    return round_robin(parejas, num_canchas, seed=seed)
 
-    while pendientes:
-        ronda = []
-        disponibles = set(parejas)
-        for _ in range(num_canchas):
-            for match in pendientes:
-                p1, p2 = match
-                if p1 in disponibles and p2 in disponibles:
-                    ronda.append(match)
-                    disponibles.remove(p1)
-                    disponibles.remove(p2)
-                    pendientes.remove(match)
-                    break
-        rondas.append(ronda)
-    return rondas
+def calcular_ranking_parejas(registro: RegistroPartidos) -> pd.DataFrame:
+    """Calcula el ranking acumulado de parejas fijas según los resultados del registro."""
+    cargados = registro.cargados()
+    puntajes = np.zeros(len(registro.participantes), dtype=np.int64)
+    # En parejas fijas cada lado es un solo participante (la pareja)
+    np.add.at(puntajes, registro.lados[cargados, 0, 0], registro.puntos[cargados, 0])
+    np.add.at(puntajes, registro.lados[cargados, 1, 0], registro.puntos[cargados, 1])
 
-def calcular_ranking_parejas(parejas: List[str], resultados: Dict[Tuple[str,str], Tuple[int,int]]) -> pd.DataFrame:
-    """Calcula el ranking acumulado según los resultados ingresados."""
-    
-    # 1. Uniformizar los nombres de las parejas al formato usado en el fixture (' & ')
-    # Si las parejas vienen como ['serg-mari', ...], se convierten a ['serg & mari', ...]
-    nombres_uniformes = [
-        p.replace("-", " & ") if "-" in p else p
-        for p in parejas
-    ]
-    
-    # 2. Inicializar el diccionario de puntajes con los nombres uniformes
-    puntajes = {p: 0 for p in nombres_uniformes}
-    
-    # 3. Calcular los puntajes (ahora las claves p1 y p2 coincidirán)
-    for (p1, p2), (r1, r2) in resultados.items():
-        # Aquí, p1 y p2 ya están en el formato 'serg & mari', y la clave existe.
-        puntajes[p1] += r1
-        puntajes[p2] += r2
-        
-    # 4. Generar el ranking
-    ranking = pd.DataFrame(
-        sorted(puntajes.items(), key=lambda x: x[1], reverse=True),
-        columns=["Jugador", "Puntos"]
-    )
+    # Orden estable: en empate queda el orden de inscripción
+    orden = np.argsort(-puntajes, kind="stable")
+    ranking = pd.DataFrame({
+        "Jugador": [registro.participantes[i] for i in orden],
+        "Puntos": puntajes[orden],
+    })
     return ranking
 
-def calcular_ranking_individual(resultados: Dict[Tuple[str, str], Tuple[int, int]], 
-                                fixture: List[Dict] = None) -> pd.DataFrame:
+def calcular_ranking_individual(registro: RegistroPartidos) -> pd.DataFrame:
     """
-    Calcula el ranking individual acumulado según los resultados ingresados.
+    Calcula el ranking individual acumulado según los resultados del registro.
     Cada jugador recibe los puntos que su pareja obtuvo en cada partido.
     Los ayudantes NO suman puntos (verificado con valido_para).
-    """
-    puntajes = {}
-    
-    # Construir mapa de válidos si tenemos fixture
-    validos_map = {}
-    if fixture:
-        for ronda_data in fixture:
-            for partido in ronda_data["partidos"]:
-                pareja1_str = " & ".join(partido["pareja1"])
-                pareja2_str = " & ".join(partido["pareja2"])
-                validos_map[(pareja1_str, pareja2_str)] = partido.get("valido_para", 
-                                                                       partido["pareja1"] + partido["pareja2"])
 
-    for (p1, p2), (r1, r2) in resultados.items():
-        # Separar los nombres de cada jugador en la pareja
-        jugadores_p1 = p1.split(" & ")
-        jugadores_p2 = p2.split(" & ")
-        
-        # Obtener lista de jugadores válidos para este partido
-        validos = validos_map.get((p1, p2), jugadores_p1 + jugadores_p2)
-        
-        # Sumar puntos SOLO a jugadores válidos (no ayudantes)
-        for j in jugadores_p1:
-            if j in validos:
-                puntajes[j] = puntajes.get(j, 0) + r1
-        for j in jugadores_p2:
-            if j in validos:
-                puntajes[j] = puntajes.get(j, 0) + r2
-
-    # Ordenar ranking
-    ranking = pd.DataFrame(
-        sorted(puntajes.items(), key=lambda x: x[1], reverse=True),
-        columns=["Jugador", "Puntos"]
-    )
-    return ranking
+    En las páginas conviene ranking_torneo() (assets/persistencia.py): el
+    ranking incremental del torneo compartido, que no recalcula.
+    """
+    return RankingIndividual(registro).tabla()
 
 def render_nombre(jugador, ayudantes):
     if jugador in ayudantes:
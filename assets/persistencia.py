@@ -0,0 +1,108 @@
+import copy
+import sqlite3
+import sys
+import streamlit as st
+from models.match_store import registro_en_sesion
+from models.ranking import RankingIndividual
+from models.tournament_registry import registro_torneos
+
+# Claves de session_state que hacen falta para volver a dibujar un torneo
+# (con tournament_key igual la página no regenera el fixture)
+CLAVES_SESION = ("page", "mod", "mixto_op", "num_fields", "num_players", "num_pts", "num_sets",
+                 "players", "parejas", "hombres", "mujeres", "code_play", "tournament_key")
+
+
+def guardar_torneo(modo):
+    """
+    Publica el torneo recién generado en el registro del proceso (y en la
+    base) y deja su id en la URL (?torneo=<id>): al refrescar o reconectar
+    se recupera desde ahí, y ?ver=<id> es la vista de espectadores.
+    Sin base de torneos el torneo queda solo en la sesión, como antes.
+    """
+    sesion = {k: st.session_state[k] for k in CLAVES_SESION if k in st.session_state}
+    try:
+        torneo = registro_torneos().crear(modo, st.session_state.registro, sesion)
+    except (OSError, sqlite3.Error) as e:
+        print(f"torneos-db: torneo solo en la sesión ({e})", file=sys.stderr)
+        torneo = None
+    if torneo is None:
+        return
+    st.session_state.torneo_id = torneo.id
+    st.query_params["torneo"] = torneo.id
+
+
+def _torneo_en_sesion():
+    """
+    El torneo compartido de la sesión, o None. Si el registro del proceso lo
+    volvió a levantar de la base (salió de memoria), la sesión pasa a usar
+    ese registro de partidos.
+    """
+    torneo_id = st.session_state.get("torneo_id")
+    torneo = registro_torneos().obtener(torneo_id) if torneo_id else None
+    if torneo is not None and st.session_state.get("registro") is not torneo.registro:
+        st.session_state.fixture = torneo.registro.fixture
+        st.session_state.registro = torneo.registro
+    return torneo
+
+
+def guardar_resultado(ronda, cancha, p1, p2):
+    """
+    Para los callbacks de resultados: la única escritura del partido. Va al
+    torneo compartido (bajo su lock: ranking, espectadores y base, sin esperar
+    al disco); sin torneo publicado, al registro de la sesión.
+
+    Returns:
+        El id del partido
+    """
+    torneo = _torneo_en_sesion()
+    if torneo is not None:
+        return registro_torneos().registrar(torneo.id, ronda, cancha, p1, p2)
+    return registro_en_sesion(st.session_state).registrar(ronda, cancha, p1, p2)
+
+
+def ranking_torneo(calcular=None):
+    """
+    Ranking del torneo en curso, el mismo para todos los dispositivos y
+    espectadores (se calcula una vez por resultado nuevo).
+
+    Args:
+        calcular: Ranking del modo sobre el registro (ej. calcular_ranking_parejas);
+                  None = ranking individual (americano, mixto)
+    """
+    torneo = _torneo_en_sesion()
+    if torneo is not None:
+        return torneo.tabla(calcular)
+    registro = registro_en_sesion(st.session_state)
+    return calcular(registro) if calcular is not None else RankingIndividual(registro).tabla()
+
+
+def olvidar_torneo():
+    """Al salir del torneo (volver o empezar otro): la URL deja de apuntar a él"""
+    st.session_state.pop("torneo_id", None)
+    if "torneo" in st.query_params:
+        del st.query_params["torneo"]
+
+
+def restaurar_torneo():
+    """
+    Si la sesión es nueva y la URL trae ?torneo=<id>, retoma el torneo del
+    registro del proceso (o de la base): claves de sesión, fixture y el
+    registro de partidos compartido, con los resultados ya cargados.
+
+    Returns:
+        True si se restauró un torneo
+    """
+    torneo_id = st.query_params.get("torneo")
+    if not torneo_id or "torneo_id" in st.session_state:
+        return False
+    torneo = registro_torneos().obtener(torneo_id)
+    if torneo is None:
+        del st.query_params["torneo"]
+        return False
+
+    for clave, valor in torneo.sesion.items():
+        st.session_state[clave] = copy.deepcopy(valor)  # las listas de jugadores no se comparten
+    st.session_state.fixture = torneo.registro.fixture
+    st.session_state.registro = torneo.registro
+    st.session_state.torneo_id = torneo_id
+    return True
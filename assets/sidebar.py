@@ -3,18 +3,11 @@ from PIL import Image
 
 def sidebar_style():
 
-    sidebar_bg = """
-    <style>
-        /* Target all sidebar titles with class starting with e1dbuyne */
-        [class^="st-emotion-cache"][class*="e1dbuyne"] {
-            color: #5E3187;
-            font-weight: bold;
-            font-size: 20px;
-        }
-        </style>
-    """
-
+    # El estilo de los títulos del sidebar está en assets/theme.py
     logo = Image.open("assets/logo_playzone_purple.png")
-    st.markdown(sidebar_bg, unsafe_allow_html=True)
     with st.sidebar:
-        st.image(logo)
\ No newline at end of file
+        st.image(logo)
+        # Torneo en curso: la vista de solo lectura para el público
+        if st.session_state.get("torneo_id"):
+            st.markdown("**Espectadores**")
+            st.code(f"?ver={st.session_state.torneo_id}", language=None)
\ No newline at end of file
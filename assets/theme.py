@@ -0,0 +1,392 @@
+"""Tema de la app: una hoja de estilos por página, armada una sola vez por
+proceso (functools.lru_cache) a partir de bloques compartidos, y las
+tarjetas de partido en un solo bloque HTML por ronda.
+
+Streamlit borra en cada rerun completo los elementos que no se vuelven a
+emitir, así que la hoja se inyecta con un único st.markdown por rerun
+(streamlit_app.py, antes de la página). Los reruns de fragmento (carga de
+resultados) no la reenvían.
+"""
+import functools
+import html
+from typing import List, Optional
+import streamlit as st
+
+# Oculta el menú, el pie y la navegación automática de páginas
+_BASE = """
+#MainMenu {visibility: hidden;}
+footer {visibility: hidden;}
+[data-testid="stSidebarNav"] {display: none;}
+
+/* Target all sidebar titles with class starting with e1dbuyne */
+[class^="st-emotion-cache"][class*="e1dbuyne"] {
+    color: #5E3187;
+    font-weight: bold;
+    font-size: 20px;
+}
+"""
+
+
+_LOGIN = """
+/* Input fields */
+input[type="text"], input[type="password"] {
+    background-color: #ffffff !important;
+    color: #000000 !important;
+    border: 1px solid #cccccc;
+    border-radius: 6px;
+    padding: 0.5rem;
+}
+
+/* Placeholder */
+input::placeholder {
+    color: #888888 !important;
+}
+"""
+
+
+def _titulo(font_size: int, margin_bottom: int) -> str:
+    return f"""
+.main-title {{
+    text-align: center;
+    font-size: {font_size}px;
+    color: #6C13BF; /* Morado/Púrpura */
+    font-weight: 700;
+    margin-bottom: {margin_bottom}px;
+}}
+"""
+
+
+def _boton(margin_top: int) -> str:
+    return f"""
+/* === BOTÓN === */
+.stButton button {{
+    width: 100%;
+    background-color: #0B0B19;
+    color: white;
+    font-weight: 700;
+    font-size: 18px;
+    padding: 1em;
+    border-radius: 10px;
+    margin-top: {margin_top}px;
+}}
+"""
+
+
+_HOME = """
+/* === ALTURA UNIFORME PARA TODOS LOS INPUTS === */
+
+/* Number Input Container - Forzar altura total */
+.stNumberInput {
+    margin-bottom: 25px !important;
+}
+
+.stNumberInput > div {
+    height: 52px !important;
+    display: flex !important;
+    align-items: center !important;
+}
+
+/* Number Input - Campo de texto */
+.stNumberInput input {
+    height: 52px !important;
+    min-height: 52px !important;
+    max-height: 52px !important;
+    width: 100% !important;
+    padding: 0 18px !important;
+    font-size: 20px !important;
+    border-radius: 10px !important;
+    background-color: #f7f7fb !important;
+    line-height: 52px !important;
+    box-sizing: border-box !important;
+}
+
+/* Number Input - Botones +/- */
+.stNumberInput button {
+    height: 52px !important;
+    min-height: 52px !important;
+    max-height: 52px !important;
+    color: white !important;
+    display: flex !important;
+    align-items: center !important;
+    justify-content: center !important;
+}
+
+/* Contenedor de los botones */
+.stNumberInput > div > div {
+    height: 52px !important;
+    display: flex !important;
+    align-items: stretch !important;
+}
+
+/* === SELECTBOX IGUALADOS === */
+.stSelectbox {
+    margin-bottom: 25px !important;
+}
+
+div[data-baseweb="select"] {
+    height: 52px !important;
+    min-height: 52px !important;
+    max-height: 52px !important;
+}
+
+div[data-baseweb="select"] > div {
+    height: 52px !important;
+    min-height: 52px !important;
+    max-height: 52px !important;
+    padding: 0 18px !important;
+    font-size: 20px !important;
+    border-radius: 10px !important;
+    background-color: #f7f7fb !important;
+    display: flex !important;
+    align-items: center !important;
+    width: 100% !important;
+    box-sizing: border-box !important;
+}
+
+/* === LABELS MÁS GRANDES Y EN NEGRILLA === */
+label, .stSelectbox label, .stNumberInput label {
+    font-size: 24px !important;
+    font-weight: 700 !important;
+    color: #0B0B19 !important;
+    margin-bottom: 6px !important;
+}
+
+/* Forzar negrilla en todos los labels */
+div[data-testid="stNumberInput"] label,
+div[data-testid="stSelectbox"] label {
+    font-weight: 700 !important;
+}
+
+/* === RESUMEN DEL TORNEO === */
+.tournament-summary {
+    background-color: #f0e6ff;
+    border-left: 4px solid #6C13BF;
+    border-radius: 8px;
+    padding: 20px 25px;
+    margin: 35px 0 25px 0;
+}
+
+.summary-text {
+    color: #0B0B19;
+    font-size: 18px;
+    line-height: 1.6;
+    margin: 0;
+}
+
+.summary-text strong {
+    color: #6C13BF;
+    font-weight: 700;
+}
+
+div[data-testid="column"] { padding: 0 30px !important; }
+section.main > div { padding-top: 30px; }
+"""
+
+_REGISTRO = """
+.player-label {
+    font-weight: 700 !important;
+    font-size: 20px !important;
+    color: #0B0B19 !important;
+}
+.gender-title {
+    font-size: 24px;
+    font-weight: 700;
+    margin-top: 30px;
+    margin-bottom: 10px;
+    color: #0B0B19;
+}
+
+/* Input estilo tarjeta */
+.stTextInput input {
+    background-color: #f7f7fb !important;
+    border-radius: 12px !important;
+    font-size: 18px !important;
+    padding: 18px 10px !important;
+    height: 45px !important;        /* un poco más alto */
+    color: #0B0B19 !important;
+    text-align: center !important;
+    font-weight: 500 !important;
+    border: 1px solid #ddd !important;
+    width: 95% !important;          /* solo un poco más angosto */
+    box-sizing: border-box !important;
+}
+
+.stTextInput input:focus {
+    border: 2px solid #6C13BF !important;
+    outline: none !important;
+}
+
+/* Espaciado entre columnas */
+div[data-testid="column"] {
+    padding-left: 45px !important;
+    padding-right: 45px !important;
+}
+"""
+
+# Tarjetas de partido: una fila (grilla) por ronda, alineada con las columnas de los inputs
+_TARJETAS = """
+.match-row {
+    display: grid;
+    gap: 1rem;
+}
+.match-title {
+    font-weight: 700;
+    font-size: 18px;
+    color: #0B0B19;
+    margin-bottom: 10px;
+}
+.team-name {
+    font-weight: 600;
+    color: #0B0B19;
+    font-size: 16px;
+    text-align: center;
+}
+.vs {
+    font-weight: 800;
+    font-size: 20px;
+    color: #6C13BF;
+    text-align: center;
+    margin-top: 8px;
+    margin-bottom: 8px;
+}
+.helpers {
+    font-size: 14px;
+    color: #6C13BF;
+    margin-top: 5px;
+}
+
+.stNumberInput input {
+    background-color: #5E3187 !important;
+    color: white !important;                 /* makes the number white */
+    font-weight: 700 !important;             /* makes it bold */
+}
+
+.stNumberInput button {
+    color: white !important;           /* color de los signos + y - */
+}
+"""
+
+# Parejas fijas y sets
+_TARJETA_PLANA = """
+.match-card {
+    background-color: #f7f7fb;
+    border-radius: 15px;
+    padding: 20px;
+    margin-bottom: 25px;
+    box-shadow: 0 2px 6px rgba(0,0,0,0.07);
+}
+"""
+
+# Todos contra todos y mixto
+_TARJETA_RELIEVE = """
+.match-card {
+    background: linear-gradient(145deg, #ffffff, #f0f0f5); /* leve degradado para volumen */
+    border-radius: 18px;
+    padding: 22px;
+    margin-bottom: 25px;
+    box-shadow: 0 8px 20px rgba(0,0,0,0.15); /* sombra más profunda */
+    border: 1px solid rgba(108, 19, 191, 0.1); /* borde tenue en tono principal */
+    transition: transform 0.15s ease, box-shadow 0.15s ease; /* efecto al pasar el mouse */
+}
+"""
+
+_MIXTO = """
+.match-card:hover {
+    transform: translateY(-2px);
+    box-shadow: 0 12px 28px rgba(0,0,0,0.2);
+}
+.match-title {
+    text-align: center;
+}
+.team-name {
+    padding: 8px;
+}
+"""
+
+_FINAL_SETS = """
+.final-match-card {
+    background-color: #5E3187; 
+    color: white;
+    border-radius: 15px;
+    padding: 20px;
+    margin-bottom: 25px;
+    box-shadow: 0 5px 15px rgba(0,0,0,0.3);
+}
+.final-title {
+    font-weight: 700;
+    font-size: 24px;
+    color: white;
+    margin-bottom: 10px;
+    text-align: center;
+}
+.final-team-name {
+    font-weight: 700;
+    color: white;
+    font-size: 20px;
+    text-align: center;
+}
+.final-vs {
+    font-weight: 800;
+    font-size: 24px;
+    color: #00CED1; /* CAMBIO: Color turquesa estilizado */
+    text-align: center;
+    margin-top: 15px;
+    margin-bottom: 15px;
+}
+/* Ajuste para que los number_input sean menos disruptivos visualmente */
+/* Nota: Streamlit aplica sus propios estilos, estos son hacks CSS */
+div[data-testid="stForm"] div.stNumberInput input { 
+    text-align: center;
+    font-weight: 700;
+}
+"""
+
+# Bloques de cada página (torneo depende de la modalidad)
+_PAGINAS = {
+    "login": (_LOGIN,),
+    "home": (_titulo(36, 50), _HOME, _boton(20)),
+    "players_setup": (_titulo(32, 40), _REGISTRO, _boton(40)),
+    "players_setupMixto": (_titulo(32, 40), _REGISTRO, _boton(40)),
+    "torneo/Parejas Fijas": (_titulo(32, 40), _TARJETAS, _TARJETA_PLANA, _boton(40)),
+    "torneo/Todos Contra Todos": (_titulo(32, 40), _TARJETAS, _TARJETA_RELIEVE, _boton(40)),
+    "torneo_mixto": (_titulo(32, 40), _TARJETAS, _TARJETA_RELIEVE, _MIXTO, _boton(20)),
+    "torneo_sets": (_titulo(32, 40), _TARJETAS, _TARJETA_PLANA, _FINAL_SETS, _boton(40)),
+    "espectador": (_titulo(32, 40), _TARJETAS, _TARJETA_PLANA),
+}
+
+
+@functools.lru_cache(maxsize=None)
+def hoja_de_estilos(pagina: str, modalidad: Optional[str] = None) -> str:
+    """
+    La hoja completa (<style>...</style>) de una página, armada una vez por proceso.
+
+    Args:
+        pagina: Valor de st.session_state.page
+        modalidad: st.session_state.mod (solo cambia la página "torneo")
+    """
+    bloques = _PAGINAS.get(f"{pagina}/{modalidad}", _PAGINAS.get(pagina, ()))
+    return "<style>" + _BASE + "".join(bloques) + "</style>"
+
+
+def aplicar_tema(pagina: str, modalidad: Optional[str] = None):
+    """Inyecta la hoja de la página: una sola llamada por rerun completo"""
+    st.markdown(hoja_de_estilos(pagina, modalidad), unsafe_allow_html=True)
+
+
+def tarjeta_partido(titulo: str, pareja1: str, pareja2: str, ayudantes: str = "") -> str:
+    """HTML de una tarjeta de partido (los nombres se escapan)"""
+    extra = f'<div class="helpers">Ayudantes: {html.escape(ayudantes)}</div>' if ayudantes else ""
+    return (f'<div class="match-card"><div class="match-title">{html.escape(titulo)}</div>'
+            f'<div class="team-name">{html.escape(pareja1)}</div><div class="vs">VS</div>'
+            f'<div class="team-name">{html.escape(pareja2)}</div>{extra}</div>')
+
+
+def fila_tarjetas(tarjetas: List[str]):
+    """
+    Las tarjetas de una ronda en un solo st.markdown, en una grilla de tantas
+    columnas como tarjetas (debajo van los st.columns con los inputs).
+    """
+    if not tarjetas:
+        return
+    st.markdown(f'<div class="match-row" style="grid-template-columns: repeat({len(tarjetas)}, 1fr);">'
+                + "".join(tarjetas) + "</div>", unsafe_allow_html=True)
@@ -0,0 +1,198 @@
+"""Benchmark de los motores de fixture sobre una grilla jugadores x canchas x semillas.
+
+Cada corrida registra tiempo, memoria pico (tracemalloc, en una segunda
+corrida para no inflar el tiempo) y la calidad del fixture según
+models.schedule_quality.evaluar_fixture. El reporte es JSON (y CSV opcional).
+
+Uso (desde la raíz del repo):
+    python -m benchmarks.benchmark_engines --out bench.json
+    python -m benchmarks.benchmark_engines --engines v3 v4 --players 8 16 32 --courts 2 4
+    python -m benchmarks.benchmark_engines --out nuevo.json --baseline bench.json
+    python -m benchmarks.benchmark_engines --engines v3 mixto_v2 --players 24 40 --perfil
+"""
+import argparse
+import csv
+import importlib
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from typing import List, Dict, Any, Callable
+
+from models import schedule_library
+from models.profiling import perfilando
+from models.schedule_quality import evaluar_fixture
+
+# nombre -> (módulo, tipo); "todos" recibe (jugadores, canchas, seed), "mixto" (hombres, mujeres, canchas, ...)
+ENGINES = {
+    "v1": ("models.AllvsAll_Random_modelv1", "todos"),
+    "v2": ("models.AllvsAll_Random_modelv2", "todos"),
+    "v3": ("models.AllvsAll_Random_modelv3", "todos"),
+    "v4": ("models.AllvsAll_Random_modelv4", "todos"),
+    "exact": ("models.AllvsAll_Exact", "todos"),
+    "annealing": ("models.AllvsAll_Annealing", "todos"),  # v3 + recocido (2 s por fixture)
+    "mixto": ("models.AmericanoMixto.AllvsAll_Mixto", "mixto"),
+    "mixto_v2": ("models.AmericanoMixto.AllvsAll_MixtoV2", "mixto"),
+    "mixto_gemini": ("models.AmericanoMixto.AllvsAll_Mixto_gemini", "mixto"),
+}
+
+PLAYERS = [8, 12, 16, 20, 24, 32, 40, 48, 64]
+COURTS = [1, 2, 3, 4, 5, 6, 7, 8]
+SEEDS = [1, 2, 3]
+
+
+def cargar_motor(nombre: str) -> Callable[[List[str], int, int], Dict[str, Any]]:
+    """Devuelve una función (jugadores, canchas, seed) -> salida del motor"""
+    modulo, tipo = ENGINES[nombre]
+    mod = importlib.import_module(modulo)
+    if tipo == "todos":
+        return lambda jugadores, canchas, seed: mod.generar_torneo_todos_contra_todos(jugadores, canchas, seed=seed)
+
+    def correr_mixto(jugadores, canchas, seed):
+        # No todos los motores mixtos reciben semilla: se fija la global
+        random.seed(seed)
+        mitad = len(jugadores) // 2
+        return mod.generar_torneo_mixto(jugadores[:mitad], jugadores[mitad:], canchas, 32)
+    return correr_mixto
+
+
+def medir(motor: Callable, jugadores: List[str], canchas: int, seed: int, memoria: bool = True,
+          perfil: bool = False) -> Dict[str, Any]:
+    """Corre un motor una vez y devuelve tiempo, memoria pico y calidad (y el perfil por fases)"""
+    inicio = time.perf_counter()
+    out = motor(jugadores, canchas, seed)
+    tiempo = time.perf_counter() - inicio
+
+    pico = None
+    if memoria:
+        tracemalloc.start()
+        motor(jugadores, canchas, seed)
+        pico = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    # También en una corrida aparte: la instrumentación no entra en tiempo_s
+    perfiles = []
+    if perfil:
+        with perfilando() as perfiles:
+            motor(jugadores, canchas, seed)
+
+    if "error" in out:
+        raise ValueError(out["error"])
+    calidad = evaluar_fixture(out["rondas"], jugadores)
+    return {
+        "tiempo_s": tiempo,
+        "memoria_pico_kb": pico / 1024 if pico is not None else None,
+        "rondas": calidad["rondas"],
+        "repeticiones_pareja": calidad["repeticiones_pareja"],
+        "cobertura_rivales": calidad["cobertura_rivales"],
+        "partidos_ayudante": calidad["partidos_ayudante"],
+        "max_descansos_seguidos": calidad["max_descansos_seguidos"],
+        "diferencia_partidos": calidad["diferencia_partidos"],
+        **({"perfil": perfiles[0].resumen()} if perfiles else {}),  # el primero es el motor de afuera
+    }
+
+
+def correr(engines: List[str], players: List[int], courts: List[int], seeds: List[int],
+           memoria: bool = True, perfil: bool = False) -> List[Dict[str, Any]]:
+    """Corre toda la grilla; los errores quedan registrados en la fila"""
+    filas = []
+    for nombre in engines:
+        try:
+            motor = cargar_motor(nombre)
+        except ImportError as e:
+            print(f"{nombre}: no se pudo importar ({e})", file=sys.stderr)
+            filas.append({"engine": nombre, "error": f"import: {e}"})
+            continue
+
+        for n in players:
+            if ENGINES[nombre][1] == "mixto" and n % 2:
+                continue
+            jugadores = [f"J{i}" for i in range(n)]
+            for c in courts:
+                if c > n // 4:
+                    continue  # canchas que no se pueden llenar
+                for seed in seeds:
+                    fila = {"engine": nombre, "jugadores": n, "canchas": c, "seed": seed}
+                    try:
+                        fila.update(medir(motor, jugadores, c, seed, memoria, perfil))
+                    except Exception as e:
+                        fila["error"] = f"{type(e).__name__}: {e}"
+                    filas.append(fila)
+                print(f"{nombre} n={n} c={c} listo", file=sys.stderr)
+    return filas
+
+
+def comparar(filas: List[Dict[str, Any]], base: List[Dict[str, Any]], tolerancia: float) -> List[str]:
+    """Configuraciones cuyo tiempo medio empeoró más que 'tolerancia' (0.2 = 20%) respecto de base"""
+    def tiempos(rows):
+        agrupado = {}
+        for r in rows:
+            if "tiempo_s" in r:
+                agrupado.setdefault((r["engine"], r["jugadores"], r["canchas"]), []).append(r["tiempo_s"])
+        return {k: sum(v) / len(v) for k, v in agrupado.items()}
+
+    actual, anterior = tiempos(filas), tiempos(base)
+    regresiones = []
+    for clave, t in sorted(actual.items()):
+        # por debajo de 1 ms el ruido domina
+        if clave in anterior and t > anterior[clave] * (1 + tolerancia) and t - anterior[clave] > 1e-3:
+            regresiones.append(f"{clave[0]} n={clave[1]} c={clave[2]}: {anterior[clave]:.4f}s -> {t:.4f}s")
+    return regresiones
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark de motores de fixture")
+    parser.add_argument("--engines", nargs="+", default=list(ENGINES), choices=list(ENGINES))
+    parser.add_argument("--players", nargs="+", type=int, default=PLAYERS)
+    parser.add_argument("--courts", nargs="+", type=int, default=COURTS)
+    parser.add_argument("--seeds", nargs="+", type=int, default=SEEDS)
+    parser.add_argument("--out", default="bench_engines.json", help="Reporte JSON")
+    parser.add_argument("--csv", help="Además escribir las filas en CSV")
+    parser.add_argument("--sin-memoria", action="store_true", help="No medir memoria pico (la mitad de tiempo)")
+    parser.add_argument("--sin-biblioteca", action="store_true", help="Medir las heurísticas sin la biblioteca de fixtures")
+    parser.add_argument("--perfil", action="store_true",
+                        help="Agregar el tiempo por fase y las llamadas de puntaje de cada corrida")
+    parser.add_argument("--baseline", help="Reporte anterior para detectar regresiones de tiempo")
+    parser.add_argument("--tolerancia", type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    if args.sin_biblioteca:
+        schedule_library.USAR_BIBLIOTECA = False
+
+    filas = correr(args.engines, args.players, args.courts, args.seeds, memoria=not args.sin_memoria, perfil=args.perfil)
+    reporte = {
+        "fecha": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "cpus": os.cpu_count(),
+        "biblioteca": schedule_library.USAR_BIBLIOTECA,
+        "grilla": {"engines": args.engines, "players": args.players, "courts": args.courts, "seeds": args.seeds},
+        "resultados": filas,
+    }
+    with open(args.out, "w") as f:
+        json.dump(reporte, f, indent=1)
+
+    if args.csv:
+        columnas = ["engine", "jugadores", "canchas", "seed", "tiempo_s", "memoria_pico_kb", "rondas",
+                    "repeticiones_pareja", "cobertura_rivales", "partidos_ayudante",
+                    "max_descansos_seguidos", "diferencia_partidos", "error"]
+        with open(args.csv, "w", newline="") as f:
+            # El perfil (anidado) queda solo en el JSON
+            writer = csv.DictWriter(f, fieldnames=columnas, extrasaction="ignore")
+            writer.writeheader()
+            writer.writerows(filas)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regresiones = comparar(filas, json.load(f)["resultados"], args.tolerancia)
+        for r in regresiones:
+            print(f"REGRESIÓN {r}")
+        return 1 if regresiones else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,78 @@
+"""Mide el tiempo de importación de las páginas y módulos que carga la app.
+
+Cada módulo se importa en un proceso nuevo (import en frío), varias veces, y
+se reporta la mediana junto con las librerías pesadas que quedaron cargadas.
+Sirve para comprobar que matplotlib/seaborn no se importan al arrancar.
+
+Uso (desde la raíz del repo):
+    python -m benchmarks.startup_time
+    python -m benchmarks.startup_time --repeticiones 10 --out startup.json
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from typing import List, Dict, Any
+
+MODULOS = [
+    "pages.torneo",
+    "pages.torneo_mixto",
+    "pages.torneo_sets",
+    "assets.analyze_funcs",
+    "models.AmericanoMixto.AllvsAll_MixtoV2",
+    "models.AllvsAll_Random_modelv3",
+]
+
+PESADOS = ["matplotlib", "seaborn", "numpy", "pandas", "streamlit"]
+
+_SCRIPT = """
+import json, sys, time
+t = time.perf_counter()
+import {modulo}
+dt = time.perf_counter() - t
+print(json.dumps({{"tiempo_s": dt, "cargados": [m for m in {pesados!r} if m in sys.modules]}}))
+"""
+
+
+def medir_modulo(modulo: str, repeticiones: int) -> Dict[str, Any]:
+    """Importa 'modulo' en 'repeticiones' procesos nuevos"""
+    tiempos, cargados = [], []
+    for _ in range(repeticiones):
+        proceso = subprocess.run([sys.executable, "-c", _SCRIPT.format(modulo=modulo, pesados=PESADOS)],
+                                 capture_output=True, text=True)
+        if proceso.returncode != 0:
+            return {"modulo": modulo, "error": proceso.stderr.strip().splitlines()[-1]}
+        dato = json.loads(proceso.stdout.strip().splitlines()[-1])
+        tiempos.append(dato["tiempo_s"])
+        cargados = dato["cargados"]
+    return {
+        "modulo": modulo,
+        "mediana_s": statistics.median(tiempos),
+        "min_s": min(tiempos),
+        "cargados": cargados,
+    }
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Tiempo de importación en frío de la app")
+    parser.add_argument("--modulos", nargs="+", default=MODULOS)
+    parser.add_argument("--repeticiones", type=int, default=5)
+    parser.add_argument("--out", help="Escribir el resultado en JSON")
+    args = parser.parse_args(argv)
+
+    resultados = [medir_modulo(m, args.repeticiones) for m in args.modulos]
+    for r in resultados:
+        if "error" in r:
+            print(f"{r['modulo']:45s} ERROR {r['error']}")
+        else:
+            print(f"{r['modulo']:45s} {r['mediana_s'] * 1000:8.1f} ms  cargados: {', '.join(r['cargados'])}")
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump({"python": sys.version.split()[0], "resultados": resultados}, f, indent=1)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,371 @@
+"""Recocido simulado (simulated annealing) sobre un fixture ya generado.
+
+Parte de la salida de cualquier motor (v1-v4, mixto) y la mejora con
+intercambios de jugadores entre canchas y entre rondas, con un
+presupuesto de tiempo fijo. Nunca devuelve algo peor que la entrada.
+"""
+import math
+import random
+import time
+import pandas as pd
+from typing import List, Dict, Any, Callable, Optional
+from models.schedule_config import ScheduleConfig
+
+# Pesos del objetivo (mismo orden de prioridades que modelv3)
+GAMES_SPREAD = 10000       # diferencia max-min de partidos válidos
+PARTNER_REPEAT = 8000      # cada repetición de pareja (5000 + 3000 de pareja nueva perdida)
+OPPONENT_REPEAT = 3300     # cada repetición de rival (800 + 2500 de rival nuevo perdido)
+HELPER_SPREAD = 400        # diferencia max-min de partidos como ayudante
+CONSECUTIVE_REST = 300     # cada ronda descansada justo después de otra
+
+
+class ScheduleAnnealer:
+    def __init__(self, rondas: List[Dict], players: List[str],
+                 groups: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            rondas: Fixture in the 'rondas' format returned by every engine
+            players: List of player names
+            groups: Optional player -> group (e.g. gender). Swaps only happen
+                between players of the same group, so mixed pairs stay mixed.
+        """
+        self.players = list(players)
+        self.num_players = len(self.players)
+        self.index = {p: i for i, p in enumerate(self.players)}
+        self.groups = [groups[p] for p in self.players] if groups else None
+
+        # Per round: list of [a, b, c, d] meaning (a & b) vs (c & d), the
+        # helper flag of each slot and the court numbers
+        self.matches: List[List[List[int]]] = []
+        self.helper_slots: List[List[List[bool]]] = []
+        self.courts: List[List[int]] = []
+        for ronda in rondas:
+            quads, flags, courts = [], [], []
+            for partido in ronda["partidos"]:
+                names = list(partido["pareja1"]) + list(partido["pareja2"])
+                ayudantes = partido.get("ayudantes") or []
+                quads.append([self.index[p] for p in names])
+                flags.append([p in ayudantes for p in names])
+                courts.append(partido.get("cancha", len(courts) + 1))
+            self.matches.append(quads)
+            self.helper_slots.append(flags)
+            self.courts.append(courts)
+
+        self.num_rounds = len(self.matches)
+        self.iterations = 0
+        self._rebuild()
+
+    # ------------------------------------------------------------------
+    # Estado y costo
+    # ------------------------------------------------------------------
+    def _key(self, a: int, b: int) -> int:
+        return a * self.num_players + b if a < b else b * self.num_players + a
+
+    def _rebuild(self):
+        """Recompute every counter from self.matches"""
+        n = self.num_players
+        self.partner = [0] * (n * n)
+        self.opponent = [0] * (n * n)
+        self.valid = [0] * n
+        self.helper = [0] * n
+        self.plays = [set() for _ in range(self.num_rounds)]
+        for r in range(self.num_rounds):
+            for k in range(len(self.matches[r])):
+                self._add_match(r, k, 1, {})
+        self.bench = [[p for p in range(n) if p not in self.plays[r]] for r in range(self.num_rounds)]
+        self.consecutive = [self._consecutive_rests(p) for p in range(n)]
+
+    def _add_match(self, r: int, k: int, sign: int, touched: Dict):
+        """Add (sign=1) or remove (sign=-1) match k of round r from the counters"""
+        a, b, c, d = self.matches[r][k]
+        for x, y in ((a, b), (c, d)):
+            key = self._key(x, y)
+            touched.setdefault((0, key), self.partner[key])
+            self.partner[key] += sign
+        for x in (a, b):
+            for y in (c, d):
+                key = self._key(x, y)
+                touched.setdefault((1, key), self.opponent[key])
+                self.opponent[key] += sign
+        for p, is_helper in zip(self.matches[r][k], self.helper_slots[r][k]):
+            if is_helper:
+                self.helper[p] += sign
+            else:
+                self.valid[p] += sign
+            if sign > 0:
+                self.plays[r].add(p)
+            else:
+                self.plays[r].discard(p)
+
+    def _consecutive_rests(self, p: int) -> int:
+        return sum(1 for r in range(1, self.num_rounds)
+                   if p not in self.plays[r] and p not in self.plays[r - 1])
+
+    @staticmethod
+    def _pair_cost(kind: int, count: int) -> int:
+        if count <= 1:
+            return 0
+        return (count - 1) * (PARTNER_REPEAT if kind == 0 else OPPONENT_REPEAT)
+
+    def _player_cost(self) -> int:
+        if not self.num_players:
+            return 0
+        return (GAMES_SPREAD * (max(self.valid) - min(self.valid))
+                + HELPER_SPREAD * (max(self.helper) - min(self.helper))
+                + CONSECUTIVE_REST * sum(self.consecutive))
+
+    def cost(self) -> int:
+        """Total objective, lower is better"""
+        pair_cost = sum(self._pair_cost(0, c) for c in self.partner)
+        pair_cost += sum(self._pair_cost(1, c) for c in self.opponent)
+        return pair_cost + self._player_cost()
+
+    def quality(self) -> Dict[str, int]:
+        """Raw metrics behind the objective"""
+        return {
+            "partner_repeats": sum(c - 1 for c in self.partner if c > 1),
+            "opponent_repeats": sum(c - 1 for c in self.opponent if c > 1),
+            "games_spread": max(self.valid) - min(self.valid) if self.valid else 0,
+            "consecutive_rests": sum(self.consecutive),
+        }
+
+    # ------------------------------------------------------------------
+    # Movimientos
+    # ------------------------------------------------------------------
+    def _replace(self, changes: Dict, rounds_touched: set) -> int:
+        """
+        Apply {(r, k): new_quad} and return the cost delta.
+        Bench lists and consecutive rests are refreshed for the touched rounds.
+        """
+        before_players = self._player_cost()
+        touched: Dict = {}
+        affected = set()
+        # Remove every old match first so 'plays' stays right when two
+        # changed matches share a player
+        for (r, k) in changes:
+            affected.update(self.matches[r][k])
+            self._add_match(r, k, -1, touched)
+        for (r, k), quad in changes.items():
+            self.matches[r][k] = quad
+            affected.update(quad)
+            self._add_match(r, k, 1, touched)
+        for r in rounds_touched:
+            self.bench[r] = [p for p in range(self.num_players) if p not in self.plays[r]]
+        for p in affected:
+            self.consecutive[p] = self._consecutive_rests(p)
+
+        delta = self._player_cost() - before_players
+        for (kind, key), old in touched.items():
+            new = self.partner[key] if kind == 0 else self.opponent[key]
+            delta += self._pair_cost(kind, new) - self._pair_cost(kind, old)
+        return delta
+
+    def _same_group(self, a: int, b: int) -> bool:
+        return self.groups is None or self.groups[a] == self.groups[b]
+
+    def _swap_in_round(self, rng: random.Random):
+        """Swap a player on court with another player (other team, court or bench) of the same round"""
+        r = rng.randrange(self.num_rounds)
+        quads = self.matches[r]
+        if not quads:
+            return 0, None
+        k1 = rng.randrange(len(quads))
+        s1 = rng.randrange(4)
+        p1 = quads[k1][s1]
+        total = 4 * len(quads) + len(self.bench[r])
+        pos = rng.randrange(total)
+        if pos < 4 * len(quads):
+            k2, s2 = divmod(pos, 4)
+            p2 = quads[k2][s2]
+            if k1 == k2 and s1 // 2 == s2 // 2:
+                return 0, None  # misma pareja, no cambia nada
+        else:
+            k2, s2 = None, None
+            p2 = self.bench[r][pos - 4 * len(quads)]
+        if not self._same_group(p1, p2):
+            return 0, None
+
+        old = {(r, k1): quads[k1]}
+        new_q1 = list(quads[k1])
+        new_q1[s1] = p2
+        if k2 is None:
+            changes = {(r, k1): new_q1}
+        elif k2 == k1:
+            new_q1[s2] = p1
+            changes = {(r, k1): new_q1}
+        else:
+            old[(r, k2)] = quads[k2]
+            new_q2 = list(quads[k2])
+            new_q2[s2] = p1
+            changes = {(r, k1): new_q1, (r, k2): new_q2}
+
+        delta = self._replace(changes, {r})
+        return delta, lambda: self._replace(old, {r})
+
+    def _swap_between_rounds(self, rng: random.Random):
+        """
+        Player a plays round r and rests round s, b the opposite:
+        exchange them in both rounds (each keeps the same number of games)
+        """
+        if self.num_rounds < 2:
+            return 0, None
+        r, s = rng.sample(range(self.num_rounds), 2)
+        if not self.matches[r] or not self.bench[r]:
+            return 0, None
+        k1 = rng.randrange(len(self.matches[r]))
+        s1 = rng.randrange(4)
+        a = self.matches[r][k1][s1]
+        if a in self.plays[s]:
+            return 0, None
+        candidates = [b for b in self.bench[r] if b in self.plays[s] and self._same_group(a, b)]
+        if not candidates:
+            return 0, None
+        b = rng.choice(candidates)
+        k2, s2 = next((k, q.index(b)) for k, q in enumerate(self.matches[s]) if b in q)
+
+        old = {(r, k1): self.matches[r][k1], (s, k2): self.matches[s][k2]}
+        new_r = list(self.matches[r][k1])
+        new_r[s1] = b
+        new_s = list(self.matches[s][k2])
+        new_s[s2] = a
+        delta = self._replace({(r, k1): new_r, (s, k2): new_s}, {r, s})
+        return delta, lambda: self._replace(old, {r, s})
+
+    # ------------------------------------------------------------------
+    # Recocido
+    # ------------------------------------------------------------------
+    def run(self, time_budget: float = 2.0, seed: int = None,
+            start_temperature: float = 5000.0, end_temperature: float = 1.0) -> int:
+        """
+        Anneal for at most time_budget seconds (wall clock) and keep the best
+        schedule found. Returns its cost.
+        """
+        rng = random.Random(seed)
+        current = self.cost()
+        best = current
+        best_matches = [[list(q) for q in quads] for quads in self.matches]
+        self.initial_cost = current
+
+        start = time.perf_counter()
+        temperature = start_temperature
+        while best > 0:
+            if self.iterations % 64 == 0:
+                progress = (time.perf_counter() - start) / time_budget if time_budget > 0 else 1.0
+                if progress >= 1.0:
+                    break
+                temperature = start_temperature * (end_temperature / start_temperature) ** progress
+            self.iterations += 1
+
+            if rng.random() < 0.7:
+                delta, undo = self._swap_in_round(rng)
+            else:
+                delta, undo = self._swap_between_rounds(rng)
+            if undo is None:
+                continue
+
+            if delta <= 0 or rng.random() < math.exp(-delta / temperature):
+                current += delta
+                if current < best:
+                    best = current
+                    best_matches = [[list(q) for q in quads] for quads in self.matches]
+            else:
+                undo()
+
+        self.matches = best_matches
+        self._rebuild()
+        self.elapsed = time.perf_counter() - start
+        return best
+
+    # ------------------------------------------------------------------
+    # Salida
+    # ------------------------------------------------------------------
+    def format_for_streamlit(self, num_fields: int = None) -> Dict[str, Any]:
+        """Same output structure as AmericanoTournament.format_for_streamlit"""
+        rondas = []
+        for r in range(self.num_rounds):
+            partidos = []
+            for quad, flags, cancha in zip(self.matches[r], self.helper_slots[r], self.courts[r]):
+                names = [self.players[p] for p in quad]
+                ayudantes = [p for p, is_helper in zip(names, flags) if is_helper]
+                partidos.append({
+                    "cancha": cancha,
+                    "pareja1": names[:2],
+                    "pareja2": names[2:],
+                    "ayudantes": ayudantes,
+                    "valido_para": [p for p in names if p not in ayudantes]
+                })
+            rondas.append({
+                "ronda": r + 1,
+                "partidos": partidos,
+                "descansan": [self.players[p] for p in self.bench[r]]
+            })
+
+        resumen_df = pd.DataFrame([{
+            "jugador": player,
+            "partidos_totales": self.valid[i] + self.helper[i],
+            "partidos_validos": self.valid[i],
+            "partidos_ayudante": self.helper[i]
+        } for i, player in enumerate(self.players)])
+
+        if num_fields is None:
+            num_fields = max((len(quads) for quads in self.matches), default=0)
+        config = ScheduleConfig.americano(self.num_players, num_fields)
+
+        return {
+            "rondas": rondas,
+            "resumen": resumen_df,
+            "stats": {
+                "total_rounds": len(rondas),
+                "players": self.num_players,
+                "fields": num_fields,
+                "target_games": config.target_games,
+                "games_distribution": dict(zip(self.players, self.valid)),
+                "helper_distribution": dict(zip(self.players, self.helper)),
+                "config": config,
+                "annealing": {
+                    "initial_cost": getattr(self, "initial_cost", None),
+                    "final_cost": self.cost(),
+                    "iterations": self.iterations,
+                    "elapsed": getattr(self, "elapsed", 0.0),
+                    **self.quality()
+                }
+            }
+        }
+
+
+def optimizar_fixture(out: Dict[str, Any], jugadores: List[str], num_canchas: int = None,
+                      time_budget: float = 2.0, seed: int = None,
+                      groups: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Mejora la salida de cualquier motor con recocido simulado.
+
+    Args:
+        out: Diccionario devuelto por un motor (se usa out['rondas'])
+        jugadores: Lista de nombres de jugadores
+        num_canchas: Canchas disponibles
+        time_budget: Segundos máximos de optimización
+        seed: Semilla (opcional, para reproducibilidad del recocido)
+        groups: jugador -> grupo para restringir intercambios (p. ej. género)
+    """
+    annealer = ScheduleAnnealer(out["rondas"], jugadores, groups)
+    annealer.run(time_budget, seed)
+    return annealer.format_for_streamlit(num_canchas)
+
+
+def generar_torneo_todos_contra_todos(jugadores: List[str], num_canchas: int,
+                                      seed: int = None, time_budget: float = 2.0,
+                                      engine: Callable[..., Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Drop-in replacement of the v3 generator: runs 'engine' (v3 by default)
+    and then anneals its schedule for at most time_budget seconds.
+
+    Returns:
+        Dictionary with 'rondas', 'resumen', and 'stats'
+    """
+    if engine is None:
+        from models.AllvsAll_Random_modelv3 import generar_torneo_todos_contra_todos as engine
+    base = engine(jugadores, num_canchas, seed=seed)
+    if base.get("biblioteca") or base.get("stats", {}).get("library"):
+        # Precomputed optimal fixture: nothing left to anneal
+        return base
+    return optimizar_fixture(base, jugadores, num_canchas, time_budget, seed)
@@ -0,0 +1,521 @@
+"""Motor exacto (branch and bound) para torneos chicos, de 8 a 16 jugadores.
+
+Busca R = optimal_rounds rondas con todas las canchas llenas, sin parejas
+repetidas y con partidos repartidos de forma pareja (cada jugador juega
+lo o lo+1 partidos), maximizando los rivales distintos cubiertos. Como
+en modelv3, el partido de más se juega de ayudante (no suma puntos).
+Devuelve un certificado: óptimo probado (se alcanzó la cota o se agotó
+la búsqueda) o el mejor encontrado dentro del tiempo límite.
+"""
+import itertools
+import random
+import time
+from typing import List, Dict, Any, Tuple, Optional
+from models.AllvsAll_Random_modelv3 import AmericanoTournament
+from models.schedule_config import ScheduleConfig
+from models.schedule_library import buscar_fixture
+from models.round_robin import rondas_circulo, repartir_en_canchas
+
+MIN_JUGADORES = 8
+MAX_JUGADORES = 16
+
+Partido = Tuple[int, int, int, int]  # (a & b) vs (c & d)
+
+
+class _TiempoAgotado(Exception):
+    pass
+
+
+def _bits(mascara: int) -> int:
+    return bin(mascara).count("1")
+
+
+class ExactSolver:
+    """
+    Branch and bound sobre los huecos (ronda, cancha) con máscaras de bits.
+
+    Restricciones duras: ningún par de jugadores es pareja dos veces; cada
+    jugador juega entre lo = slots // n y hi = lo + 1 partidos (exactamente
+    slots - n*lo jugadores llegan a hi). Objetivo: máximo de pares de
+    rivales distintos.
+
+    Ruptura de simetrías (no pierde soluciones, solo las reetiqueta):
+    - la primera ronda es fija: (0 & 1) vs (2 & 3), (4 & 5) vs (6 & 7), ...
+    - las rondas van ordenadas por su primer partido
+    - en cada ronda los partidos van ordenados por su jugador menor 'a',
+      que es pareja de 'b'; en la otra pareja c < d
+
+    Poda: un jugador que debe jugar todas las rondas que quedan no puede
+    descansar, a nadie le pueden faltar compañeros nuevos para los partidos
+    que le faltan, y la cota de rivales (lo cubierto + lo que cada jugador
+    todavía puede cubrir) tiene que superar a la mejor solución.
+    """
+
+    def __init__(self, num_players: int, num_fields: int, num_rounds: int, time_limit: float = 5.0):
+        self.n = num_players
+        self.c = num_fields
+        self.num_rounds = num_rounds
+        self.time_limit = time_limit
+
+        slots = 4 * num_fields * num_rounds
+        self.lo = slots // num_players
+        self.hi = self.lo + 1 if slots % num_players else self.lo
+        self.extra = slots - num_players * self.lo  # jugadores que juegan hi
+
+        # Cota global: cada jugador ve a lo sumo 2 rivales por partido (y n-1 en total)
+        por_jugador = (self.extra * min(self.n - 1, 2 * self.hi)
+                       + (self.n - self.extra) * min(self.n - 1, 2 * self.lo))
+        self.cota = min(self.n * (self.n - 1) // 2, por_jugador // 2, 4 * num_fields * num_rounds)
+
+        self.nodes = 0
+        self.best_value = -1
+        self.best_rounds: Optional[List[List[Partido]]] = None
+
+    # ------------------------------------------------------------------
+    # Estado
+    # ------------------------------------------------------------------
+    def _reset(self):
+        n = self.n
+        self.partners = [0] * n      # máscara de compañeros ya usados
+        self.opponents = [0] * n     # máscara de rivales ya cubiertos
+        self.games = [0] * n
+        self.at_hi = 0               # jugadores que ya llegaron a hi (con hi > lo)
+        self.covered = 0
+        self.rounds: List[List[Partido]] = []
+
+    def _jugar(self, match: Partido) -> Tuple[int, bool]:
+        a, b, c, d = match
+        self.partners[a] |= 1 << b
+        self.partners[b] |= 1 << a
+        self.partners[c] |= 1 << d
+        self.partners[d] |= 1 << c
+        nuevos = 0
+        for x in (a, b):
+            for y in (c, d):
+                if not self.opponents[x] >> y & 1:
+                    nuevos += 1
+                    self.opponents[x] |= 1 << y
+                    self.opponents[y] |= 1 << x
+        self.covered += nuevos
+        subieron = 0
+        for p in match:
+            self.games[p] += 1
+            if self.hi > self.lo and self.games[p] == self.hi:
+                subieron += 1
+        self.at_hi += subieron
+        return nuevos, subieron
+
+    def _deshacer(self, match: Partido, nuevos: int, subieron: int, previos: Tuple[int, ...]):
+        a, b, c, d = match
+        self.partners[a] &= ~(1 << b)
+        self.partners[b] &= ~(1 << a)
+        self.partners[c] &= ~(1 << d)
+        self.partners[d] &= ~(1 << c)
+        for p, mascara in zip((a, b, c, d), previos):
+            self.opponents[p] = mascara
+        self.covered -= nuevos
+        for p in match:
+            self.games[p] -= 1
+        self.at_hi -= subieron
+
+    # ------------------------------------------------------------------
+    # Poda
+    # ------------------------------------------------------------------
+    def _factible(self, rondas_restantes: int) -> bool:
+        """Al empezar una ronda: a cada jugador le alcanzan las rondas y los compañeros nuevos"""
+        # Compañeros posibles: quienes todavía pueden jugar algún partido
+        pueden = 0
+        for p in range(self.n):
+            if self.games[p] < self.hi:
+                pueden |= 1 << p
+        if _bits(pueden) < 4 * self.c:
+            return False
+        for p in range(self.n):
+            faltan = self.lo - self.games[p]
+            if faltan > rondas_restantes:
+                return False
+            if faltan > 0 and _bits(pueden & ~self.partners[p] & ~(1 << p)) < faltan:
+                return False
+        return True
+
+    def _cota_ronda(self, rondas_restantes: int) -> int:
+        """Rivales cubiertos + lo que cada jugador todavía puede cubrir (2 por partido)"""
+        extra = 0
+        for p in range(self.n):
+            puede = min(self.hi - self.games[p], rondas_restantes)
+            extra += min(self.n - 1 - _bits(self.opponents[p]), 2 * puede)
+        return self.covered + extra // 2
+
+    # ------------------------------------------------------------------
+    # Búsqueda
+    # ------------------------------------------------------------------
+    def _candidatos(self, a: int, usados: int) -> List[Partido]:
+        """Partidos (a, b, c, d) válidos con a como jugador menor, los más prometedores primero"""
+        hi_lleno = self.hi > self.lo and self.at_hi >= self.extra
+        libres = [p for p in range(a + 1, self.n)
+                  if not usados >> p & 1 and self.games[p] < self.hi
+                  and not (hi_lleno and self.games[p] + 1 == self.hi)]
+        candidatos = []
+        for b in libres:
+            if self.partners[a] >> b & 1:
+                continue
+            resto = [p for p in libres if p != b]
+            for i, c in enumerate(resto):
+                for d in resto[i + 1:]:
+                    if self.partners[c] >> d & 1:
+                        continue
+                    nuevos = sum(1 for x in (a, b) for y in (c, d) if not self.opponents[x] >> y & 1)
+                    necesidad = self.games[b] + self.games[c] + self.games[d]
+                    candidatos.append((-nuevos, necesidad, (a, b, c, d)))
+        candidatos.sort()
+        return [m for _, _, m in candidatos]
+
+    def _buscar(self, ronda: int, cancha: int, usados: int, prev_a: int, obligados: int):
+        self.nodes += 1
+        if self.nodes & 1023 == 0 and time.perf_counter() > self.deadline:
+            raise _TiempoAgotado()
+
+        if cancha == self.c:
+            # Ronda completa: los obligados a jugar tienen que haber jugado
+            if obligados & ~usados:
+                return
+            self._cerrar_ronda(ronda + 1)
+            return
+
+        if self.hi > self.lo and self.at_hi > self.extra:
+            return
+
+        for a in range(prev_a + 1, self.n):
+            if usados >> a & 1:
+                continue
+            if self.games[a] < self.hi:
+                for match in self._candidatos(a, usados):
+                    if cancha == 0 and ronda > 0 and match <= self.rounds[ronda - 1][0]:
+                        continue  # rondas ordenadas por su primer partido
+                    previos = tuple(self.opponents[p] for p in match)
+                    nuevos, subieron = self._jugar(match)
+                    self.rounds[ronda].append(match)
+                    mascara = usados | (1 << match[0]) | (1 << match[1]) | (1 << match[2]) | (1 << match[3])
+                    self._buscar(ronda, cancha + 1, mascara, a, obligados)
+                    self.rounds[ronda].pop()
+                    self._deshacer(match, nuevos, subieron, previos)
+                    if self.best_value >= self.cota:
+                        return
+            # Saltear a 'a' significa que descansa en esta ronda
+            if obligados >> a & 1:
+                return
+
+    def _cerrar_ronda(self, siguiente: int):
+        if siguiente == self.num_rounds:
+            if self.covered > self.best_value:
+                self.best_value = self.covered
+                self.best_rounds = [list(r) for r in self.rounds]
+            return
+        rondas_restantes = self.num_rounds - siguiente
+        if not self._factible(rondas_restantes):
+            return
+        if self._cota_ronda(rondas_restantes) <= self.best_value:
+            return
+        obligados = 0
+        for p in range(self.n):
+            if self.lo - self.games[p] == rondas_restantes:
+                obligados |= 1 << p
+        if _bits(obligados) > 4 * self.c:
+            return
+        self.rounds.append([])
+        self._buscar(siguiente, 0, 0, -1, obligados)
+        self.rounds.pop()
+
+    # ------------------------------------------------------------------
+    # Solución inicial
+    # ------------------------------------------------------------------
+    def _emparejar(self, parejas: List[Tuple[int, int]]) -> List[Partido]:
+        """Arma los partidos de una ronda con sus parejas: el cruce con más rivales nuevos"""
+        if not parejas:
+            return []
+        primera, mejor, mejor_nuevos = parejas[0], None, -1
+        for i in range(1, len(parejas)):
+            rival = parejas[i]
+            resto = self._emparejar(parejas[1:i] + parejas[i + 1:])
+            match = primera + rival
+            nuevos = sum(1 for x in primera for y in rival if not self.opponents[x] >> y & 1)
+            nuevos += sum(1 for m in resto for x in m[:2] for y in m[2:] if not self.opponents[x] >> y & 1)
+            if nuevos > mejor_nuevos:
+                mejor, mejor_nuevos = [match] + resto, nuevos
+        return mejor
+
+    def _construir(self, orden: List[int]) -> Optional[List[List[Partido]]]:
+        """
+        Fixture factible sin búsqueda: las parejas salen del Método del Círculo
+        (nunca se repiten) cortado en rondas de 2c parejas, y en cada ronda se
+        cruzan las parejas para cubrir más rivales. None si los partidos no
+        quedan repartidos de forma pareja.
+        """
+        rondas_parejas = repartir_en_canchas(rondas_circulo(orden), 2 * self.c)[:self.num_rounds]
+        if len(rondas_parejas) < self.num_rounds or any(len(r) < 2 * self.c for r in rondas_parejas):
+            return None
+        self._reset()
+        rondas = []
+        for parejas in rondas_parejas:
+            ronda = self._emparejar(parejas)
+            for match in ronda:
+                self._jugar(match)
+            rondas.append(ronda)
+        if min(self.games) < self.lo or max(self.games) > self.hi:
+            return None
+        return rondas
+
+    def _valor(self, rondas: List[List[Partido]]) -> Optional[int]:
+        """Rivales cubiertos por un fixture dado, o None si no cumple las restricciones duras"""
+        if len(rondas) != self.num_rounds:
+            return None
+        self._reset()
+        for ronda in rondas:
+            jugadores = [p for match in ronda for p in match]
+            if len(ronda) != self.c or len(set(jugadores)) != len(jugadores):
+                return None
+            for a, b, c, d in ronda:
+                if self.partners[a] >> b & 1 or self.partners[c] >> d & 1:
+                    return None
+                self._jugar((a, b, c, d))
+        if min(self.games) < self.lo or max(self.games) > self.hi:
+            return None
+        return self.covered
+
+    def _nuevos(self, match: Partido) -> int:
+        """Rivales nuevos que cubriría el partido"""
+        a, b, c, d = match
+        rivales = 1 << c | 1 << d
+        return _bits(rivales & ~self.opponents[a]) + _bits(rivales & ~self.opponents[b])
+
+    def _completar(self, rondas: List[List[Partido]]) -> List[List[Partido]]:
+        """
+        Llena las canchas libres de un fixture dado (la heurística corta la
+        última ronda cuando todos llegaron a target_games) con los que menos
+        jugaron, eligiendo las parejas que cubren más rivales nuevos
+        """
+        self._reset()
+        for ronda in rondas:
+            for match in ronda:
+                self._jugar(match)
+        completas = []
+        for ronda in rondas:
+            ronda = list(ronda)
+            ocupados = {p for match in ronda for p in match}
+            while len(ronda) < self.c:
+                libres = sorted((p for p in range(self.n) if p not in ocupados), key=lambda p: self.games[p])
+                if len(libres) < 4:
+                    break
+                opciones = [m for a, b, c, d in itertools.combinations(libres[:8], 4)
+                            for m in ((a, b, c, d), (a, c, b, d), (a, d, b, c))
+                            if not self.partners[m[0]] >> m[1] & 1 and not self.partners[m[2]] >> m[3] & 1]
+                if not opciones:
+                    break
+                match = min(opciones, key=lambda m: (sum(self.games[p] for p in m), -self._nuevos(m)))
+                self._jugar(match)
+                ronda.append(match)
+                ocupados.update(match)
+            completas.append(ronda)
+        return completas
+
+    def _inicial(self, iniciales: List[List[List[Partido]]] = (), intentos: int = 20):
+        """
+        Primera cota: el mejor fixture válido entre los dados (ej. el de la
+        heurística) y varias construcciones con distintos órdenes de jugadores
+        """
+        for rondas in iniciales:
+            rondas = self._completar(rondas)
+            valor = self._valor(rondas)
+            if valor is not None and valor > self.best_value:
+                self.best_value, self.best_rounds = valor, [list(r) for r in rondas]
+        rng = random.Random(0)
+        orden = list(range(self.n))
+        for _ in range(intentos):
+            rondas = self._construir(orden)
+            if rondas is not None and self.covered > self.best_value:
+                self.best_value, self.best_rounds = self.covered, rondas
+            if self.best_value >= self.cota or time.perf_counter() > self.deadline:
+                break
+            rng.shuffle(orden)
+
+    def solve(self, iniciales: List[List[List[Partido]]] = ()) -> Tuple[Optional[List[List[Partido]]], Dict[str, Any]]:
+        """
+        Args:
+            iniciales: Fixtures ya conocidos (rondas de partidos (a, b, c, d)),
+                       se usan como cota inicial si son válidos
+
+        Returns:
+            (rondas, certificado): las rondas como partidos (a, b, c, d) con
+            ids 0..n-1 (None si no se encontró ninguna solución) y el
+            certificado de optimalidad
+        """
+        start = time.perf_counter()
+        self.deadline = start + self.time_limit
+        self._reset()
+
+        completa = False
+        if 4 * self.c <= self.n and self.hi <= self.n - 1:
+            self._inicial(iniciales)
+            if self.best_value < self.cota:
+                self._reset()
+                # Primera ronda fija (simetría de reetiquetado)
+                primera = [(4 * k, 4 * k + 1, 4 * k + 2, 4 * k + 3) for k in range(self.c)]
+                for match in primera:
+                    self._jugar(match)
+                self.rounds.append(primera)
+                try:
+                    self._cerrar_ronda(1)
+                    completa = True
+                except _TiempoAgotado:
+                    pass
+        else:
+            # Más partidos que compañeros posibles: no hay fixture sin parejas repetidas
+            completa = True
+
+        certificado = {
+            "optimo": self.best_rounds is not None and (completa or self.best_value >= self.cota),
+            "busqueda_completa": completa,
+            "rivales_cubiertos": max(self.best_value, 0),
+            "cota_rivales": self.cota,
+            "partidos_por_jugador": (self.lo, self.hi),
+            "nodos": self.nodes,
+            "tiempo_s": time.perf_counter() - start,
+        }
+        return self.best_rounds, certificado
+
+
+def ordenar_descansos(rondas: List[List[Partido]], num_players: int) -> List[List[Partido]]:
+    """
+    Reordena las rondas (el orden no cambia parejas, rivales ni partidos)
+    para que nadie encadene descansos: en cada paso va la ronda que hace
+    jugar a quienes llevan más rondas seguidas descansando.
+    """
+    pendientes = list(rondas)
+    descanso = [0] * num_players
+    salida = []
+    while pendientes:
+        def urgencia(ronda):
+            return sum(descanso[p] ** 2 for match in ronda for p in match)
+        elegida = max(range(len(pendientes)), key=lambda i: urgencia(pendientes[i]))
+        ronda = pendientes.pop(elegida)
+        jugando = {p for match in ronda for p in match}
+        for p in range(num_players):
+            descanso[p] = 0 if p in jugando else descanso[p] + 1
+        salida.append(ronda)
+    return salida
+
+
+def marcar_ayudantes(rondas: List[List[Partido]], num_players: int, target_games: int) -> List[List[List[int]]]:
+    """
+    Como en modelv3, todos suman target_games partidos válidos: quien juega
+    uno más lo juega de ayudante. Se elige su último partido con menos
+    ayudantes, para no dejar partidos con casi nadie sumando puntos.
+
+    Returns:
+        Los ayudantes de cada partido, con la misma forma que las rondas
+    """
+    ayudantes = [[[] for _ in ronda] for ronda in rondas]
+    partidos = [[] for _ in range(num_players)]
+    for r, ronda in enumerate(rondas):
+        for k, match in enumerate(ronda):
+            for p in match:
+                partidos[p].append((r, k))
+    for p in range(num_players):
+        for _ in range(len(partidos[p]) - target_games):
+            r, k = min(reversed(partidos[p]), key=lambda rk: len(ayudantes[rk[0]][rk[1]]))
+            partidos[p].remove((r, k))
+            ayudantes[r][k].append(p)
+    return ayudantes
+
+
+class AmericanoExactTournament(AmericanoTournament):
+    """
+    AmericanoTournament con el motor exacto: misma salida (format_for_streamlit)
+    y en stats["exact"] el certificado. Fuera de 8-16 jugadores, o si no
+    encuentra solución en el tiempo límite, usa la heurística de modelv3.
+    """
+
+    def __init__(self, players: List[str], num_fields: int, time_limit: float = 5.0):
+        # Canchas que no se pueden llenar quedan libres (como en la biblioteca)
+        num_fields = max(1, min(num_fields, len(players) // 4))
+        super().__init__(players, num_fields, ScheduleConfig.americano(len(players), num_fields))
+        self.time_limit = time_limit
+        self.certificate: Dict[str, Any] = {"optimo": False, "fuente": "heuristica"}
+
+    def _heuristicas(self, intentos: int = 20) -> List[List[List[Partido]]]:
+        """
+        La heurística de modelv3 (sin biblioteca) con varias semillas: sus
+        fixtures válidos son la primera cota del solver. Usa a lo sumo un
+        cuarto del tiempo límite y deja el estado de random como estaba.
+        """
+        estado = random.getstate()
+        limite = time.perf_counter() + self.time_limit / 4
+        iniciales = []
+        for semilla in range(intentos):
+            random.seed(semilla)
+            heuristica = AmericanoTournament(self.players, self.num_fields, self.config).generate_rounds()
+            iniciales.append([[m["players"] for m in r] for r in heuristica])
+            if time.perf_counter() > limite:
+                break
+        random.setstate(estado)
+        return iniciales
+
+    def generate_tournament(self) -> Tuple[List[List[Dict]], Dict]:
+        if not MIN_JUGADORES <= self.num_players <= MAX_JUGADORES:
+            return super().generate_tournament()
+
+        solver = ExactSolver(self.num_players, self.num_fields, self.config.optimal_rounds, self.time_limit)
+        library_rounds = buscar_fixture(self.num_players, self.num_fields)
+        if library_rounds is not None and len(library_rounds) == self.config.optimal_rounds:
+            # Whist precalculado: cubre todos los rivales, alcanza la cota sin buscar
+            rondas = [[tuple(m) for m in r] for r in library_rounds]
+            self.certificate = {"optimo": True, "fuente": "biblioteca", "busqueda_completa": False,
+                                "rivales_cubiertos": solver.cota, "cota_rivales": solver.cota,
+                                "partidos_por_jugador": (solver.lo, solver.hi), "nodos": 0, "tiempo_s": 0.0}
+        else:
+            rondas, self.certificate = solver.solve(self._heuristicas())
+            self.certificate["fuente"] = "exacto"
+            if rondas is None:
+                self.certificate["fuente"] = "heuristica"
+                return super().generate_tournament()
+
+        # Mismo reetiquetado al azar que la biblioteca: cada semilla da otro fixture
+        rondas = ordenar_descansos(rondas, self.num_players)
+        tournament_schedule = self.schedule_from_library(
+            rondas, marcar_ayudantes(rondas, self.num_players, self.config.target_games))
+        stats = {
+            "games_played": dict(zip(self.players, self.state.games_played.tolist())),
+            "helper_games": dict(zip(self.players, self.state.helper_games.tolist())),
+            "target_games": self.config.target_games,
+            "library": self.certificate["fuente"] == "biblioteca",
+        }
+        return tournament_schedule, stats
+
+    def format_for_streamlit(self, tournament_schedule: List[List[Dict]], stats: Dict) -> Dict[str, Any]:
+        output = super().format_for_streamlit(tournament_schedule, stats)
+        output["stats"]["exact"] = self.certificate
+        return output
+
+
+def generar_torneo_todos_contra_todos(jugadores: List[str], num_canchas: int,
+                                      seed: int = None, time_limit: float = 5.0) -> Dict[str, Any]:
+    """
+    Drop-in replacement of the v3 generator with the exact engine.
+
+    Args:
+        jugadores: List of player names
+        num_canchas: Number of fields/courts available
+        seed: Random seed (relabels the players; the search itself is deterministic)
+        time_limit: Seconds of branch and bound before returning the best found
+
+    Returns:
+        Dictionary with 'rondas', 'resumen', and 'stats' (stats['exact'] = certificate)
+    """
+    if seed:
+        random.seed(seed)
+    if len(jugadores) < 4:
+        return {"error": "Se necesitan al menos 4 jugadores"}
+
+    tournament = AmericanoExactTournament(jugadores, num_canchas, time_limit)
+    schedule, stats = tournament.generate_tournament()
+    return tournament.format_for_streamlit(schedule, stats)
@@ -3,6 +3,8 @@ import itertools
 from collections import defaultdict
 from typing import List, Dict, Any
 import pandas as pd
+from models.schedule_config import ScheduleConfig
+from models.schedule_library import generar_desde_biblioteca
 
 """Esta version de todos contra todos minimiza las rondas jugadas
     No se juega con todos ya que el algoritmo es propenso a repetir parejas
@@ -16,10 +18,16 @@ def generar_torneo_todos_contra_todos(
     if seed is not None:
         random.seed(seed)
 
-    n = len(jugadores)
+    config = ScheduleConfig.americano(len(jugadores), num_canchas)
+    n = config.num_players
     if n < 4:
         raise ValueError("Se requieren al menos 4 jugadores para dobles 2vs2.")
 
+    # fixture óptimo precalculado si existe; si no, heurístico
+    precalculado = generar_desde_biblioteca(jugadores, num_canchas, seed)
+    if precalculado is not None:
+        return precalculado
+
     todos_pares = set(tuple(sorted(p)) for p in itertools.combinations(jugadores, 2))
 
     partidos_jugados = defaultdict(int)
@@ -176,5 +184,6 @@ def generar_torneo_todos_contra_todos(
         "meta_alcanzada": meta_alcanzada,
         "partidos_jugados": dict(partidos_jugados),
         "descansos": dict(descansos),
+        "config": config,
         "resumen": resumen_df  # ← DataFrame listo para mostrar
     }
@@ -1,98 +1,88 @@
 import random
 from itertools import combinations
-from collections import defaultdict
+import numpy as np
 import pandas as pd
 from typing import List, Dict, Any, Tuple, Set
+from models.tournament_state import TournamentState
+from models.schedule_config import ScheduleConfig
+from models.schedule_library import buscar_fixture
+from models.profiling import medir, instrumentar, CANDIDATOS, PUNTAJE, AYUDANTES, ESTADISTICAS, FORMATO
 
 class AmericanoTournament:
-    def __init__(self, players: List[str], num_fields: int):
+    def __init__(self, players: List[str], num_fields: int, config: ScheduleConfig = None):
         """
         Initialize Americano Padel Tournament
         
         Args:
             players: List of player names
             num_fields: Number of available padel fields
+            config: Precomputed parameters (built from players/fields if None)
         """
         self.players = players
         self.num_players = len(players)
         self.num_fields = num_fields
+        self.config = config or ScheduleConfig.americano(self.num_players, num_fields)
         
-        # Statistics tracking
-        self.partner_count = defaultdict(lambda: defaultdict(int))
-        self.opponent_count = defaultdict(lambda: defaultdict(int))
-        self.games_played = defaultdict(int)  # Valid games only
-        self.helper_games = defaultdict(int)  # Helper games (don't count)
-        self.consecutive_rests = defaultdict(int)
-        self.last_round_played = defaultdict(lambda: -1)
+        # Statistics tracking: players are integer ids (index in self.players)
+        self.state = TournamentState(players)
+        self.perfil = instrumentar(self)  # None salvo dentro de perfilando()
         
     def calculate_optimal_rounds(self) -> int:
-        """Calculate optimal number of rounds based on Priority 1"""
-        if self.num_fields == 2:
-            # Priority 1: j-1 rounds for 2 fields
-            return self.num_players - 1
-        else:
-            # For more fields: calculate to achieve all vs all
-            players_per_round = self.num_fields * 4
-            return max(self.num_players - 1, 
-                      (self.num_players * (self.num_players - 1)) // (players_per_round * 2))
+        """Optimal number of rounds based on Priority 1 (precomputed in config)"""
+        return self.config.optimal_rounds
     
     def calculate_target_games(self) -> int:
         """
-        Calculate target valid games per player based on Priority 2
+        Target valid games per player based on Priority 2 (precomputed in config)
         This should be the MINIMUM games everyone can achieve
         """
-        total_rounds = self.calculate_optimal_rounds()
-        total_slots = total_rounds * self.num_fields * 4
-        # Calculate floor division to ensure everyone can reach this
-        base_target = total_slots // self.num_players
-        
-        # Verify: can everyone play this many games?
-        # We need base_target * num_players <= total_slots
-        return base_target
+        return self.config.target_games
     
-    def get_uncovered_opponents(self, player: str) -> Set[str]:
+    def get_uncovered_opponents(self, player: int) -> Set[int]:
         """Get list of players this player hasn't faced yet"""
-        all_opponents = set(self.players) - {player}
-        faced = set(p for p in all_opponents if self.opponent_count[player][p] > 0)
-        return all_opponents - faced
+        return set(self.state.uncovered_opponents[player])
     
-    def get_uncovered_partners(self, player: str) -> Set[str]:
+    def get_uncovered_partners(self, player: int) -> Set[int]:
         """Get list of players this player hasn't partnered with yet"""
-        all_partners = set(self.players) - {player}
-        partnered = set(p for p in all_partners if self.partner_count[player][p] > 0)
-        return all_partners - partnered
+        return set(self.state.uncovered_partners[player])
     
-    def count_new_matchups(self, match: Tuple[str, str, str, str]) -> int:
+    def count_new_matchups(self, match: Tuple[int, int, int, int]) -> int:
         """Count how many NEW opponent matchups this match creates"""
         p1, p2, p3, p4 = match
+        opponent_count = self.state.opponent_count
         new_matchups = 0
         
         # Check all opponent pairs
         for t1_player in [p1, p2]:
             for t2_player in [p3, p4]:
-                if self.opponent_count[t1_player][t2_player] == 0:
+                if opponent_count[t1_player, t2_player] == 0:
                     new_matchups += 1
         
         return new_matchups
     
-    def count_new_partnerships(self, match: Tuple[str, str, str, str]) -> int:
+    def count_new_partnerships(self, match: Tuple[int, int, int, int]) -> int:
         """Count how many NEW partnerships this match creates"""
         p1, p2, p3, p4 = match
+        partner_count = self.state.partner_count
         new_partnerships = 0
         
-        if self.partner_count[p1][p2] == 0:
+        if partner_count[p1, p2] == 0:
             new_partnerships += 1
-        if self.partner_count[p3][p4] == 0:
+        if partner_count[p3, p4] == 0:
             new_partnerships += 1
         
         return new_partnerships
     
-    def get_match_score(self, match: Tuple[str, str, str, str], round_num: int, is_helper_match: bool = False) -> float:
+    def get_match_score(self, match: Tuple[int, int, int, int], round_num: int, is_helper_match: bool = False) -> float:
         """
         Score a potential match based on priorities
         Lower score is better
+
+        Scalar reference for score_matches, which is what the engine calls;
+        kept to read (and check) the scoring rules one match at a time.
         """
         p1, p2, p3, p4 = match
+        state = self.state
         score = 0.0
         
         # If this is a helper match, deprioritize it heavily
@@ -110,69 +100,122 @@ class AmericanoTournament:
         score -= new_partnerships * 3000  # New partnerships are critical
         
         # Penalize repeated partnerships heavily
-        partner_reps = self.partner_count[p1][p2] + self.partner_count[p3][p4]
+        partner_reps = int(state.partner_count[p1, p2] + state.partner_count[p3, p4])
         if partner_reps > 0:
             score += partner_reps * 5000  # Much higher penalty for repeating
         
         # Penalize repeated opponent matchups moderately
         opponents = [(p1, p3), (p1, p4), (p2, p3), (p2, p4)]
-        total_opponent_reps = sum(self.opponent_count[opp1][opp2] for opp1, opp2 in opponents)
+        total_opponent_reps = sum(int(state.opponent_count[opp1, opp2]) for opp1, opp2 in opponents)
         if total_opponent_reps > 0:
             score += total_opponent_reps * 800
         
         # Priority 3: Avoid consecutive rests
         for p in match:
-            if self.last_round_played[p] == round_num - 1:
+            if state.last_round_played[p] == round_num - 1:
                 score += 300
-            elif self.last_round_played[p] < round_num - 1:
+            elif state.last_round_played[p] < round_num - 1:
                 score -= 200
         
         # Priority 2: Balance games played
-        games_sum = sum(self.games_played[p] for p in match)
+        games_list = [int(state.games_played[p]) for p in match]
+        games_sum = sum(games_list)
         score += games_sum * 400
         
         # Minimize variance in games played within this match
-        games_list = [self.games_played[p] for p in match]
         variance = max(games_list) - min(games_list)
         score += variance * 300
         
         return score
     
-    def select_helpers(self, needed: int, available_players: Set[str], round_num: int) -> List[str]:
+    @medir(PUNTAJE, contar=True)
+    def score_matches(self, candidates: np.ndarray, round_num: int, is_helper_match: bool = False) -> np.ndarray:
+        """
+        Score a batch of candidate matches (vectorized get_match_score)
+        Lower score is better
+        
+        Args:
+            candidates: (K, 4) integer array, each row is (p1, p2, p3, p4)
+                meaning (p1 & p2) vs (p3 & p4)
+            round_num: Current round
+            is_helper_match: Whether all candidates are helper matches
+        
+        Returns:
+            (K,) array of scores, equal to get_match_score on each row
+        """
+        state = self.state
+        if self.perfil is not None:
+            self.perfil.contar("candidatos_puntuados", len(candidates))
+        p1, p2, p3, p4 = candidates.T
+        
+        partner_reps = np.stack([state.partner_count[p1, p2], state.partner_count[p3, p4]])
+        opponent_reps = np.stack([
+            state.opponent_count[p1, p3], state.opponent_count[p1, p4],
+            state.opponent_count[p2, p3], state.opponent_count[p2, p4],
+        ])
+        
+        score = np.zeros(len(candidates), dtype=np.int64)
+        if is_helper_match:
+            score += 10000
+        
+        # New matchups / partnerships are rewarded, repetitions penalized
+        score -= (opponent_reps == 0).sum(axis=0) * 2500
+        score -= (partner_reps == 0).sum(axis=0) * 3000
+        score += partner_reps.sum(axis=0) * 5000
+        score += opponent_reps.sum(axis=0) * 800
+        
+        # Priority 3: Avoid consecutive rests
+        last_played = state.last_round_played[candidates]
+        score += (last_played == round_num - 1).sum(axis=1) * 300
+        score -= (last_played < round_num - 1).sum(axis=1) * 200
+        
+        # Priority 2: Balance games played, and within the match
+        games = state.games_played[candidates]
+        score += games.sum(axis=1) * 400
+        score += (games.max(axis=1) - games.min(axis=1)) * 300
+        
+        return score.astype(float)
+    
+    @medir(AYUDANTES)
+    def select_helpers(self, needed: int, available_players: Set[int], round_num: int) -> List[int]:
         """
         Select helper players to complete a match
         Helpers are players who already have enough valid games
         """
-        target_games = self.calculate_target_games()
+        target_games = self.config.target_games
+        games_played = self.state.games_played
+        helper_games = self.state.helper_games
         
         # Candidates: players NOT in available (they're resting or already playing)
         # AND players who already have target games or more
         candidates = []
         
-        for p in self.players:
-            if p not in available_players and self.games_played[p] >= target_games:
+        for p in range(self.num_players):
+            if p not in available_players and games_played[p] >= target_games:
                 candidates.append(p)
         
         # If not enough candidates with target games, allow anyone not available
         if len(candidates) < needed:
-            candidates = [p for p in self.players if p not in available_players]
+            candidates = [p for p in range(self.num_players) if p not in available_players]
         
         # Sort by: most valid games (they can afford to help), least helper games (fair distribution)
-        candidates.sort(key=lambda p: (-self.games_played[p], self.helper_games[p]))
+        candidates.sort(key=lambda p: (-games_played[p], helper_games[p]))
         
         return candidates[:needed]
     
-    def generate_round_matches(self, round_num: int, available_players: List[str]) -> Tuple[List[Dict], List[str]]:
+    @medir(CANDIDATOS)
+    def generate_round_matches(self, round_num: int, available_players: List[int]) -> Tuple[List[Dict], List[int]]:
         """Generate matches for a round, using helpers if needed"""
         matches = []
         remaining = set(available_players)
-        target_games = self.calculate_target_games()
+        target_games = self.config.target_games
+        games_played = self.state.games_played
         
         for field_idx in range(self.num_fields):
             if len(remaining) == 0:
                 break
             
-            players_needing_games = [p for p in remaining if self.games_played[p] < target_games]
+            players_needing_games = [p for p in remaining if games_played[p] < target_games]
             
             helpers_needed = []
             is_helper_match = False
@@ -180,17 +223,20 @@ class AmericanoTournament:
             if len(players_needing_games) >= 4:
                 # ENHANCED: Greedy + sampling approach for better coverage
                 best_match = None
-                best_score = float('inf')
+                configurations = []
                 
                 candidates = players_needing_games
                 
                 # Strategy 1: Prioritize players with most uncovered opponents
+                # (the uncovered sets are maintained by update_statistics, len() is O(1))
+                uncovered_opponents = self.state.uncovered_opponents
+                uncovered_partners = self.state.uncovered_partners
                 players_by_coverage = sorted(
                     candidates, 
                     key=lambda p: (
-                        -len(self.get_uncovered_opponents(p)),
-                        -len(self.get_uncovered_partners(p)),
-                        self.games_played[p]
+                        -len(uncovered_opponents[p]),
+                        -len(uncovered_partners[p]),
+                        games_played[p]
                     )
                 )
                 
@@ -204,17 +250,11 @@ class AmericanoTournament:
                     focused_tries += 1
                     
                     p1, p2, p3, p4 = combo
-                    configurations = [
+                    configurations += [
                         (p1, p2, p3, p4),
                         (p1, p3, p2, p4),
                         (p1, p4, p2, p3),
                     ]
-                    
-                    for config in configurations:
-                        score = self.get_match_score(config, round_num, False)
-                        if score < best_score:
-                            best_score = score
-                            best_match = config
                 
                 # Strategy 2: Random sampling for diversity
                 if len(candidates) > 8:
@@ -222,17 +262,17 @@ class AmericanoTournament:
                         combo = tuple(random.sample(candidates, 4))
                         p1, p2, p3, p4 = combo
                         
-                        configurations = [
+                        configurations += [
                             (p1, p2, p3, p4),
                             (p1, p3, p2, p4),
                             (p1, p4, p2, p3),
                         ]
-                        
-                        for config in configurations:
-                            score = self.get_match_score(config, round_num, False)
-                            if score < best_score:
-                                best_score = score
-                                best_match = config
+                
+                # Score every configuration in one pass; argmin keeps the
+                # first best one, same as the sequential strict < comparison
+                if configurations:
+                    scores = self.score_matches(np.array(configurations), round_num, False)
+                    best_match = configurations[int(np.argmin(scores))]
                 
                 if best_match:
                     matches.append({
@@ -250,7 +290,7 @@ class AmericanoTournament:
                 
                 available_helpers_from_remaining = [
                     p for p in remaining 
-                    if p not in regular_players and self.games_played[p] >= target_games
+                    if p not in regular_players and games_played[p] >= target_games
                 ]
                 
                 if len(available_helpers_from_remaining) >= need_helpers:
@@ -269,22 +309,20 @@ class AmericanoTournament:
                 
                 # Even with helpers, optimize for coverage
                 best_config = None
-                best_score = float('inf')
+                configurations = []
                 
                 import itertools
                 for perm in itertools.permutations(all_players, 4):
                     p1, p2, p3, p4 = perm
-                    configurations = [
+                    configurations += [
                         (p1, p2, p3, p4),
                         (p1, p3, p2, p4),
                         (p1, p4, p2, p3),
                     ]
-                    
-                    for config in configurations:
-                        score = self.get_match_score(config, round_num, True)
-                        if score < best_score:
-                            best_score = score
-                            best_config = config
+                
+                if configurations:
+                    scores = self.score_matches(np.array(configurations), round_num, True)
+                    best_config = configurations[int(np.argmin(scores))]
                 
                 if best_config:
                     matches.append({
@@ -301,42 +339,51 @@ class AmericanoTournament:
         resting = list(remaining)
         return matches, resting
     
+    @medir(ESTADISTICAS)
     def update_statistics(self, match: Dict, round_num: int):
         """Update tracking statistics after a match"""
-        p1, p2, p3, p4 = match["players"]
-        helpers = match["helpers"]
-        
-        # Update partners
-        self.partner_count[p1][p2] += 1
-        self.partner_count[p2][p1] += 1
-        self.partner_count[p3][p4] += 1
-        self.partner_count[p4][p3] += 1
+        self.state.record_match(match["players"], match["helpers"], round_num)
+    
+    def schedule_from_library(self, library_rounds: List[List[List[int]]],
+                              library_helpers: List[List[List[int]]] = None) -> List[List[Dict]]:
+        """
+        Build the schedule from a precomputed optimal fixture
+
+        Library indices are relabelled with a random permutation of the
+        player ids (O(n)), so every seed gives a different optimal fixture.
+        library_helpers (same shape as the matches, library indices) marks
+        who plays each match as a helper; the library itself has none.
+        """
+        order = random.sample(range(self.num_players), self.num_players)
+        tournament_schedule = []
         
-        # Update opponents
-        for t1_player in [p1, p2]:
-            for t2_player in [p3, p4]:
-                self.opponent_count[t1_player][t2_player] += 1
-                self.opponent_count[t2_player][t1_player] += 1
+        for round_num, library_matches in enumerate(library_rounds):
+            matches = [{
+                "players": tuple(order[p] for p in library_match),
+                "helpers": [order[p] for p in library_helpers[round_num][field]] if library_helpers else [],
+                "field": field
+            } for field, library_match in enumerate(library_matches)]
+            tournament_schedule.append(matches)
+            
+            for match in matches:
+                self.update_statistics(match, round_num)
+            playing = {p for match in matches for p in match["players"]}
+            self.state.record_rests([p for p in range(self.num_players) if p not in playing], list(playing))
         
-        # Update games played
-        for p in [p1, p2, p3, p4]:
-            if p in helpers:
-                self.helper_games[p] += 1
-            else:
-                self.games_played[p] += 1
-            self.last_round_played[p] = round_num
+        return tournament_schedule
     
-    def generate_tournament(self) -> Tuple[List[List[Dict]], Dict]:
-        """Generate complete tournament schedule"""
-        num_rounds = self.calculate_optimal_rounds()
+    def generate_rounds(self) -> List[List[Dict]]:
+        """Greedy round-by-round schedule (used when the library has no entry)"""
+        num_rounds = self.config.optimal_rounds
         tournament_schedule = []
+        state = self.state
         
         for round_num in range(num_rounds):
             # All players available, prioritize those with fewer games and rested
-            available = sorted(self.players, 
-                             key=lambda p: (self.games_played[p], 
-                                          -self.consecutive_rests[p],
-                                          round_num - self.last_round_played[p]))
+            # (lexsort is stable and sorts by the last key first)
+            available = np.lexsort((round_num - state.last_round_played,
+                                    -state.consecutive_rests,
+                                    state.games_played)).tolist()
             
             matches, resting = self.generate_round_matches(round_num, available)
             
@@ -349,20 +396,30 @@ class AmericanoTournament:
                 self.update_statistics(match, round_num)
             
             # Update consecutive rests
-            for p in resting:
-                self.consecutive_rests[p] += 1
-            for match in matches:
-                for p in match["players"]:
-                    self.consecutive_rests[p] = 0
+            state.record_rests(resting, [p for match in matches for p in match["players"]])
+        
+        return tournament_schedule
+    
+    def generate_tournament(self) -> Tuple[List[List[Dict]], Dict]:
+        """Generate complete tournament schedule (precomputed library first)"""
+        state = self.state
+        
+        library_rounds = buscar_fixture(self.num_players, self.num_fields)
+        if library_rounds is not None:
+            tournament_schedule = self.schedule_from_library(library_rounds)
+        else:
+            tournament_schedule = self.generate_rounds()
         
         stats = {
-            "games_played": dict(self.games_played),
-            "helper_games": dict(self.helper_games),
-            "target_games": self.calculate_target_games()
+            "games_played": dict(zip(self.players, state.games_played.tolist())),
+            "helper_games": dict(zip(self.players, state.helper_games.tolist())),
+            "target_games": self.config.target_games,
+            "library": library_rounds is not None
         }
         
         return tournament_schedule, stats
     
+    @medir(FORMATO, adjuntar=True)
     def format_for_streamlit(self, tournament_schedule: List[List[Dict]], 
                             stats: Dict) -> Dict[str, Any]:
         """
@@ -370,17 +427,18 @@ class AmericanoTournament:
         Returns structure compatible with Streamlit code
         """
         rondas = []
+        names = self.state.names
         
         for round_num, matches in enumerate(tournament_schedule, 1):
             playing = set()
             for match in matches:
                 playing.update(match["players"])
-            descansan = [p for p in self.players if p not in playing]
+            descansan = [p for i, p in enumerate(self.players) if i not in playing]
             
             partidos = []
             for match in matches:
-                p1, p2, p3, p4 = match["players"]
-                helpers = match["helpers"]
+                p1, p2, p3, p4 = names(match["players"])
+                helpers = names(match["helpers"])
                 
                 # valido_para: all players except helpers
                 valido_para = [p for p in [p1, p2, p3, p4] if p not in helpers]
@@ -403,9 +461,9 @@ class AmericanoTournament:
         
         # Create summary DataFrame
         resumen_data = []
-        for player in self.players:
-            valid_games = self.games_played[player]
-            helper_games_count = self.helper_games[player]
+        for i, player in enumerate(self.players):
+            valid_games = int(self.state.games_played[i])
+            helper_games_count = int(self.state.helper_games[i])
             total_games = valid_games + helper_games_count
             
             resumen_data.append({
@@ -426,7 +484,9 @@ class AmericanoTournament:
                 "fields": self.num_fields,
                 "target_games": stats["target_games"],
                 "games_distribution": stats["games_played"],
-                "helper_distribution": stats["helper_games"]
+                "helper_distribution": stats["helper_games"],
+                "config": self.config,
+                "library": stats.get("library", False)
             }
         }
         
@@ -1,8 +1,9 @@
 import random
 import itertools
-from collections import defaultdict, Counter
 from typing import List, Dict, Any, Tuple
 import pandas as pd
+from models.schedule_config import ScheduleConfig
+from models.schedule_library import generar_desde_biblioteca
 
 def generar_torneo_todos_contra_todos(
     jugadores: List[str],
@@ -18,67 +19,68 @@ def generar_torneo_todos_contra_todos(
       4) minimizar repetición de parejas
     Devuelve estructura similar a tu versión original.
     Limitaciones: heurístico, no garantiza optimalidad.
+
+    Internamente cada jugador es un id entero (su posición en 'jugadores') y
+    los enfrentamientos cubiertos se guardan como una máscara de bits por
+    jugador: el bit j de cubiertos[i] indica que i ya se enfrentó a j.
     """
     if seed is not None:
         random.seed(seed)
 
-    n = len(jugadores)
+    config = ScheduleConfig.americano(len(jugadores), num_canchas)
+    n = config.num_players
     if n < 4:
         raise ValueError("Se requieren al menos 4 jugadores para dobles 2vs2.")
 
-    # metas de rondas
-    if n == 8 and num_canchas == 2:
-        # caso especial solicitado
-        min_rounds = 7
-        max_rounds = 7
-    else:
-        min_rounds = max(1, n - 2)
-        max_rounds = max(1, n - 1)
+    # fixture óptimo precalculado si existe; si no, heurístico
+    precalculado = generar_desde_biblioteca(jugadores, num_canchas, seed)
+    if precalculado is not None:
+        return precalculado
+
+    # metas de rondas (el caso 8 jugadores / 2 canchas lo resuelve la biblioteca)
+    min_rounds = config.min_rounds
+    max_rounds = config.max_rounds
 
     target_rounds = min_rounds
     max_total_rounds = max_rounds
 
     # pares que deben cubrirse (enfrentamientos "opuesto a pareja": cada jugador contra otro)
-    todos_pares = set(tuple(sorted(p)) for p in itertools.combinations(jugadores, 2))
+    total_pares = n * (n - 1) // 2
+    bit = [1 << i for i in range(n)]
 
-    # estados
-    partidos_jugados = defaultdict(int)   # solo partidas válidas cuentan
-    descansos = defaultdict(int)
-    descansos_ult_ronda = {j: -100 for j in jugadores}  # ronda index de último descanso (evitar consecutivos)
-    parejas_formadas = Counter()  # conteo de veces que dos jugadores fueron pareja
-    enfrentamientos_cubiertos = set()
+    # estados (indexados por id de jugador)
+    partidos_jugados = [0] * n   # solo partidas válidas cuentan
+    descansos = [0] * n
+    descansos_ult_ronda = [-100] * n  # ronda index de último descanso (evitar consecutivos)
+    parejas_formadas = [[0] * n for _ in range(n)]  # veces que dos jugadores fueron pareja
+    cubiertos = [0] * n  # máscara de rivales ya enfrentados
+    pares_cubiertos = 0  # contador de enfrentamientos cubiertos (completo == total_pares)
 
     rondas: List[Dict[str, Any]] = []
     ronda_idx = 0
 
     # función de scoring para elegir quad de 4
-    def score_quad(quad: List[str], partitions: List[Tuple[Tuple[str,str], Tuple[str,str]]]):
-        """Devuelve mejor (score, (p1,p2), valid_dict)."""
-        best = (-1e9, None, None)
-        for p1, p2 in partitions:
+    def score_quad(quad: List[int]) -> Tuple[float, Tuple[Tuple[int, int], Tuple[int, int]]]:
+        """Devuelve mejor (score, (p1,p2)) entre las 3 particiones del cuarteto."""
+        a, b, c, d = quad
+        best = (-1e9, None)
+        for p1, p2 in (((a, b), (c, d)), ((a, c), (b, d)), ((a, d), (b, c))):
+            x, y = p1
+            z, w = p2
             # cuanto nuevo cubre (enfrentamiento entre jugadores de parejas opuestas)
-            new_cover = 0
-            for a in p1:
-                for b in p2:
-                    pair = tuple(sorted((a,b)))
-                    if pair not in enfrentamientos_cubiertos:
-                        new_cover += 1
+            rivales = bit[z] | bit[w]
+            new_cover = (rivales & ~cubiertos[x]).bit_count() + (rivales & ~cubiertos[y]).bit_count()
             # penalizar repeticiones de pareja
-            pair_penalty = 0
-            for pair_in in (itertools.combinations(p1,2) if len(p1)==2 else []):
-                pair_penalty += parejas_formadas[tuple(sorted(pair_in))]
-            for pair_in in (itertools.combinations(p2,2) if len(p2)==2 else []):
-                pair_penalty += parejas_formadas[tuple(sorted(pair_in))]
+            pair_penalty = parejas_formadas[x][y] + parejas_formadas[z][w]
             # balance partidos_jugados: preferir jugadores con menos partidos válidos
-            worst_count = max(partidos_jugados[a] for a in p1 + p2)
-            sum_counts = sum(partidos_jugados[a] for a in p1 + p2)
+            cx, cy, cz, cw = partidos_jugados[x], partidos_jugados[y], partidos_jugados[z], partidos_jugados[w]
+            worst_count = max(cx, cy, cz, cw)
+            sum_counts = cx + cy + cz + cw
             # score compone prioridades: nuevo enfrentamiento > baja carga de partidos > evitar parejas repetidas
             score = (10 * new_cover) - (1.5 * sum_counts) - (5 * pair_penalty) - (2 * worst_count)
-            # return candidate
-            valido_dict = {pl: True for pl in p1 + p2}  # por defecto válidos; ayudantes fijados fuera
             if score > best[0]:
-                best = (score, (tuple(p1), tuple(p2)), valido_dict)
-        return best  # (score, (p1,p2), valido_dict)
+                best = (score, (p1, p2))
+        return best  # (score, (p1,p2))
 
     # función auxiliar para seleccionar ayudantes cuando faltan jugadores
     def select_ayudantes(need: int, disponibles: set, ronda_actual):
@@ -86,9 +88,9 @@ def generar_torneo_todos_contra_todos(
         Selecciona 'need' ayudantes prefiriendo jugadores con más partidos válidos
         y que no hayan descansado excesivamente. Marcarán como no válidos.
         """
-        candidatos = [g for g in jugadores if g not in disponibles]
+        candidatos = [g for g in range(n) if g not in disponibles]
         # ordenar por: más partidos válidos (para que no pierdan igualdad), y preferir los que descansaron menos
-        candidatos_sorted = sorted(candidatos, key=lambda g: (-partidos_jugados[g], descansos[g], ronda_actual - descansos_ult_ronda.get(g, -100)))
+        candidatos_sorted = sorted(candidatos, key=lambda g: (-partidos_jugados[g], descansos[g], ronda_actual - descansos_ult_ronda[g]))
         return candidatos_sorted[:need]
 
     # límite de iteraciones para evitar ciclo infinito
@@ -96,17 +98,15 @@ def generar_torneo_todos_contra_todos(
 
     while ronda_idx < max_round_iters:
         ronda_idx += 1
-        disponibles = set(jugadores)
-        # ordenar por menos partidos válidos y menos descansos
-        jugadores_ordenados = sorted(disponibles, key=lambda g: (partidos_jugados[g], descansos[g], parejas_formadas.get(g, 0)))
+        disponibles = set(range(n))
         # decidir cuántos descansos deben ocurrir esta ronda para mantener equilibrio y evitar consecutivos
         sobrantes = len(disponibles) % 4
-        descansan: List[str] = []
+        descansan: List[int] = []
 
         if sobrantes > 0:
             # elegir quienes descansan: los que menos descansos tienen y que no descansaron en la ronda anterior (evitar consecutivos)
-            min_desc = min(descansos.values()) if descansos else 0
-            candidatos = [j for j in disponibles if descansos[j] == min_desc and (ronda_idx - descansos_ult_ronda.get(j, -100) > 0)]
+            min_desc = min(descansos)
+            candidatos = [j for j in disponibles if descansos[j] == min_desc and (ronda_idx - descansos_ult_ronda[j] > 0)]
             # si no alcanzan, relajar criterio
             if len(candidatos) < sobrantes:
                 candidatos = [j for j in disponibles if descansos[j] == min_desc]
@@ -128,29 +128,23 @@ def generar_torneo_todos_contra_todos(
                 trials = min(80, max(20, len(candidatos)))
                 for _ in range(trials):
                     quad = random.sample(candidatos, 4)
-                    partitions = [
-                        ((quad[0], quad[1]), (quad[2], quad[3])),
-                        ((quad[0], quad[2]), (quad[1], quad[3])),
-                        ((quad[0], quad[3]), (quad[1], quad[2])),
-                    ]
-                    sc, qp, vdict = score_quad(quad, partitions)
+                    sc, qp = score_quad(quad)
                     if sc > best_score:
                         best_score = sc
-                        best_quad = (qp, vdict)
+                        best_quad = qp
                 if best_quad is None:
                     take = list(disponibles)[:4]
                     p1 = (take[0], take[1])
                     p2 = (take[2], take[3])
-                    valido_dict = {pl: True for pl in p1 + p2}
                 else:
-                    (p1, p2), valido_dict = best_quad
+                    p1, p2 = best_quad
 
                 partidos_ronda.append({
                     "cancha": cancha_idx + 1,
-                    "pareja1": tuple(p1),
-                    "pareja2": tuple(p2),
+                    "pareja1": p1,
+                    "pareja2": p2,
                     "ayudantes": [],
-                    "valido_para": valido_dict
+                    "valido_para": {pl: True for pl in p1 + p2}
                 })
                 disponibles -= set(p1) | set(p2)
 
@@ -173,8 +167,8 @@ def generar_torneo_todos_contra_todos(
 
                 partidos_ronda.append({
                     "cancha": cancha_idx + 1,
-                    "pareja1": tuple(p1),
-                    "pareja2": tuple(p2),
+                    "pareja1": p1,
+                    "pareja2": p2,
                     "ayudantes": list(ayudantes),
                     "valido_para": valido_dict
                 })
@@ -191,22 +185,23 @@ def generar_torneo_todos_contra_todos(
 
         # actualizar estructuras: enfrentamientos, partidos válidos, parejas_formadas
         for partido in partidos_ronda:
-            p1 = tuple(partido["pareja1"])
-            p2 = tuple(partido["pareja2"])
+            p1 = partido["pareja1"]
+            p2 = partido["pareja2"]
             # registrar parejas formadas (dentro de cada pareja)
-            for pair_in in itertools.combinations(p1, 2):
-                parejas_formadas[tuple(sorted(pair_in))] += 1
-            for pair_in in itertools.combinations(p2, 2):
-                parejas_formadas[tuple(sorted(pair_in))] += 1
+            for x, y in (p1, p2):
+                parejas_formadas[x][y] += 1
+                parejas_formadas[y][x] += 1
 
             # registrar enfrentamientos cubiertos solo si al menos uno de los dos en el par tiene valido True
             for a in p1:
                 for b in p2:
-                    pair = tuple(sorted((a, b)))
                     # si ambos son ayudantes y por tanto no válidos, no cuentan
                     if not (partido["valido_para"].get(a, False) or partido["valido_para"].get(b, False)):
                         continue
-                    enfrentamientos_cubiertos.add(pair)
+                    if not cubiertos[a] & bit[b]:
+                        cubiertos[a] |= bit[b]
+                        cubiertos[b] |= bit[a]
+                        pares_cubiertos += 1
 
             for pl, valido in partido["valido_para"].items():
                 if valido:
@@ -214,15 +209,20 @@ def generar_torneo_todos_contra_todos(
 
         rondas.append({
             "ronda": ronda_idx,
-            "partidos": partidos_ronda,
-            "descansan": descansan
+            "partidos": [{
+                "cancha": partido["cancha"],
+                "pareja1": (jugadores[partido["pareja1"][0]], jugadores[partido["pareja1"][1]]),
+                "pareja2": (jugadores[partido["pareja2"][0]], jugadores[partido["pareja2"][1]]),
+                "ayudantes": [jugadores[a] for a in partido["ayudantes"]],
+                "valido_para": {jugadores[pl]: v for pl, v in partido["valido_para"].items()}
+            } for partido in partidos_ronda],
+            "descansan": [jugadores[j] for j in descansan]
         })
 
         # condición para cortar anticipadamente si ya cubrimos pares y además tenemos igualdad razonable
-        if enfrentamientos_cubiertos == todos_pares:
+        if pares_cubiertos == total_pares:
             # intentar balancear partidos válidos: si hay diferencias pequeñas, es tolerable
-            if not (n == 8 and num_canchas == 2):
-                break
+            break
 
     # si no se alcanzó en target rounds, permitir una ronda más hasta max_total_rounds
     # (el while ya limita con max_round_iters)
@@ -230,17 +230,25 @@ def generar_torneo_todos_contra_todos(
     # preparar resumen
     resumen_df = pd.DataFrame({
         "jugador": jugadores,
-        "partidos_jugados": [partidos_jugados[j] for j in jugadores],
-        "descansos": [descansos[j] for j in jugadores]
+        "partidos_jugados": partidos_jugados,
+        "descansos": descansos
     }).sort_values(by=["partidos_jugados", "descansos"], ascending=[False, True]).reset_index(drop=True)
 
-    meta_alcanzada = (enfrentamientos_cubiertos == todos_pares)
+    # estructuras por nombre solo para la salida (se construyen una vez)
+    todos_pares = set(tuple(sorted(p)) for p in itertools.combinations(jugadores, 2))
+    enfrentamientos_cubiertos = set(
+        tuple(sorted((jugadores[a], jugadores[b])))
+        for a in range(n) for b in range(a + 1, n) if cubiertos[a] & bit[b]
+    )
+
+    meta_alcanzada = (pares_cubiertos == total_pares)
     return {
         "rondas": rondas,
         "enfrentamientos_cubiertos": enfrentamientos_cubiertos,
         "todos_pares": todos_pares,
         "meta_alcanzada": meta_alcanzada,
-        "partidos_jugados": dict(partidos_jugados),
-        "descansos": dict(descansos),
+        "partidos_jugados": dict(zip(jugadores, partidos_jugados)),
+        "descansos": dict(zip(jugadores, descansos)),
+        "config": config,
         "resumen": resumen_df
-    }
\ No newline at end of file
+    }
@@ -3,9 +3,12 @@ from itertools import combinations, product
 from collections import defaultdict
 import pandas as pd
 from typing import List, Dict, Any, Tuple, Set
+from models.schedule_config import ScheduleConfig
+from models.profiling import medir, instrumentar, CANDIDATOS, PUNTAJE, AYUDANTES, ESTADISTICAS, FORMATO
 
 class AmericanoMixtoTournament:
-    def __init__(self, male_players: List[str], female_players: List[str], num_fields: int):
+    def __init__(self, male_players: List[str], female_players: List[str], num_fields: int,
+                 config: ScheduleConfig = None):
         """
         Initialize Americano Mixed Padel Tournament
         
@@ -13,6 +16,7 @@ class AmericanoMixtoTournament:
             male_players: List of male player names
             female_players: List of female player names (must be equal to males)
             num_fields: Number of available padel fields
+            config: Precomputed parameters (built from players/fields if None)
         """
         if len(male_players) != len(female_players):
             raise ValueError("Debe haber el mismo número de hombres y mujeres")
@@ -23,6 +27,7 @@ class AmericanoMixtoTournament:
         self.num_females = len(female_players)
         self.num_fields = num_fields
         self.all_players = male_players + female_players
+        self.config = config or ScheduleConfig.mixto(self.num_males, self.num_females, num_fields)
         
         # Gender mapping
         self.gender = {}
@@ -37,6 +42,7 @@ class AmericanoMixtoTournament:
         self.total_games_played = defaultdict(int)
         self.consecutive_rests = defaultdict(int)
         self.last_round_played = defaultdict(lambda: -1)
+        self.perfil = instrumentar(self)  # None salvo dentro de perfilando()
         
     def calculate_optimal_rounds(self) -> int:
         """
@@ -51,14 +57,10 @@ class AmericanoMixtoTournament:
         Ejemplos:
         - 5H + 5M con 2 canchas: 25 parejas ÷ 4 = 6.25 → 7 rondas
         - 4H + 4M con 2 canchas: 16 parejas ÷ 4 = 4 rondas
-        """
-        total_mixed_pairs = self.num_males * self.num_females
-        pairs_per_round = self.num_fields * 2
-        
-        # Redondear hacia arriba para cubrir todas las parejas
-        optimal_rounds = (total_mixed_pairs + pairs_per_round - 1) // pairs_per_round
         
-        return optimal_rounds
+        Se calcula una sola vez en ScheduleConfig.mixto
+        """
+        return self.config.optimal_rounds
     
     def get_uncovered_mixed_pairs(self) -> Set[Tuple[str, str]]:
         """Get list of (male, female) pairs that haven't partnered yet"""
@@ -75,6 +77,7 @@ class AmericanoMixtoTournament:
             potential = self.male_players
             return sum(1 for m in potential if self.mixed_partner_count[(m, player)] == 0)
     
+    @medir(PUNTAJE, contar=True)
     def get_match_score(self, match: Tuple[str, str, str, str], round_num: int) -> float:
         """
         Score a potential match for mixed tournament
@@ -128,6 +131,7 @@ class AmericanoMixtoTournament:
         
         return score
     
+    @medir(CANDIDATOS)
     def generate_all_possible_matches(self, available_males: List[str], 
                                      available_females: List[str]) -> List[Tuple]:
         """Generate all possible match configurations"""
@@ -145,6 +149,7 @@ class AmericanoMixtoTournament:
         
         return possible_matches
     
+    @medir(CANDIDATOS)
     def generate_round_matches(self, round_num: int) -> Tuple[List[Dict], List[str]]:
         """Generate matches for a round prioritizing uncovered pairs"""
         matches = []
@@ -207,6 +212,7 @@ class AmericanoMixtoTournament:
         resting = list(remaining_males | remaining_females)
         return matches, resting
     
+    @medir(ESTADISTICAS)
     def update_statistics(self, match: Dict, round_num: int):
         """Update tracking statistics after a match"""
         m1, f1, m2, f2 = match["players"]
@@ -231,6 +237,7 @@ class AmericanoMixtoTournament:
             self.total_games_played[p] += 1
             self.last_round_played[p] = round_num
     
+    @medir(AYUDANTES)
     def identify_helpers(self, tournament_schedule: List[List[Dict]]) -> Dict[str, List[Tuple[int, int]]]:
         """
         Identify helpers AFTER tournament generation
@@ -266,7 +273,7 @@ class AmericanoMixtoTournament:
     
     def generate_tournament(self) -> Tuple[List[List[Dict]], Dict, Dict]:
         """Generate complete mixed tournament schedule"""
-        optimal_rounds = self.calculate_optimal_rounds()
+        optimal_rounds = self.config.optimal_rounds
         tournament_schedule = []
         
         for round_num in range(optimal_rounds):
@@ -308,11 +315,13 @@ class AmericanoMixtoTournament:
             "total_mixed_pairs": self.num_males * self.num_females,
             "coverage_percentage": (len(self.mixed_partner_count) / (self.num_males * self.num_females)) * 100,
             "total_rounds_played": len(tournament_schedule),
-            "uncovered_pairs": list(self.get_uncovered_mixed_pairs())
+            "uncovered_pairs": list(self.get_uncovered_mixed_pairs()),
+            "config": self.config
         }
         
         return tournament_schedule, helpers, stats
     
+    @medir(FORMATO, adjuntar=True)
     def format_for_streamlit(self, tournament_schedule: List[List[Dict]], 
                             helpers: Dict, stats: Dict) -> Dict[str, Any]:
         """Format tournament output for Streamlit visualization"""
@@ -1,11 +1,10 @@
-import streamlit as st
 from collections import defaultdict
 import random
-import pandas as pd
-import seaborn as sns
-import matplotlib.pyplot as plt
-import numpy as np
-import itertools
+from models.schedule_config import ScheduleConfig
+from models.profiling import medir, instrumentar, CANDIDATOS, PUNTAJE, ESTADISTICAS, FORMATO
+
+# Núcleo de programación del torneo mixto (sin streamlit ni librerías de gráficos).
+# Los gráficos de análisis están en assets/analyze_funcs.py
 
 class AmericanoPadelTournament:
     """Mixed Americano Tournament - Men & Women pairs with helper logic"""
@@ -35,13 +34,16 @@ class AmericanoPadelTournament:
         self.rounds = []
         self.all_matches_played = set()
         
-        self.target_matches = self.num_players
+        self.config = ScheduleConfig.mixto(len(male_players), len(female_players), num_fields)
+        self.target_matches = self.config.target_games
+        self.perfil = instrumentar(self)  # None salvo dentro de perfilando()
         
     def get_match_signature(self, team1, team2):
         """Create unique signature for a match, ordered by player names"""
         players = sorted(list(team1) + list(team2))
         return tuple(players)
     
+    @medir(PUNTAJE, contar=True)
     def calculate_match_score(self, team1, team2, current_round):
         """Calculate desirability score for a match (LOWER is better)"""
         players = [team1[0], team1[1], team2[0], team2[1]]
@@ -84,6 +86,7 @@ class AmericanoPadelTournament:
             
         return min(self.player_stats[p]['matches'] for p in players_under_target)
     
+    @medir(CANDIDATOS)
     def find_best_matches_for_round(self, num_matches_needed, current_round):
         """Find the best set of matches for a round, prioritizing rest and completeness"""
         selected_matches = []
@@ -153,6 +156,7 @@ class AmericanoPadelTournament:
 
         return selected_matches, used_players
     
+    @medir(ESTADISTICAS)
     def update_player_stats(self, match, round_num):
         """Update statistics after a match is scheduled"""
         team1, team2 = match
@@ -217,6 +221,8 @@ class AmericanoPadelTournament:
             
         return self.rounds
     
+    # Los ayudantes se eligen acá, así que su tiempo cuenta como formato
+    @medir(FORMATO, adjuntar=True)
     def format_for_streamlit(self):
         """Format schedule for Streamlit visualization with helper logic"""
         formatted_rounds = []
@@ -281,7 +287,8 @@ class AmericanoPadelTournament:
         return {
             "rondas": formatted_rounds,
             "resumen": resumen_data,
-            "min_matches": final_min_matches
+            "min_matches": final_min_matches,
+            "config": self.config
         }
 
 
@@ -294,148 +301,3 @@ def generar_torneo_mixto(male_players, female_players, num_canchas, puntos_parti
         return tournament.format_for_streamlit()
     except ValueError as e:
         return {"error": str(e)}
-    
-def get_unique_players(fixture):
-    """Devuelve lista ordenada de jugadores únicos del fixture."""
-    return sorted({p for r in fixture for m in r["partidos"] for p in (m["pareja1"] + m["pareja2"])})
-
-def plot_heatmap(matrix, title, cmap, cbar_label):
-    """Genera y muestra un mapa de calor triangular superior."""
-    mask = np.tril(np.ones_like(matrix, dtype=bool))
-    fig, ax = plt.subplots(figsize=(8, 6))
-    sns.heatmap(matrix, mask=mask, annot=True, fmt="d", cmap=cmap, ax=ax,
-                cbar_kws={"label": cbar_label})
-    plt.title(title)
-    st.pyplot(fig)
-
-def analyze_descansos(fixture, players):
-    """Analiza descansos consecutivos y genera mapa de calor."""
-    descanso_data = []
-    for p in players:
-        pattern = [1 if p in r["descansan"] else 0 for r in fixture]
-        descanso_data.append(pattern)
-
-    df_desc = pd.DataFrame(descanso_data, index=players)
-    df_desc["consec_descansos"] = df_desc.apply(
-        lambda x: max((sum(1 for _ in g) for k, g in itertools.groupby(x) if k == 1), default=0), axis=1
-    )
-
-    st.dataframe(df_desc[["consec_descansos"]].rename(columns={"consec_descansos": "Descansos consecutivos"}))
-
-    fig, ax = plt.subplots(figsize=(8, 4))
-    sns.heatmap(pd.DataFrame(descanso_data, index=players), cmap="YlOrRd", cbar=False, ax=ax)
-    plt.title("Mapa de descansos por ronda (1 = descanso)")
-    plt.xlabel("Ronda")
-    plt.ylabel("Jugador")
-    st.pyplot(fig)
-
-def build_matrices(fixture, players):
-    """Construye matrices de parejas y enfrentamientos."""
-    matrix_parejas = pd.DataFrame(0, index=players, columns=players)
-    matrix_enfrentamientos = pd.DataFrame(0, index=players, columns=players)
-
-    for ronda in fixture:
-        for partido in ronda["partidos"]:
-            p1, p2 = partido["pareja1"], partido["pareja2"]
-
-            # compañeros
-            for a, b in itertools.combinations(p1, 2):
-                matrix_parejas.loc[a, b] += 1
-                matrix_parejas.loc[b, a] += 1
-            for a, b in itertools.combinations(p2, 2):
-                matrix_parejas.loc[a, b] += 1
-                matrix_parejas.loc[b, a] += 1
-
-            # enfrentamientos
-            for a in p1:
-                for b in p2:
-                    matrix_enfrentamientos.loc[a, b] += 1
-                    matrix_enfrentamientos.loc[b, a] += 1
-
-    return matrix_parejas, matrix_enfrentamientos
-
-
-def heatmap_parejas_mixtas_visualizar(matrix, male_players, female_players):
-    """
-    Toma la matriz Hombre-Mujer y la grafica en Streamlit.
-    """
-    fig, ax = plt.subplots(figsize=(len(male_players) * 1.5, len(female_players) * 1.5))
-    sns.heatmap(matrix, annot=True, fmt="d", cmap="Purples", linewidths=.5, linecolor='black', ax=ax,
-                cbar_kws={"label": "Veces como Pareja Mixta"})
-    ax.set_title("Combinaciones de Parejas Mixtas (Hombre vs. Mujer) 🤝")
-    ax.set_xlabel("Hombres")
-    ax.set_ylabel("Mujeres")
-    st.pyplot(fig)
-
-def heatmap_parejas_mixtas(fixture, male_players, female_players):
-    # Crear matriz mujer vs hombre
-    matrix = pd.DataFrame(0, index=female_players, columns=male_players)
-
-    for ronda in fixture:
-        for partido in ronda["partidos"]:
-            p1a, p1b = partido["pareja1"]
-            p2a, p2b = partido["pareja2"]
-
-            # --- Pareja 1 ---
-            # Detectar quién es mujer y quién es hombre
-            for f, m in [(p1a, p1b), (p1b, p1a)]:
-                if f in female_players and m in male_players:
-                    matrix.loc[f, m] += 1
-
-            # --- Pareja 2 ---
-            for f, m in [(p2a, p2b), (p2b, p2a)]:
-                if f in female_players and m in male_players:
-                    matrix.loc[f, m] += 1
-
-    # === Heatmap ===
-    fig, ax = plt.subplots(figsize=(6, 4))
-    sns.heatmap(matrix, annot=True, cmap="Purples", linewidths=.5, ax=ax)
-    ax.set_title("Combinaciones de Parejas Mixtas (Mujer con Hombre)")
-
-    return matrix, fig
-
-
-def analyze_algorithm_results(fixture, male_players, female_players):
-    """Ejecuta todo el análisis visual y estadístico del algoritmo, incluyendo el análisis mixto."""
-    st.markdown("## 🔍 Análisis de Resultados del Algoritmo")
-
-    players = get_unique_players(fixture)
-    matrix_parejas, matrix_enfrentamientos = build_matrices(fixture, players)
-
-    # ----------------------------------------------------
-    # 1. Mapa de Calor: Parejas Mixtas (Hombre con Mujer)
-    # ----------------------------------------------------
-    st.markdown("### 1. Parejas Mixtas (Balanceo por género) 🚺🚹")
-    matrix_mixta, _ = heatmap_parejas_mixtas(fixture, male_players, female_players)
-    
-    # Usar la nueva función de visualización
-    heatmap_parejas_mixtas_visualizar(matrix_mixta, male_players, female_players)
-    
-    st.divider()
-
-    # ----------------------------------------------------
-    # 2. Mapa de Calor: Parejas Generales (General)
-    # ----------------------------------------------------
-    st.markdown("### 2. Parejas Generales (Compañeros totales)")
-    # Se utiliza la función existente plot_heatmap
-    plot_heatmap(matrix_parejas, 
-                 "Frecuencia de jugadores que compartieron pareja (General)", 
-                 "PuBuGn", "Veces como pareja")
-
-    st.divider()
-
-    # ----------------------------------------------------
-    # 3. Mapa de Calor: Enfrentamientos
-    # ----------------------------------------------------
-    st.markdown("### 3. Enfrentamientos (Oponentes)")
-    plot_heatmap(matrix_enfrentamientos, 
-                 "Frecuencia de jugadores que se enfrentaron", 
-                 "OrRd", "Veces como oponentes")
-                 
-    st.divider()
-
-    # ----------------------------------------------------
-    # 4. Análisis de Descansos
-    # ----------------------------------------------------
-    st.markdown("### 4. Análisis de Descansos 😴")
-    analyze_descansos(fixture, players)
\ No newline at end of file
@@ -3,6 +3,9 @@ from typing import List, Dict, Any, Tuple
 from collections import deque
 import math
 import itertools
+from models.schedule_config import ScheduleConfig
+from models.round_robin import rondas_circulo
+from models.profiling import medir, instrumentar, CANDIDATOS, FORMATO
 
 class FixedPairsTournament:
     def __init__(self, pairs: List[str], num_fields: int):
@@ -11,120 +14,113 @@ class FixedPairsTournament:
             p.replace("-", " & ") if "-" in p else p
             for p in pairs
         ]
+        self.config = ScheduleConfig.fixed_pairs(len(self.team_names), num_fields)
+        self.perfil = instrumentar(self)  # None salvo dentro de perfilando()
         
     def generate_schedule(self) -> Dict[str, Any]:
         """
-        1. Genera la secuencia completa de partidos (Round Robin).
-        2. Asigna partidos a Rondas Logísticas fijas (tamaño = num_fields) 
-           usando un algoritmo Codicioso para evitar la repetición de equipos.
+        1. Genera las rondas del Round Robin (Método del Círculo): cada
+           equipo a lo sumo una vez por ronda.
+        2. Las reparte en Rondas Logísticas de a lo sumo num_fields partidos
+           con el mínimo de rondas posible, ceil(M / canchas utilizables).
         """
-        teams = self.team_names.copy()
-        
-        # 1. Preparación y Generación de la Secuencia (Método del Círculo)
-        # Esto genera todos los 15 partidos en un orden equilibrado.
-        is_odd = len(teams) % 2 != 0
-        if is_odd:
-            teams.append("BYE") 
-            
-        n = len(teams)
-        total_rounds_math = n - 1
-        fixed_team = teams[0]
-        rotating_teams = deque(teams[1:]) 
-        
-        all_matches_sequence = []
-        
-        for r in range(total_rounds_math):
-            # 1. Fijo vs Rotador
-            t1_fixed = fixed_team
-            t2_fixed = rotating_teams[0]
-            if "BYE" not in (t1_fixed, t2_fixed):
-                all_matches_sequence.append((t1_fixed, t2_fixed))
-            
-            # 2. Rotadores entre sí
-            num_rotating = len(rotating_teams)
-            half_rotating = num_rotating // 2 
-            
-            for i in range(1, half_rotating + 1):
-                t1 = rotating_teams[i] 
-                t2 = rotating_teams[num_rotating - i] 
-                
-                if "BYE" not in (t1, t2):
-                    if r % 2 == 0:
-                         all_matches_sequence.append((t1, t2))
-                    else:
-                         all_matches_sequence.append((t2, t1))
+        rondas_circulo = self._circle_rounds()
+        rondas = self._empaquetar(rondas_circulo)
 
-            rotating_teams.rotate(1)
-            
-        # --- FASE 3: Creación de Rondas Logísticas con Asignación Codiciosa ---
-        
+        # --- Creación de Rondas Logísticas ---
         formatted_rounds = []
-        ronda_counter = 1
         all_teams_names = set(self.team_names)
-        
-        # Creamos una lista mutable de los partidos pendientes
-        matches_pendientes = all_matches_sequence.copy()
-        
-        # Iteramos mientras queden partidos por asignar
-        while matches_pendientes:
-            
-            matches_in_this_round = []
-            current_playing_teams = set()
-            indices_a_remover = [] # Usamos esto para marcar los partidos asignados
-            
-            # Intentar llenar las canchas (algoritmo codicioso)
-            for c_i in range(self.num_fields):
-                
-                match_asignado = None
-                
-                # 1. Buscar el primer partido disponible que no cause conflicto
-                for idx_pend, match in enumerate(matches_pendientes):
-                    team1, team2 = match
-                    
-                    # Chequeo de conflicto: ¿Alguno de los equipos ya está jugando en esta ronda?
-                    if team1 not in current_playing_teams and team2 not in current_playing_teams:
-                        # Partido encontrado y sin conflicto
-                        match_asignado = match
-                        # Guardamos el índice para removerlo después (no podemos modificar la lista mientras iteramos)
-                        indices_a_remover.append(idx_pend)
-                        break
-                
-                # 2. Asignar si se encontró un partido
-                if match_asignado:
-                    team1, team2 = match_asignado
-                    
-                    matches_in_this_round.append({
-                        "cancha": c_i + 1,
-                        "pareja1": team1,
-                        "pareja2": team2,
-                        "turno": 1 
-                    })
-                    
-                    current_playing_teams.add(team1)
-                    current_playing_teams.add(team2)
-                else:
-                    # Si no encontramos más partidos sin conflicto, rompemos el loop de canchas
-                    break 
+        for ronda_counter, partidos in enumerate(rondas, start=1):
+            jugando = {t for match in partidos for t in match}
+            formatted_rounds.append({
+                "ronda": ronda_counter,
+                "partidos": [{"cancha": c_i + 1, "pareja1": t1, "pareja2": t2, "turno": 1}
+                             for c_i, (t1, t2) in enumerate(partidos)],
+                "descansan": [t for t in self.team_names if t not in jugando],
+                # Canchas que quedan sin partido en esta ronda (0 salvo donde es inevitable)
+                "canchas_libres": self.num_fields - len(partidos),
+            })
 
-            # 3. Remover los partidos asignados de matches_pendientes
-            # Debemos remover de mayor a menor índice para no alterar los índices restantes
-            indices_a_remover.sort(reverse=True)
-            for idx in indices_a_remover:
-                del matches_pendientes[idx]
+        return self._format_output(formatted_rounds)
 
-            # 4. Finalizar la Ronda Logística
-            if matches_in_this_round:
-                resting_teams = list(all_teams_names - current_playing_teams)
-                
-                formatted_rounds.append({
-                    "ronda": ronda_counter,
-                    "partidos": matches_in_this_round,
-                    "descansan": resting_teams
-                })
-                ronda_counter += 1
+    @medir(CANDIDATOS)
+    def _circle_rounds(self) -> List[List[Tuple[str, str]]]:
+        """Rondas del Método del Círculo: T-1 (T par) o T (T impar) rondas sin equipos repetidos"""
+        return rondas_circulo(self.team_names)
 
-        return self._format_output(formatted_rounds)
+    @medir(CANDIDATOS)
+    def _empaquetar(self, rondas_circulo: List[List[Tuple[str, str]]]) -> List[List[Tuple[str, str]]]:
+        """
+        Reparte los partidos en ceil(M / c) rondas de a lo sumo c partidos,
+        con c = min(num_fields, T // 2) (más canchas no se pueden llenar).
+
+        Cada ronda del círculo es un conjunto de partidos sin equipos
+        repetidos. Se agregan rondas vacías hasta llegar al mínimo y, mientras
+        una ronda A tenga más de c partidos, se pasa a una ronda B con menos
+        de c un camino alternante de A∪B (intercambio de Kempe): A pierde un
+        partido, B gana uno y ninguna de las dos repite equipos. Con |A| > |B|
+        ese camino siempre existe y mide a lo sumo 2|B|+1, así que el total
+        es O(M · canchas).
+        """
+        total = sum(len(r) for r in rondas_circulo)
+        c = min(self.num_fields, len(self.team_names) // 2)
+        if total == 0 or c <= 0:
+            return []
+
+        # Cada ronda como {equipo: partido}, para seguir el camino en O(1) por paso
+        rondas = [{t: match for match in r for t in match} for r in rondas_circulo]
+        rondas += [{} for _ in range(max(0, math.ceil(total / c) - len(rondas)))]
+
+        libres = deque(i for i, r in enumerate(rondas) if len(r) // 2 < c)
+        for a in rondas:
+            while len(a) // 2 > c:
+                b = rondas[libres[0]]
+                self._mover_camino(a, b)
+                if len(b) // 2 == c:
+                    libres.popleft()
+
+        # Primero las rondas completas; las que tienen canchas libres quedan al final
+        partidos = [list(dict.fromkeys(r.values())) for r in rondas]
+        partidos.sort(key=len, reverse=True)
+        return [p for p in partidos if p]
+
+    @staticmethod
+    def _mover_camino(a: Dict[str, Tuple[str, str]], b: Dict[str, Tuple[str, str]]):
+        """
+        Busca en a∪b un camino que empieza y termina con partidos de 'a' e
+        intercambia sus partidos entre las dos rondas (|a| - 1, |b| + 1).
+        """
+        def rival(match, equipo):
+            return match[1] if match[0] == equipo else match[0]
+
+        visitados = set()
+        for inicio in list(a):
+            if inicio in b or inicio in visitados:
+                continue
+            camino, actual, en_a = [], inicio, True
+            while True:
+                ronda = a if en_a else b
+                if actual not in ronda:
+                    break
+                match = ronda[actual]
+                camino.append((match, en_a))
+                visitados.add(actual)
+                actual, en_a = rival(match, actual), not en_a
+            visitados.add(actual)
+            if camino[-1][1]:
+                # Termina con un partido de 'a': hay uno más de 'a' que de 'b'
+                for match, de_a in camino:
+                    origen = a if de_a else b
+                    for t in match:
+                        del origen[t]
+                for match, de_a in camino:
+                    destino = b if de_a else a
+                    for t in match:
+                        destino[t] = match
+                return
+        raise RuntimeError("No hay camino alternante: la ronda no tiene más partidos que la otra")
 
+    @medir(FORMATO, adjuntar=True)
     def _format_output(self, rounds: List[Dict]) -> Dict[str, Any]:
         """Genera estructura compatible con tu frontend (sin cambios)"""
         games_played = {team: 0 for team in self.team_names}
@@ -145,7 +141,10 @@ class FixedPairsTournament:
             "resumen": resumen_df,
             "stats": {
                 "total_rounds": len(rounds),
-                "players_count": len(self.team_names),
-                "fields": self.num_fields
+                "players_count": self.config.num_players,
+                "fields": self.num_fields,
+                # Turnos de cancha sin partido en todo el torneo (ver "canchas_libres" de cada ronda)
+                "idle_courts": sum(r["canchas_libres"] for r in rounds),
+                "config": self.config
             }
         }
\ No newline at end of file
@@ -0,0 +1,210 @@
+import hashlib
+import json
+import os
+from typing import Dict, Any, Callable, Optional, Sequence, Tuple
+import pandas as pd
+
+# Subir la versión de un modo cuando cambie su motor: invalida las entradas viejas
+VERSIONES_MOTOR = {
+    "americano": 1,       # pages/torneo.py - Todos Contra Todos (restarts + v3 + biblioteca)
+    "parejas_fijas": 2,   # pages/torneo.py - FixedPairsTournament (2: empaquetado óptimo de rondas)
+    "mixto": 1,           # pages/torneo_mixto.py - AllvsAll_MixtoV2
+    "sets": 2,            # pages/torneo_sets.py - generar_fixture_parejas (2: round robin por círculo)
+}
+
+# Campos de un partido/ronda que contienen nombres de jugadores (o parejas)
+CAMPOS_NOMBRE = ("pareja1", "pareja2", "ayudantes", "valido_para", "descansan")
+
+DIRECTORIO_POR_DEFECTO = os.environ.get(
+    "PADEL_FIXTURE_CACHE", os.path.join(os.path.expanduser("~"), ".cache", "padelapp", "fixtures"))
+
+
+def _a_indices(valor, indice: Dict[str, int]):
+    """Reemplaza nombres por índices (KeyError si aparece un texto desconocido)"""
+    if isinstance(valor, str):
+        return indice[valor]
+    if isinstance(valor, dict):
+        # valido_para {nombre: bool} en los motores v1/v2/v4
+        return {str(indice[k]): v for k, v in valor.items()}
+    return [_a_indices(v, indice) for v in valor]
+
+
+def _a_nombres(valor, nombres: Sequence[str]):
+    """Inverso de _a_indices: índices -> nombres del torneo actual"""
+    if isinstance(valor, int):
+        return nombres[valor]
+    if isinstance(valor, dict):
+        return {nombres[int(k)]: v for k, v in valor.items()}
+    return [_a_nombres(v, nombres) for v in valor]
+
+
+def _mapear_ronda(ronda, funcion):
+    """Aplica 'funcion' a los campos con nombres de una ronda (dict) o a la ronda entera (sets)"""
+    if not isinstance(ronda, dict):
+        # Sets: la ronda es una lista de tuplas (pareja1, pareja2)
+        return funcion(ronda)
+    salida = {}
+    for campo, valor in ronda.items():
+        if campo == "partidos":
+            salida[campo] = [{k: funcion(v) if k in CAMPOS_NOMBRE else v for k, v in partido.items()}
+                             for partido in valor]
+        elif campo in CAMPOS_NOMBRE:
+            salida[campo] = funcion(valor)
+        else:
+            salida[campo] = valor
+    return salida
+
+
+class FixtureCache:
+    """
+    Cache en disco de fixtures generados, en términos de índices de jugadores.
+
+    Un fixture depende solo de la cantidad de jugadores, no de sus nombres:
+    se guarda con índices y al leerlo se reetiqueta con los nombres actuales.
+    Cada entrada es un archivo JSON; el más viejo según la fecha de último
+    uso se borra al pasar max_entradas (LRU). Una entrada con otra versión
+    de motor (VERSIONES_MOTOR) se descarta al leerla.
+    """
+
+    def __init__(self, directorio: str = DIRECTORIO_POR_DEFECTO, max_entradas: int = 256):
+        self.directorio = directorio
+        self.max_entradas = max_entradas
+
+    def _ruta(self, modo: str, grupos: Tuple[int, ...], num_canchas: int, seed) -> str:
+        clave = f"{modo}:{'x'.join(map(str, grupos))}:{num_canchas}:{seed}"
+        return os.path.join(self.directorio, hashlib.sha1(clave.encode()).hexdigest()[:20] + ".json")
+
+    def get(self, modo: str, jugadores: Sequence[str], num_canchas: int, seed=None,
+            grupos: Tuple[int, ...] = None) -> Optional[Any]:
+        """
+        Devuelve el fixture guardado, reetiquetado con 'jugadores', o None.
+        Tiene la misma forma que se guardó (dict de salida o lista de rondas).
+
+        Args:
+            modo: Clave de VERSIONES_MOTOR
+            jugadores: Nombres tal como aparecen en el fixture, en orden
+            num_canchas: Número de canchas
+            seed: Semilla usada al generar (None si el motor no recibe semilla)
+            grupos: Tamaño de cada grupo si importa (ej. hombres y mujeres)
+        """
+        ruta = self._ruta(modo, grupos or (len(jugadores),), num_canchas, seed)
+        try:
+            with open(ruta) as f:
+                entrada = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if entrada.get("version") != VERSIONES_MOTOR.get(modo):
+            try:
+                os.remove(ruta)
+            except OSError:
+                pass
+            return None
+
+        try:
+            os.utime(ruta)  # marca de uso para el LRU
+        except OSError:
+            pass
+
+        nombres = list(jugadores)
+        rondas = [_mapear_ronda(r, lambda v: _a_nombres(v, nombres)) for r in entrada["rondas"]]
+        if entrada.get("solo_rondas"):
+            return rondas
+
+        out = dict(entrada["extras"])
+        out["rondas"] = rondas
+        if entrada.get("resumen") is not None:
+            resumen = entrada["resumen"]
+            columnas = {c: (_a_nombres(v, nombres) if c in resumen["columnas_nombre"] else v)
+                        for c, v in resumen["columnas"].items()}
+            out["resumen"] = pd.DataFrame(columnas)
+        out["cache"] = True
+        return out
+
+    def put(self, modo: str, jugadores: Sequence[str], num_canchas: int, out: Any, seed=None,
+            grupos: Tuple[int, ...] = None) -> bool:
+        """
+        Guarda un fixture ('rondas' y 'resumen' de la salida del motor, o la
+        lista de rondas directamente). Si el fixture tiene textos que no son
+        nombres de 'jugadores' no se guarda.
+
+        Returns:
+            True si quedó guardado
+        """
+        if isinstance(out, dict) and "error" in out:
+            return False
+        indice = {nombre: i for i, nombre in enumerate(jugadores)}
+        rondas = out["rondas"] if isinstance(out, dict) else out
+
+        try:
+            entrada = {
+                "version": VERSIONES_MOTOR.get(modo),
+                "rondas": [_mapear_ronda(r, lambda v: _a_indices(v, indice)) for r in rondas],
+                "resumen": None,
+                "extras": {},
+                "solo_rondas": not isinstance(out, dict),
+            }
+            if isinstance(out, dict):
+                if out.get("resumen") is not None:
+                    columnas = pd.DataFrame(out["resumen"]).to_dict("list")
+                    nombre_cols = [c for c, v in columnas.items() if v and all(isinstance(x, str) for x in v)]
+                    for c in nombre_cols:
+                        columnas[c] = _a_indices(columnas[c], indice)
+                    entrada["resumen"] = {"columnas": columnas, "columnas_nombre": nombre_cols}
+                # Escalares sueltos (ej. min_matches); stats/config no se guardan
+                entrada["extras"] = {k: v for k, v in out.items()
+                                     if isinstance(v, (int, float, bool)) and k != "cache"}
+            contenido = json.dumps(entrada, separators=(",", ":"), default=int)
+        except (KeyError, TypeError, ValueError):
+            return False
+
+        ruta = self._ruta(modo, grupos or (len(jugadores),), num_canchas, seed)
+        try:
+            os.makedirs(self.directorio, exist_ok=True)
+            temporal = f"{ruta}.{os.getpid()}.tmp"
+            with open(temporal, "w") as f:
+                f.write(contenido)
+            os.replace(temporal, ruta)  # escritura atómica
+            self._recortar()
+        except OSError:
+            return False
+        return True
+
+    def _recortar(self):
+        """Borra las entradas usadas hace más tiempo hasta quedar en max_entradas"""
+        archivos = [os.path.join(self.directorio, f) for f in os.listdir(self.directorio) if f.endswith(".json")]
+        if len(archivos) <= self.max_entradas:
+            return
+        archivos.sort(key=os.path.getmtime)
+        for ruta in archivos[:len(archivos) - self.max_entradas]:
+            try:
+                os.remove(ruta)
+            except OSError:
+                pass
+
+    def obtener(self, modo: str, jugadores: Sequence[str], num_canchas: int,
+                generar: Callable[[], Any], seed=None, grupos: Tuple[int, ...] = None) -> Any:
+        """
+        Lee el fixture de la cache o lo genera con generar() y lo guarda.
+
+        Returns:
+            Lo mismo que devuelve generar(); desde la cache, un dict trae solo
+            'rondas', 'resumen' y los valores escalares
+        """
+        out = self.get(modo, jugadores, num_canchas, seed, grupos)
+        if out is not None:
+            return out
+        out = generar()
+        self.put(modo, jugadores, num_canchas, out, seed, grupos)
+        return out
+
+
+_cache = None
+
+
+def fixture_cache() -> FixtureCache:
+    """Cache compartida por las páginas (directorio PADEL_FIXTURE_CACHE o ~/.cache/padelapp)"""
+    global _cache
+    if _cache is None:
+        _cache = FixtureCache()
+    return _cache
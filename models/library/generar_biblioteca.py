@@ -0,0 +1,153 @@
+"""Genera models/library/americano.json con torneos whist cíclicos.
+
+Un torneo whist Wh(n) es un americano perfecto: cada jugador es pareja de
+cada otro exactamente una vez y rival exactamente dos veces.
+
+- n = 4m + 1: jugadores Z_n. Una ronda base con m mesas que parte Z_n - {0}
+  se desarrolla mod n (n rondas, en la ronda i descansa el jugador i).
+- n = 4m: jugadores Z_(n-1) + {inf}. Una ronda base con m mesas que parte
+  todos los jugadores se desarrolla mod n-1 (n-1 rondas, nadie descansa).
+
+La ronda base se busca con backtracking sobre diferencias: las diferencias
+de pareja cubren cada elemento no nulo una vez y las de rivales dos veces.
+Uso: python -m models.library.generar_biblioteca
+"""
+import json
+import os
+import random
+import sys
+
+INF = -1
+
+
+def buscar_ronda_base(n: int, rng: random.Random, max_nodos: int = 200000):
+    """Busca la ronda base de un Wh(n) cíclico; devuelve lista de mesas (a, b, c, d) o None"""
+    m = n // 4
+    modulo = n if n % 4 == 1 else n - 1
+    elementos = list(range(1, modulo)) if n % 4 == 1 else list(range(modulo)) + [INF]
+
+    pareja = [0] * modulo
+    rival = [0] * modulo
+    usados = set()
+    mesas = []
+    nodos = [0]
+
+    def dif(a, b):
+        return (a - b) % modulo
+
+    def agregar(cont, a, b, signo, limite):
+        """Suma/resta las diferencias ±(a-b); devuelve False si alguna pasa el límite"""
+        if a == INF or b == INF:
+            return True
+        ok = True
+        for d in (dif(a, b), dif(b, a)):
+            cont[d] += signo
+            if cont[d] > limite:
+                ok = False
+        return ok
+
+    def mesa_pares(a, b, c, d):
+        return [(pareja, a, b, 1), (pareja, c, d, 1),
+                (rival, a, c, 2), (rival, a, d, 2), (rival, b, c, 2), (rival, b, d, 2)]
+
+    def backtrack():
+        nodos[0] += 1
+        if nodos[0] > max_nodos:
+            return False
+        libres = [e for e in elementos if e not in usados]
+        if not libres:
+            return True
+        a = libres[0]
+        resto = libres[1:]
+        rng.shuffle(resto)
+        for i, b in enumerate(resto):
+            for j, c in enumerate(resto):
+                if c == b:
+                    continue
+                for d in resto[j + 1:]:
+                    if d == b:
+                        continue
+                    ok = True
+                    aplicados = []
+                    for cont, x, y, limite in mesa_pares(a, b, c, d):
+                        aplicados.append((cont, x, y))
+                        if not agregar(cont, x, y, 1, limite):
+                            ok = False
+                            break
+                    if ok:
+                        usados.update((a, b, c, d))
+                        mesas.append((a, b, c, d))
+                        if backtrack():
+                            return True
+                        mesas.pop()
+                        usados.difference_update((a, b, c, d))
+                    for cont, x, y in aplicados:
+                        agregar(cont, x, y, -1, 99)
+        return False
+
+    # el jugador inf siempre juega con pareja libre, el resto por diferencias
+    if backtrack() and len(mesas) == m:
+        return mesas
+    return None
+
+
+def desarrollar(n: int, base):
+    """Desarrolla la ronda base: devuelve rondas como listas de [a, b, c, d] con ids 0..n-1"""
+    modulo = n if n % 4 == 1 else n - 1
+    rondas = []
+    for i in range(modulo):
+        ronda = []
+        for mesa in base:
+            ronda.append([modulo if x == INF else (x + i) % modulo for x in mesa])
+        rondas.append(ronda)
+    return rondas
+
+
+def es_whist(n: int, rondas) -> bool:
+    parejas, rivales = {}, {}
+    for ronda in rondas:
+        vistos = [p for mesa in ronda for p in mesa]
+        if len(vistos) != len(set(vistos)):
+            return False
+        for a, b, c, d in ronda:
+            for x, y in ((a, b), (c, d)):
+                k = (min(x, y), max(x, y))
+                parejas[k] = parejas.get(k, 0) + 1
+            for x in (a, b):
+                for y in (c, d):
+                    k = (min(x, y), max(x, y))
+                    rivales[k] = rivales.get(k, 0) + 1
+    total = n * (n - 1) // 2
+    return (len(parejas) == total and all(v == 1 for v in parejas.values())
+            and len(rivales) == total and all(v == 2 for v in rivales.values()))
+
+
+def main(max_n: int = 28):
+    rng = random.Random(2024)
+    biblioteca = {}
+    for n in range(5, max_n + 1):
+        if n % 4 not in (0, 1):
+            continue
+        base = None
+        for _ in range(50):
+            base = buscar_ronda_base(n, rng)
+            if base:
+                break
+        if not base:
+            print(f"Wh({n}): no encontrado")
+            continue
+        rondas = desarrollar(n, base)
+        assert es_whist(n, rondas)
+        # con menos canchas el whist se estira a varias veces n rondas, así que
+        # solo se guarda la versión que usa n // 4 canchas
+        mesas = n // 4
+        biblioteca[f"americano:{n}:{mesas}"] = rondas
+        print(f"Wh({n}): {len(rondas)} rondas, {mesas} canchas")
+
+    ruta = os.path.join(os.path.dirname(__file__), "americano.json")
+    with open(ruta, "w") as f:
+        json.dump(biblioteca, f, separators=(",", ":"))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 28)
@@ -0,0 +1,157 @@
+from typing import List, Dict, Tuple, Any, Sequence
+import numpy as np
+import pandas as pd
+
+
+def _lado(valor) -> List[str]:
+    """Un lado del partido como lista: 'Ana & Beto' (parejas fijas/sets) o ['Ana', 'Beto']"""
+    return [valor] if isinstance(valor, str) else list(valor)
+
+
+def _es_valido(jugador: str, validos) -> bool:
+    # valido_para es una lista (v3, mixto) o un dict {jugador: bool} (v1/v2/v4)
+    if isinstance(validos, dict):
+        return bool(validos.get(jugador))
+    return jugador in validos
+
+
+class RegistroPartidos:
+    """
+    Registro compacto de los partidos de un fixture y sus resultados.
+
+    Cada partido es una fila (id entero) que se ubica por (ronda, cancha);
+    los nombres se resuelven una sola vez al construir, así que cargar un
+    resultado o calcular un ranking no arma ni parte strings con " & ".
+
+    Columnas (una fila por partido):
+        ronda, cancha: int
+        lados: (M, 2, K) índices en 'participantes' de cada lado (-1 = vacío).
+               K es 2 en americano/mixto y 1 en parejas fijas/sets, donde
+               el participante es la pareja.
+        validos: (M, 2, K) quién suma puntos (los ayudantes no)
+        puntos: (M, 2) resultado cargado
+        cargado: (M,) si el partido ya tiene resultado
+    """
+
+    def __init__(self, fixture: List[Any], participantes: Sequence[str] = ()):
+        """
+        Args:
+            fixture: Rondas como dict ({"ronda", "partidos", ...}) o, en sets,
+                     listas de tuplas (pareja1, pareja2) con la cancha por posición
+            participantes: Orden inicial de los participantes (ej. las parejas
+                           inscriptas); los que falten se agregan al aparecer
+        """
+        self.fixture = fixture
+        self.participantes: List[str] = []
+        self.indice: Dict[str, int] = {}
+        for p in participantes:
+            self._id(p)
+
+        filas = []
+        for r_i, ronda in enumerate(fixture, start=1):
+            if isinstance(ronda, dict):
+                for partido in ronda["partidos"]:
+                    p1, p2 = _lado(partido["pareja1"]), _lado(partido["pareja2"])
+                    validos = partido.get("valido_para", p1 + p2)
+                    filas.append((ronda.get("ronda", r_i), partido["cancha"], p1, p2, validos))
+                for p in ronda.get("descansan", []):
+                    self._id(p)
+            else:
+                for c_i, (p1, p2) in enumerate(ronda, start=1):
+                    filas.append((r_i, c_i, _lado(p1), _lado(p2), None))
+
+        m = len(filas)
+        k = max((max(len(f[2]), len(f[3])) for f in filas), default=1)
+        self.ronda = np.zeros(m, dtype=np.int32)
+        self.cancha = np.zeros(m, dtype=np.int32)
+        self.lados = np.full((m, 2, k), -1, dtype=np.int32)
+        self.validos = np.zeros((m, 2, k), dtype=bool)
+        self.puntos = np.zeros((m, 2), dtype=np.int32)
+        self.cargado = np.zeros(m, dtype=bool)
+        self.ids: Dict[Tuple[int, int], int] = {}
+
+        for fila, (ronda, cancha, p1, p2, validos) in enumerate(filas):
+            self.ronda[fila], self.cancha[fila] = ronda, cancha
+            self.ids[(int(ronda), int(cancha))] = fila
+            for lado, pareja in enumerate((p1, p2)):
+                for pos, jugador in enumerate(pareja):
+                    self.lados[fila, lado, pos] = self._id(jugador)
+                    self.validos[fila, lado, pos] = validos is None or _es_valido(jugador, validos)
+
+    def _id(self, nombre: str) -> int:
+        if nombre not in self.indice:
+            self.indice[nombre] = len(self.participantes)
+            self.participantes.append(nombre)
+        return self.indice[nombre]
+
+    def __len__(self) -> int:
+        return len(self.ronda)
+
+    def fila(self, ronda: int, cancha: int) -> int:
+        """Id del partido jugado en (ronda, cancha); KeyError si no existe"""
+        return self.ids[(ronda, cancha)]
+
+    def registrar(self, ronda: int, cancha: int, p1: int, p2: int) -> int:
+        """
+        Carga (o corrige) el resultado de un partido.
+
+        Returns:
+            El id del partido
+        """
+        fila = self.ids[(ronda, cancha)]
+        self.puntos[fila] = (p1, p2)
+        self.cargado[fila] = True
+        return fila
+
+    def puntaje(self, ronda: int, cancha: int) -> Tuple[int, int]:
+        """Resultado guardado del partido, (0, 0) si no hay"""
+        fila = self.ids.get((ronda, cancha))
+        if fila is None:
+            return 0, 0
+        return int(self.puntos[fila, 0]), int(self.puntos[fila, 1])
+
+    def cargados(self) -> np.ndarray:
+        """Ids de los partidos con resultado"""
+        return np.flatnonzero(self.cargado)
+
+    def ronda_pendiente(self) -> int:
+        """Primera ronda con algún partido sin resultado (la última si están todos cargados)"""
+        pendientes = self.ronda[~self.cargado]
+        if len(pendientes):
+            return int(pendientes.min())
+        return int(self.ronda.max()) if len(self.ronda) else 1
+
+    def jugadores_validos(self, fila: int, lado: int) -> np.ndarray:
+        """Índices de los jugadores que suman puntos en un lado (0 o 1) del partido"""
+        return self.lados[fila, lado][self.validos[fila, lado]]
+
+    def nombres(self, fila: int, lado: int) -> List[str]:
+        """Nombres de un lado del partido"""
+        return [self.participantes[j] for j in self.lados[fila, lado] if j >= 0]
+
+    def tabla(self) -> pd.DataFrame:
+        """Partidos con resultado, uno por fila (para exportar)"""
+        filas = self.cargados()
+        return pd.DataFrame({
+            "Ronda": self.ronda[filas],
+            "Cancha": self.cancha[filas],
+            "Pareja 1": [" & ".join(self.nombres(f, 0)) for f in filas],
+            "Pareja 2": [" & ".join(self.nombres(f, 1)) for f in filas],
+            "Puntos 1": self.puntos[filas, 0],
+            "Puntos 2": self.puntos[filas, 1],
+        })
+
+
+def registro_en_sesion(session_state: Any) -> RegistroPartidos:
+    """
+    RegistroPartidos del fixture actual guardado en session_state.
+
+    Las páginas lo crean al generar el fixture (con el orden de las parejas);
+    acá se arma vacío si falta o si el fixture cambió desde que se armó.
+    """
+    registro = session_state.get("registro")
+    fixture = session_state.get("fixture", [])
+    if registro is None or registro.fixture is not fixture:
+        registro = RegistroPartidos(fixture)
+        session_state["registro"] = registro
+    return registro
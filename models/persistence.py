@@ -0,0 +1,281 @@
+"""Persistencia de torneos en SQLite (un archivo local, modo WAL).
+
+Cada torneo es una fila de 'torneos' (fixture, participantes y las
+claves de sesión para redibujarlo) y cada partido una fila de
+'partidos', que se actualiza al cargar el resultado. Las escrituras
+se juntan en memoria y las hace un hilo aparte en una transacción
+cada 'demora' segundos: los callbacks de la UI nunca esperan al disco.
+"""
+import atexit
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+import uuid
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+
+RUTA_POR_DEFECTO = os.environ.get(
+    "PADEL_TORNEOS_DB", os.path.join(os.path.expanduser("~"), ".local", "share", "padelapp", "torneos.db"))
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS torneos (
+    id TEXT PRIMARY KEY,
+    modo TEXT NOT NULL,
+    estado TEXT NOT NULL,          -- JSON: fixture, participantes, sesion
+    creado REAL NOT NULL,
+    actualizado REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS partidos (
+    torneo_id TEXT NOT NULL REFERENCES torneos(id) ON DELETE CASCADE,
+    ronda INTEGER NOT NULL,
+    cancha INTEGER NOT NULL,
+    puntos1 INTEGER NOT NULL DEFAULT 0,
+    puntos2 INTEGER NOT NULL DEFAULT 0,
+    cargado INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (torneo_id, ronda, cancha)
+) WITHOUT ROWID;
+"""
+
+Clave = Tuple[str, int, int]  # (torneo_id, ronda, cancha)
+
+
+class TorneosDB:
+    """
+    Torneos y resultados en un archivo SQLite, con escrituras diferidas.
+
+    - WAL: las lecturas (cargar) no esperan a las escrituras y un corte a
+      mitad de una transacción no deja el archivo a medias.
+    - synchronous=NORMAL: el fsync lo hace el hilo escritor en los
+      checkpoints, nunca el hilo de la UI.
+    - crear() y guardar_resultado() solo dejan el cambio en memoria (varios
+      cambios del mismo partido quedan en el último) y avisan al hilo, que
+      espera 'demora' segundos sin cambios nuevos (a lo sumo 'espera_maxima')
+      y escribe todo lo pendiente en una transacción.
+    - cargar() suma lo pendiente y el lote que se está escribiendo a lo
+      leído: en el mismo proceso no se pierde un resultado aunque todavía
+      no esté en disco.
+    - Si una escritura falla se reintenta hasta 'reintentos' veces, con
+      espera doble cada vez; después el lote se descarta (queda en los
+      torneos en memoria, no en disco) para no reintentar para siempre.
+    """
+
+    def __init__(self, ruta: str = RUTA_POR_DEFECTO, demora: float = 0.5, espera_maxima: float = 2.0,
+                 reintentos: int = 4):
+        self.ruta = ruta
+        self.demora = demora
+        self.espera_maxima = espera_maxima
+        self.reintentos = reintentos
+
+        directorio = os.path.dirname(ruta)
+        if directorio:
+            os.makedirs(directorio, exist_ok=True)
+        with self._conectar() as conexion:
+            conexion.execute("PRAGMA journal_mode=WAL")
+            conexion.executescript(_ESQUEMA)
+
+        self._lock = threading.Lock()
+        self._nuevos: Dict[str, Tuple[str, Dict[str, Any], List[Tuple[int, int]]]] = {}
+        self._resultados: Dict[Clave, Tuple[int, int]] = {}
+        # Lote que el hilo está escribiendo: sigue visible para cargar() hasta el commit
+        self._en_vuelo: Tuple[Dict[str, Any], Dict[Clave, Tuple[int, int]]] = ({}, {})
+        self._aviso = threading.Event()
+        self._vacio = threading.Event()
+        self._vacio.set()
+        self._cerrado = False
+        self._ultimo_cambio = 0.0
+        self._primer_cambio = 0.0
+
+        self._hilo = threading.Thread(target=self._escritor, name="torneos-db", daemon=True)
+        self._hilo.start()
+        atexit.register(self.cerrar)
+
+    def _conectar(self) -> sqlite3.Connection:
+        conexion = sqlite3.connect(self.ruta, timeout=10)
+        conexion.execute("PRAGMA synchronous=NORMAL")
+        conexion.execute("PRAGMA foreign_keys=ON")
+        return conexion
+
+    # ------------------------------------------------------------------
+    # API (hilo de la UI: nunca toca el disco salvo cargar)
+    # ------------------------------------------------------------------
+    def crear(self, modo: str, fixture: List[Any], participantes: Sequence[str],
+              partidos: Sequence[Tuple[int, int]], sesion: Dict[str, Any] = None) -> str:
+        """
+        Registra un torneo nuevo (se escribe en segundo plano).
+
+        Args:
+            modo: Modo de juego (ej. "americano", "sets")
+            fixture: Rondas tal como las usan las páginas (serializables a JSON)
+            participantes: Orden de los participantes del RegistroPartidos
+            partidos: (ronda, cancha) de cada partido: una fila por partido
+            sesion: Claves de session_state necesarias para redibujar la página
+
+        Returns:
+            El id del torneo
+        """
+        torneo_id = uuid.uuid4().hex[:12]
+        estado = {"fixture": fixture, "participantes": list(participantes), "sesion": sesion or {}}
+        with self._lock:
+            self._nuevos[torneo_id] = (modo, estado, [(int(r), int(c)) for r, c in partidos])
+            self._marcar_cambio()
+        return torneo_id
+
+    def guardar_resultado(self, torneo_id: str, ronda: int, cancha: int, puntos1: int, puntos2: int):
+        """Deja el resultado pendiente de escritura (O(1), sin esperar al disco)"""
+        with self._lock:
+            self._resultados[(torneo_id, int(ronda), int(cancha))] = (int(puntos1), int(puntos2))
+            self._marcar_cambio()
+
+    def cargar(self, torneo_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Un torneo por id, en una sola consulta (torneo + sus partidos).
+
+        Returns:
+            {"modo", "fixture", "participantes", "sesion", "resultados":
+            {(ronda, cancha): (puntos1, puntos2)}} con los partidos cargados,
+            o None si el id no existe
+        """
+        with self._lock:
+            nuevos_en_vuelo, resultados_en_vuelo = self._en_vuelo
+            nuevo = self._nuevos.get(torneo_id) or nuevos_en_vuelo.get(torneo_id)
+            # Lo pendiente es más nuevo que lo que está en vuelo
+            pendientes = {(r, c): v for (t, r, c), v in {**resultados_en_vuelo, **self._resultados}.items()
+                          if t == torneo_id}
+
+        if nuevo is not None:
+            modo, estado, _ = nuevo
+            resultados = {}
+        else:
+            try:
+                with self._conectar() as conexion:
+                    filas = conexion.execute(
+                        "SELECT t.modo, t.estado, p.ronda, p.cancha, p.puntos1, p.puntos2, p.cargado "
+                        "FROM torneos t LEFT JOIN partidos p ON p.torneo_id = t.id WHERE t.id = ?",
+                        (torneo_id,)).fetchall()
+            except sqlite3.Error as e:
+                print(f"torneos-db: no se pudo leer {torneo_id} ({e})", file=sys.stderr)
+                return None
+            if not filas:
+                return None
+            modo, estado = filas[0][0], json.loads(filas[0][1])
+            resultados = {(r, c): (p1, p2) for _, _, r, c, p1, p2, cargado in filas if cargado}
+
+        resultados.update(pendientes)
+        return {"modo": modo, "fixture": estado["fixture"], "participantes": estado["participantes"],
+                "sesion": estado["sesion"], "resultados": resultados}
+
+    def vaciar(self, timeout: float = 10.0) -> bool:
+        """Escribe ya lo pendiente y espera a que esté en disco (tests, apagado)"""
+        self._primer_cambio = self._ultimo_cambio = 0.0
+        self._aviso.set()
+        return self._vacio.wait(timeout)
+
+    def cerrar(self):
+        if self._cerrado:
+            return
+        self._cerrado = True
+        self.vaciar()
+        self._aviso.set()
+
+    # ------------------------------------------------------------------
+    # Hilo escritor
+    # ------------------------------------------------------------------
+    def _marcar_cambio(self):
+        ahora = time.monotonic()
+        if self._vacio.is_set():
+            self._primer_cambio = ahora
+            self._vacio.clear()
+        self._ultimo_cambio = ahora
+        self._aviso.set()
+
+    def _escritor(self):
+        conexion = self._conectar()
+        fallos = 0  # intentos fallidos seguidos del lote actual
+        avisado = False  # ya se avisó del problema; se vuelve a avisar después de un lote bueno
+        while True:
+            self._aviso.wait()
+            # Debounce: esperar a que dejen de llegar cambios (con un tope)
+            while True:
+                ahora = time.monotonic()
+                listo = max(self._ultimo_cambio + self.demora, ahora) if not self._cerrado else ahora
+                listo = min(listo, self._primer_cambio + self.espera_maxima)
+                if ahora >= listo:
+                    break
+                time.sleep(listo - ahora)
+
+            with self._lock:
+                self._aviso.clear()
+                nuevos, self._nuevos = self._nuevos, {}
+                resultados, self._resultados = self._resultados, {}
+                self._en_vuelo = (nuevos, resultados)
+
+            if nuevos or resultados:
+                try:
+                    self._escribir(conexion, nuevos, resultados)
+                    fallos, avisado = 0, False
+                except sqlite3.Error as e:
+                    fallos += 1
+                    if fallos <= self.reintentos:
+                        espera = min(self.demora * 2 ** (fallos - 1), self.espera_maxima * 4)
+                        if not avisado:
+                            print(f"torneos-db: falló una escritura, se reintenta ({e})", file=sys.stderr)
+                            avisado = True
+                        with self._lock:
+                            # Lo que llegó mientras tanto es más nuevo: gana sobre el lote fallido
+                            self._nuevos = {**nuevos, **self._nuevos}
+                            self._resultados = {**resultados, **self._resultados}
+                            self._en_vuelo = ({}, {})
+                            self._marcar_cambio()
+                        time.sleep(espera)
+                        continue
+                    print(f"torneos-db: se descartan {len(nuevos)} torneos y {len(resultados)} resultados "
+                          f"tras {fallos} intentos ({e})", file=sys.stderr)
+                    fallos = 0
+
+            with self._lock:
+                self._en_vuelo = ({}, {})
+                if not self._nuevos and not self._resultados:
+                    self._vacio.set()
+            if self._cerrado and self._vacio.is_set():
+                conexion.close()
+                return
+
+    @staticmethod
+    def _escribir(conexion: sqlite3.Connection, nuevos, resultados):
+        ahora = time.time()
+        with conexion:  # una transacción por lote
+            for torneo_id, (modo, estado, partidos) in nuevos.items():
+                conexion.execute("INSERT INTO torneos (id, modo, estado, creado, actualizado) VALUES (?, ?, ?, ?, ?)",
+                                 (torneo_id, modo, json.dumps(estado, separators=(",", ":"), default=str), ahora, ahora))
+                conexion.executemany("INSERT INTO partidos (torneo_id, ronda, cancha) VALUES (?, ?, ?)",
+                                     [(torneo_id, r, c) for r, c in partidos])
+            conexion.executemany(
+                "UPDATE partidos SET puntos1 = ?, puntos2 = ?, cargado = 1 WHERE torneo_id = ? AND ronda = ? AND cancha = ?",
+                [(p1, p2, t, r, c) for (t, r, c), (p1, p2) in resultados.items()])
+            conexion.executemany("UPDATE torneos SET actualizado = ? WHERE id = ?",
+                                 [(ahora, t) for t in {t for t, _, _ in resultados}])
+
+
+_db = None
+_db_fallo = False
+_db_lock = threading.Lock()
+
+
+def torneos_db() -> Optional[TorneosDB]:
+    """
+    Base compartida por las sesiones del proceso (archivo PADEL_TORNEOS_DB o
+    ~/.local/share/padelapp). Como FixtureCache, es opcional: si no se puede
+    abrir (directorio sin permisos, disco lleno, archivo corrupto) se avisa
+    una vez y devuelve None, y los torneos quedan solo en la sesión.
+    """
+    global _db, _db_fallo
+    with _db_lock:  # un solo hilo escritor aunque varias sesiones arranquen a la vez
+        if _db is None and not _db_fallo:
+            try:
+                _db = TorneosDB()
+            except (OSError, sqlite3.Error) as e:
+                _db_fallo = True
+                print(f"torneos-db: sin base de torneos, quedan solo en la sesión ({e})", file=sys.stderr)
+        return _db
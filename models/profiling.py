@@ -0,0 +1,160 @@
+"""Instrumentación opcional de los motores de fixture.
+
+Los motores piden un Perfil al crearse (instrumentar); fuera de un
+bloque `with perfilando():` es None y los métodos marcados con @medir
+son los de la clase, sin envoltura. Adentro del bloque cada motor
+registra el tiempo por fase y las llamadas a sus funciones de puntaje,
+y lo devuelve en output["stats"]["perfil"]:
+
+    with perfilando("perfil.json") as perfiles:
+        out = generar_torneo_todos_contra_todos(jugadores, 4)
+    out["stats"]["perfil"]["fases_s"]
+"""
+import contextvars
+import functools
+import json
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from typing import List, Dict, Any, Optional
+
+# Fases comunes a todos los motores
+CANDIDATOS = "candidatos"          # armado de partidos posibles / rondas
+PUNTAJE = "puntaje"                # funciones de puntaje
+AYUDANTES = "ayudantes"            # elección de ayudantes
+ESTADISTICAS = "estadisticas"      # actualización de contadores
+FORMATO = "formato"                # salida para streamlit
+
+# Perfiles del bloque perfilando() en curso (None = sin medir); un
+# ContextVar porque streamlit corre cada sesión en su propio hilo
+_activos: contextvars.ContextVar = contextvars.ContextVar("perfiles", default=None)
+
+
+class Perfil:
+    """
+    Tiempos por fase y llamadas por función de un motor.
+
+    Los tiempos son exclusivos: si una fase corre dentro de otra (el puntaje
+    dentro de la generación de candidatos), el reloj de la de afuera se
+    pausa, así que las fases suman el tiempo medido sin contar dos veces.
+    """
+
+    def __init__(self, motor: str):
+        self.motor = motor
+        self.tiempos: Dict[str, float] = defaultdict(float)
+        self.llamadas: Counter = Counter()
+        self._pila: List[List] = []  # [fase, inicio del tramo actual]
+
+    @contextmanager
+    def fase(self, nombre: str):
+        ahora = time.perf_counter()
+        if self._pila:
+            afuera = self._pila[-1]
+            self.tiempos[afuera[0]] += ahora - afuera[1]
+        self._pila.append([nombre, ahora])
+        try:
+            yield
+        finally:
+            ahora = time.perf_counter()
+            self.tiempos[nombre] += ahora - self._pila.pop()[1]
+            if self._pila:
+                self._pila[-1][1] = ahora
+
+    def contar(self, funcion: str, veces: int = 1):
+        self.llamadas[funcion] += veces
+
+    def resumen(self) -> Dict[str, Any]:
+        """Diccionario serializable: motor, total_s, fases_s (de mayor a menor) y llamadas"""
+        fases = dict(sorted(self.tiempos.items(), key=lambda kv: -kv[1]))
+        return {
+            "motor": self.motor,
+            "total_s": sum(fases.values()),
+            "fases_s": fases,
+            "llamadas": dict(self.llamadas.most_common()),
+        }
+
+
+def perfil_activo(motor: str) -> Optional[Perfil]:
+    """Perfil nuevo si hay un perfilando() en curso, None si no (ver instrumentar)"""
+    perfiles = _activos.get()
+    if perfiles is None:
+        return None
+    perfil = Perfil(motor)
+    perfiles.append(perfil)
+    return perfil
+
+
+@contextmanager
+def perfilando(archivo: str = None):
+    """
+    Activa la medición para los motores creados dentro del bloque.
+
+    Args:
+        archivo: Si se da, al salir se escribe ahí (JSON) el resumen de
+                 cada motor medido
+
+    Yields:
+        La lista de Perfil de los motores creados en el bloque
+    """
+    perfiles: List[Perfil] = []
+    token = _activos.set(perfiles)
+    try:
+        yield perfiles
+    finally:
+        _activos.reset(token)
+        if archivo:
+            with open(archivo, "w") as f:
+                json.dump([p.resumen() for p in perfiles], f, indent=1)
+
+
+def medir(fase: str, contar: bool = False, adjuntar: bool = False):
+    """
+    Marca un método de un motor para medirlo; no lo envuelve. Solo
+    instrumentar() lo reemplaza (en la instancia) cuando hay un perfil
+    activo, así que sin perfilando() las llamadas no pagan nada extra.
+
+    Args:
+        fase: Fase a la que se suma el tiempo del método
+        contar: Contar las llamadas (funciones de puntaje)
+        adjuntar: El método devuelve la salida del motor; se le agrega el
+                  resumen en ["stats"]["perfil"] (con el formato ya medido)
+    """
+    def decorador(metodo):
+        metodo._medir = (fase, contar, adjuntar)
+        return metodo
+    return decorador
+
+
+def _envolver(metodo, perfil: Perfil, fase: str, contar: bool, adjuntar: bool):
+    """Versión medida de un método ya ligado a su motor"""
+    nombre = metodo.__func__.__qualname__
+
+    @functools.wraps(metodo)
+    def envoltura(*args, **kwargs):
+        if contar:
+            perfil.contar(nombre)
+        with perfil.fase(fase):
+            salida = metodo(*args, **kwargs)
+        if adjuntar and isinstance(salida, dict) and "error" not in salida:
+            salida.setdefault("stats", {})["perfil"] = perfil.resumen()
+        return salida
+    return envoltura
+
+
+def instrumentar(motor) -> Optional[Perfil]:
+    """
+    Perfil del motor (lo llaman los motores en __init__): None fuera de un
+    perfilando(); adentro, los métodos marcados con @medir se reemplazan en
+    esta instancia por versiones que miden. La clase no cambia.
+
+    Returns:
+        El Perfil del motor, o None
+    """
+    perfil = perfil_activo(type(motor).__name__)
+    if perfil is None:
+        return None
+    for nombre in dir(type(motor)):
+        marca = getattr(getattr(type(motor), nombre, None), "_medir", None)
+        if marca is not None:
+            setattr(motor, nombre, _envolver(getattr(motor, nombre), perfil, *marca))
+    return perfil
@@ -0,0 +1,65 @@
+import bisect
+from typing import List, Dict, Tuple
+import pandas as pd
+from models.match_store import RegistroPartidos
+
+
+class RankingIndividual:
+    """
+    Ranking individual que se arma una vez por fixture y se actualiza con
+    cada resultado cargado.
+
+    Los jugadores de cada partido ya están resueltos en el RegistroPartidos
+    (índices por lado), así que actualizar() toca solo a los 4 jugadores del
+    partido. El leaderboard es una lista ordenada de (-puntos, id) mantenida
+    con bisect: top(k) la lee en O(k), sin volver a ordenar a todos.
+    Los ayudantes no suman puntos (valido_para).
+    """
+
+    def __init__(self, registro: RegistroPartidos):
+        self.registro = registro
+        self.jugadores: List[str] = registro.participantes
+
+        n = len(self.jugadores)
+        self.puntos = [0] * n
+        self.con_resultado = [0] * n  # partidos cargados en los que el jugador fue válido
+        self.aplicados: Dict[int, Tuple[int, int]] = {}  # id de partido -> resultado ya sumado
+        self._orden: List[Tuple[int, int]] = []  # (-puntos, id) de quienes tienen resultado
+
+        for fila in registro.cargados():
+            self.actualizar(int(fila))
+
+    def _sumar(self, jugador: int, delta: int, primer_resultado: bool):
+        """Mueve al jugador en el leaderboard: O(log n) de búsqueda"""
+        if self.con_resultado[jugador]:
+            pos = bisect.bisect_left(self._orden, (-self.puntos[jugador], jugador))
+            del self._orden[pos]
+        self.puntos[jugador] += delta
+        if primer_resultado:
+            self.con_resultado[jugador] += 1
+        bisect.insort(self._orden, (-self.puntos[jugador], jugador))
+
+    def actualizar(self, fila: int):
+        """
+        Suma (o corrige) el resultado del partido 'fila' tal como está en el registro.
+
+        Args:
+            fila: Id del partido (RegistroPartidos.registrar lo devuelve)
+        """
+        nuevo = (int(self.registro.puntos[fila, 0]), int(self.registro.puntos[fila, 1]))
+        anterior = self.aplicados.get(fila)
+        self.aplicados[fila] = nuevo
+        previos = anterior if anterior is not None else (0, 0)
+        for lado in (0, 1):
+            for j in self.registro.jugadores_validos(fila, lado):
+                self._sumar(int(j), nuevo[lado] - previos[lado], anterior is None)
+
+    def top(self, k: int = None) -> List[Tuple[str, int]]:
+        """Los k primeros (todos si k es None) como (jugador, puntos)"""
+        orden = self._orden if k is None else self._orden[:k]
+        return [(self.jugadores[j], -puntos) for puntos, j in orden]
+
+    def tabla(self) -> pd.DataFrame:
+        """Ranking completo con el formato de calcular_ranking_individual"""
+        return pd.DataFrame(self.top(), columns=["Jugador", "Puntos"])
+
@@ -0,0 +1,97 @@
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, wait, FIRST_COMPLETED
+from typing import List, Dict, Any, Callable, Iterable, Tuple
+from models.schedule_quality import evaluar_fixture, clave_calidad, es_optimo
+
+
+def _ejecutar_motor(engine: Callable[..., Dict[str, Any]], jugadores: List[str],
+                    num_canchas: int, seed: int) -> Tuple[int, Dict[str, Any]]:
+    """Corre un motor con una semilla (se ejecuta en un proceso del pool)"""
+    return seed, engine(jugadores, num_canchas, seed=seed)
+
+
+def generar_mejor_fixture(jugadores: List[str], num_canchas: int,
+                          engine: Callable[..., Dict[str, Any]] = None,
+                          seeds: Iterable[int] = None, num_workers: int = None,
+                          time_budget: float = None, executor: Executor = None) -> Dict[str, Any]:
+    """
+    Corre el motor con varias semillas en paralelo y devuelve el mejor fixture.
+
+    Los resultados se comparan con evaluar_fixture. Se deja de esperar cuando
+    un fixture alcanza el óptimo teórico (cero parejas repetidas y todos los
+    rivales cubiertos) o cuando se agota time_budget; en ambos casos las
+    semillas que aún no empezaron se cancelan.
+
+    Args:
+        jugadores: Lista de nombres de jugadores
+        num_canchas: Número de canchas
+        engine: Función generar_torneo_todos_contra_todos de un motor
+            (debe ser importable a nivel de módulo). Por defecto modelv3.
+        seeds: Semillas a probar. Por defecto 42, 43, ... una por CPU.
+        num_workers: Procesos del pool. Por defecto os.cpu_count().
+        time_budget: Segundos máximos de espera (None = esperar a todas)
+        executor: Pool compartido (ej. RegistroTorneos.motores()); no se cierra
+            al terminar, solo se cancelan las semillas que no empezaron.
+            Por defecto, un pool propio de num_workers procesos.
+
+    Returns:
+        Salida del mejor motor, con out['stats']['restarts'] describiendo la búsqueda
+
+    Raises:
+        ValueError: Si 'seeds' está vacío
+    """
+    if engine is None:
+        from models.AllvsAll_Random_modelv3 import generar_torneo_todos_contra_todos as engine
+    num_workers = num_workers or os.cpu_count() or 1
+    seeds = list(seeds) if seeds is not None else [42 + i for i in range(num_workers)]
+    if not seeds:
+        raise ValueError("Se requiere al menos una semilla para generar el fixture.")
+
+    start = time.perf_counter()
+    best_seed, best_out, best_calidad = None, None, None
+    completadas = 0
+
+    propio = executor is None
+    if propio:
+        executor = ProcessPoolExecutor(max_workers=min(num_workers, len(seeds)))
+    pendientes = set()
+    try:
+        pendientes = {executor.submit(_ejecutar_motor, engine, jugadores, num_canchas, s) for s in seeds}
+        while pendientes:
+            # Sin ningún resultado todavía se espera al primero aunque se pase el tiempo
+            timeout = None
+            if time_budget is not None and best_out is not None:
+                timeout = time_budget - (time.perf_counter() - start)
+                if timeout <= 0:
+                    break
+            listas, pendientes = wait(pendientes, timeout=timeout, return_when=FIRST_COMPLETED)
+            if not listas:
+                continue
+
+            for futuro in listas:
+                seed, out = futuro.result()
+                completadas += 1
+                calidad = evaluar_fixture(out["rondas"], jugadores)
+                if best_calidad is None or clave_calidad(calidad) < clave_calidad(best_calidad):
+                    best_seed, best_out, best_calidad = seed, out, calidad
+
+            if es_optimo(best_calidad):
+                break
+    finally:
+        # No bloquear: las semillas pendientes se cancelan y las que ya corren terminan solas
+        if propio:
+            executor.shutdown(wait=False, cancel_futures=True)
+        else:
+            for futuro in pendientes:
+                futuro.cancel()
+
+    best_out.setdefault("stats", {})["restarts"] = {
+        "seed": best_seed,
+        "seeds_tried": completadas,
+        "seeds_launched": len(seeds),
+        "optimal": es_optimo(best_calidad),
+        "elapsed": time.perf_counter() - start,
+        "quality": best_calidad,
+    }
+    return best_out
@@ -0,0 +1,86 @@
+import random
+from collections import deque
+from typing import List, Tuple, Sequence, Hashable
+
+Partido = Tuple[Hashable, Hashable]
+
+
+def rondas_circulo(equipos: Sequence[Hashable]) -> List[List[Partido]]:
+    """
+    Round Robin por el Método del Círculo: T-1 rondas (T par) o T (T impar)
+    en las que cada equipo juega a lo sumo una vez. Con T impar, en cada
+    ronda descansa un equipo distinto.
+
+    Dentro de cada ronda los partidos van del centro del círculo hacia
+    afuera; el orden de "local" y "visitante" se alterna entre rondas.
+    """
+    equipos = list(equipos)
+    if len(equipos) % 2:
+        equipos.append(None)  # BYE: sin partido esa ronda
+
+    n = len(equipos)
+    fijo = equipos[0]
+    rotando = deque(equipos[1:])
+
+    rondas = []
+    for r in range(n - 1):
+        ronda = []
+        # 1. Fijo vs Rotador
+        if fijo is not None and rotando[0] is not None:
+            ronda.append((fijo, rotando[0]))
+
+        # 2. Rotadores entre sí
+        m = len(rotando)
+        for i in range(1, m // 2 + 1):
+            t1, t2 = rotando[i], rotando[m - i]
+            if t1 is not None and t2 is not None:
+                ronda.append((t1, t2) if r % 2 == 0 else (t2, t1))
+
+        rondas.append(ronda)
+        rotando.rotate(1)
+    return rondas
+
+
+def repartir_en_canchas(rondas: List[List[Partido]], num_canchas: int) -> List[List[Partido]]:
+    """
+    Corta la secuencia de partidos de rondas_circulo en rondas de a lo sumo
+    num_canchas partidos, en orden y en O(M).
+
+    Como los partidos de cada ronda van del centro hacia afuera, el final
+    de una ronda y el principio de la siguiente no comparten equipos y los
+    cortes quedan llenos: ceil(M / min(canchas, T // 2)) rondas (verificado
+    hasta 60 equipos). Si un partido repitiera un equipo, la ronda se
+    cierra antes en vez de repetirlo.
+    """
+    salida, ronda, ocupados = [], [], set()
+    for ronda_circulo in rondas:
+        for match in ronda_circulo:
+            if len(ronda) == num_canchas or match[0] in ocupados or match[1] in ocupados:
+                salida.append(ronda)
+                ronda, ocupados = [], set()
+            ronda.append(match)
+            ocupados.update(match)
+    if ronda:
+        salida.append(ronda)
+    return salida
+
+
+def round_robin(equipos: Sequence[Hashable], num_canchas: int, seed=None) -> List[List[Partido]]:
+    """
+    Todos contra todos con canchas limitadas, determinista para una semilla.
+
+    Cada equipo juega una vez por vuelta del círculo, así que los descansos
+    quedan repartidos a lo largo del torneo (nadie acumula descansos al
+    principio o al final).
+
+    Args:
+        equipos: Nombres de los equipos (parejas)
+        num_canchas: Partidos simultáneos por ronda
+        seed: Semilla para sortear el orden de los equipos (None = al azar)
+
+    Returns:
+        Lista de rondas, cada una una lista de tuplas (equipo1, equipo2)
+    """
+    orden = list(equipos)
+    random.Random(seed).shuffle(orden)
+    return repartir_en_canchas(rondas_circulo(orden), max(1, num_canchas))
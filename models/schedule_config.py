@@ -0,0 +1,79 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class ScheduleConfig:
+    """
+    Immutable tournament parameters, computed once per tournament.
+
+    They only depend on the number of players (or teams) and fields, so the
+    engines read them from here instead of recomputing them every round.
+    Build it with one of the constructors below.
+    """
+    num_players: int      # Players (teams for fixed pairs)
+    num_fields: int
+    optimal_rounds: int   # Rounds the engine aims to play
+    target_games: int     # Valid games every player should reach
+    min_rounds: int       # Fewest rounds that can be acceptable
+    max_rounds: int       # Hard cap on rounds
+
+    @classmethod
+    def americano(cls, num_players: int, num_fields: int) -> "ScheduleConfig":
+        """All vs all with random pairs (v1-v4)"""
+        if num_fields == 2:
+            # Priority 1: j-1 rounds for 2 fields
+            optimal_rounds = num_players - 1
+        else:
+            # For more fields: calculate to achieve all vs all
+            players_per_round = num_fields * 4
+            optimal_rounds = max(num_players - 1,
+                                 (num_players * (num_players - 1)) // (players_per_round * 2))
+
+        # Priority 2: the MINIMUM valid games everyone can achieve
+        total_slots = optimal_rounds * num_fields * 4
+        target_games = total_slots // num_players if num_players else 0
+
+        return cls(
+            num_players=num_players,
+            num_fields=num_fields,
+            optimal_rounds=optimal_rounds,
+            target_games=target_games,
+            min_rounds=max(1, num_players - 2),  # j-2 preferred
+            max_rounds=max(1, num_players - 1),  # j-1 at most
+        )
+
+    @classmethod
+    def mixto(cls, num_males: int, num_females: int, num_fields: int) -> "ScheduleConfig":
+        """
+        Mixed americano: every man partners every woman at least once
+
+        Rounds = ceil(mixed pairs / pairs formed per round)
+        """
+        total_mixed_pairs = num_males * num_females
+        pairs_per_round = num_fields * 2
+        optimal_rounds = (total_mixed_pairs + pairs_per_round - 1) // pairs_per_round
+
+        return cls(
+            num_players=num_males + num_females,
+            num_fields=num_fields,
+            optimal_rounds=optimal_rounds,
+            target_games=num_females,
+            min_rounds=optimal_rounds,
+            max_rounds=optimal_rounds,
+        )
+
+    @classmethod
+    def fixed_pairs(cls, num_teams: int, num_fields: int) -> "ScheduleConfig":
+        """Round robin between fixed pairs"""
+        total_matches = num_teams * (num_teams - 1) // 2
+        matches_per_round = max(1, min(num_fields, num_teams // 2))
+        optimal_rounds = (total_matches + matches_per_round - 1) // matches_per_round
+
+        return cls(
+            num_players=num_teams,
+            num_fields=num_fields,
+            optimal_rounds=optimal_rounds,
+            target_games=max(0, num_teams - 1),
+            min_rounds=optimal_rounds,
+            max_rounds=total_matches,
+        )
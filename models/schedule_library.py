@@ -0,0 +1,128 @@
+import json
+import os
+import random
+import itertools
+from functools import lru_cache
+from typing import List, Dict, Any, Optional
+import pandas as pd
+from models.schedule_config import ScheduleConfig
+
+LIBRARY_DIR = os.path.join(os.path.dirname(__file__), "library")
+
+# En False los motores ignoran la biblioteca (ej. para medir las heurísticas)
+USAR_BIBLIOTECA = True
+
+
+@lru_cache(maxsize=None)
+def _cargar_biblioteca(modo: str) -> Dict[str, List[List[List[int]]]]:
+    """Lee (una vez por proceso) el archivo de la biblioteca de un modo"""
+    ruta = os.path.join(LIBRARY_DIR, f"{modo}.json")
+    if not os.path.exists(ruta):
+        return {}
+    with open(ruta) as f:
+        return json.load(f)
+
+
+def buscar_fixture(num_jugadores: int, num_canchas: int,
+                   modo: str = "americano") -> Optional[List[List[List[int]]]]:
+    """
+    Busca un fixture óptimo precalculado para (jugadores, canchas, modo).
+
+    Las entradas son torneos whist: cada jugador es pareja de cada otro una
+    vez y rival exactamente dos veces. Se generan con
+    models/library/generar_biblioteca.py.
+
+    Args:
+        num_jugadores: Número de jugadores
+        num_canchas: Número de canchas
+        modo: Nombre del archivo de la biblioteca (sin .json)
+
+    Returns:
+        Rondas como listas de partidos [a, b, c, d] (a-b vs c-d) con índices
+        0..n-1, o None si no hay entrada
+    """
+    if not USAR_BIBLIOTECA:
+        return None
+    # canchas de más quedan libres: un whist usa n // 4
+    num_canchas = min(num_canchas, num_jugadores // 4)
+    return _cargar_biblioteca(modo).get(f"{modo}:{num_jugadores}:{num_canchas}")
+
+
+def permutacion(num_jugadores: int, seed: int = None) -> List[int]:
+    """
+    Reetiquetado O(n) de los índices de la biblioteca.
+
+    Con seed=None se respeta el orden de los jugadores; con una semilla se
+    baraja para que cada semilla dé un cruce distinto (igual de óptimo).
+    """
+    orden = list(range(num_jugadores))
+    if seed is not None:
+        random.Random(seed).shuffle(orden)
+    return orden
+
+
+def generar_desde_biblioteca(jugadores: List[str], num_canchas: int,
+                             seed: int = None, modo: str = "americano") -> Optional[Dict[str, Any]]:
+    """
+    Salida con el formato de los motores v1/v2/v4 a partir de la biblioteca.
+
+    Args:
+        jugadores: Lista de nombres de jugadores
+        num_canchas: Número de canchas
+        seed: Semilla para el reetiquetado (opcional)
+        modo: Modo de la biblioteca
+
+    Returns:
+        Diccionario igual al de generar_torneo_todos_contra_todos, o None si
+        no hay entrada para esta combinación
+    """
+    rondas_idx = buscar_fixture(len(jugadores), num_canchas, modo)
+    if rondas_idx is None:
+        return None
+
+    config = ScheduleConfig.americano(len(jugadores), num_canchas)
+    nombre = [jugadores[i] for i in permutacion(len(jugadores), seed)]
+    partidos_jugados = {j: 0 for j in jugadores}
+    descansos = {j: 0 for j in jugadores}
+
+    rondas = []
+    for ronda_idx, partidos in enumerate(rondas_idx, 1):
+        partidos_ronda = []
+        for cancha, (a, b, c, d) in enumerate(partidos, 1):
+            p1 = (nombre[a], nombre[b])
+            p2 = (nombre[c], nombre[d])
+            partidos_ronda.append({
+                "cancha": cancha,
+                "pareja1": p1,
+                "pareja2": p2,
+                "ayudantes": [],
+                "valido_para": {pl: True for pl in p1 + p2}
+            })
+            for pl in p1 + p2:
+                partidos_jugados[pl] += 1
+
+        jugando = {pl for partido in partidos for pl in partido}
+        descansan = [nombre[i] for i in range(len(jugadores)) if i not in jugando]
+        for j in descansan:
+            descansos[j] += 1
+        rondas.append({"ronda": ronda_idx, "partidos": partidos_ronda, "descansan": descansan})
+
+    resumen_df = pd.DataFrame({
+        "jugador": jugadores,
+        "partidos_jugados": [partidos_jugados[j] for j in jugadores],
+        "descansos": [descansos[j] for j in jugadores]
+    }).sort_values(by=["partidos_jugados", "descansos"], ascending=[False, True]).reset_index(drop=True)
+
+    # un whist cubre todos los enfrentamientos
+    todos_pares = set(tuple(sorted(p)) for p in itertools.combinations(jugadores, 2))
+    return {
+        "rondas": rondas,
+        "enfrentamientos_cubiertos": set(todos_pares),
+        "todos_pares": todos_pares,
+        "meta_alcanzada": True,
+        "partidos_jugados": partidos_jugados,
+        "descansos": descansos,
+        "config": config,
+        "resumen": resumen_df,
+        "biblioteca": True
+    }
@@ -0,0 +1,127 @@
+from collections import Counter
+from typing import List, Dict, Any, Tuple, Sequence
+import numpy as np
+
+# Posiciones dentro de un partido [pareja1[0], pareja1[1], pareja2[0], pareja2[1]]
+COMPANEROS = ((0, 1), (2, 3))
+RIVALES = ((0, 2), (0, 3), (1, 2), (1, 3))
+
+
+def evaluar_fixture(rondas: List[Dict], jugadores: List[str]) -> Dict[str, Any]:
+    """
+    Métrica común de calidad para la salida de cualquier motor.
+
+    Args:
+        rondas: Lista de rondas ('rondas' de la salida del motor)
+        jugadores: Lista de nombres de jugadores
+
+    Returns:
+        Diccionario con repeticiones de pareja, cobertura de rivales,
+        diferencia de partidos válidos, descansos consecutivos y ayudantes
+    """
+    parejas = Counter()
+    rivales = set()
+    validos = {j: 0 for j in jugadores}
+    ayudantes_total = 0
+    descansos_seguidos = {j: 0 for j in jugadores}
+    max_seguidos = {j: 0 for j in jugadores}
+
+    for ronda in rondas:
+        jugando = set()
+        for partido in ronda["partidos"]:
+            p1, p2 = list(partido["pareja1"]), list(partido["pareja2"])
+            ayudantes = partido.get("ayudantes") or []
+            ayudantes_total += len(ayudantes)
+            parejas[tuple(sorted(p1))] += 1
+            parejas[tuple(sorted(p2))] += 1
+            for a in p1:
+                for b in p2:
+                    rivales.add((a, b) if a < b else (b, a))
+            for j in p1 + p2:
+                jugando.add(j)
+                if j not in ayudantes and j in validos:
+                    validos[j] += 1
+        for j in jugadores:
+            if j in jugando:
+                descansos_seguidos[j] = 0
+            else:
+                descansos_seguidos[j] += 1
+                max_seguidos[j] = max(max_seguidos[j], descansos_seguidos[j])
+
+    n = len(jugadores)
+    total_rivales = n * (n - 1) // 2
+    partidos_validos = list(validos.values())
+
+    return {
+        "rondas": len(rondas),
+        "repeticiones_pareja": sum(c - 1 for c in parejas.values() if c > 1),
+        "rivales_cubiertos": len(rivales),
+        "cobertura_rivales": len(rivales) / total_rivales if total_rivales else 1.0,
+        "diferencia_partidos": max(partidos_validos) - min(partidos_validos) if partidos_validos else 0,
+        "max_descansos_seguidos": max(max_seguidos.values(), default=0),
+        "partidos_ayudante": ayudantes_total,
+    }
+
+
+def clave_calidad(calidad: Dict[str, Any]) -> Tuple:
+    """Clave de orden (menor es mejor) para comparar fixtures"""
+    return (
+        calidad["repeticiones_pareja"],
+        -calidad["rivales_cubiertos"],
+        calidad["diferencia_partidos"],
+        calidad["max_descansos_seguidos"],
+        calidad["partidos_ayudante"],
+    )
+
+
+def es_optimo(calidad: Dict[str, Any]) -> bool:
+    """Óptimo teórico: cero parejas repetidas y todos los rivales cubiertos"""
+    return calidad["repeticiones_pareja"] == 0 and calidad["cobertura_rivales"] >= 1.0
+
+
+def indices_partidos(fixture: List[Dict], jugadores: Sequence[str]) -> np.ndarray:
+    """
+    Matriz (partidos, 4) con el índice de cada jugador en 'jugadores'
+    (-1 si no está en la lista), en el orden de COMPANEROS/RIVALES.
+    """
+    indice = {j: i for i, j in enumerate(jugadores)}
+    filas = [[indice.get(j, -1) for j in list(partido["pareja1"]) + list(partido["pareja2"])]
+             for ronda in fixture for partido in ronda["partidos"]]
+    return np.array(filas, dtype=np.intp).reshape(-1, 4)
+
+
+def contar_pares(filas: np.ndarray, columnas: np.ndarray, n_filas: int, n_columnas: int) -> np.ndarray:
+    """
+    Matriz de conteos: suma 1 en (filas[k], columnas[k]) para cada k con un
+    solo bincount (los pares repetidos acumulan; los índices -1 se ignoran).
+    """
+    validos = (filas >= 0) & (columnas >= 0)
+    planos = filas[validos] * n_columnas + columnas[validos]
+    return np.bincount(planos, minlength=n_filas * n_columnas).reshape(n_filas, n_columnas)
+
+
+def contar_simetrica(indices: np.ndarray, posiciones: Tuple[Tuple[int, int], ...], n: int) -> np.ndarray:
+    """Matriz n x n simétrica de veces que dos jugadores ocuparon las posiciones dadas"""
+    a = np.concatenate([indices[:, i] for i, _ in posiciones] + [indices[:, j] for _, j in posiciones])
+    b = np.concatenate([indices[:, j] for _, j in posiciones] + [indices[:, i] for i, _ in posiciones])
+    return contar_pares(a, b, n, n)
+
+
+def matrices_conteo(fixture: List[Dict], jugadores: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """Matrices (parejas, enfrentamientos) de un fixture, indexadas como 'jugadores'"""
+    indices = indices_partidos(fixture, jugadores)
+    n = len(jugadores)
+    return contar_simetrica(indices, COMPANEROS, n), contar_simetrica(indices, RIVALES, n)
+
+
+def matriz_parejas_mixtas(fixture: List[Dict], mujeres: Sequence[str], hombres: Sequence[str]) -> np.ndarray:
+    """Matriz mujeres x hombres con las veces que cada mujer fue pareja de cada hombre"""
+    indices = indices_partidos(fixture, list(mujeres) + list(hombres))
+    num_mujeres = len(mujeres)
+    filas, columnas = [], []
+    for i, j in COMPANEROS:
+        for a, b in ((indices[:, i], indices[:, j]), (indices[:, j], indices[:, i])):
+            mixta = (a >= 0) & (a < num_mujeres) & (b >= num_mujeres)
+            filas.append(a[mixta])
+            columnas.append(b[mixta] - num_mujeres)
+    return contar_pares(np.concatenate(filas), np.concatenate(columnas), num_mujeres, len(hombres))
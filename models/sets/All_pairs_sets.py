@@ -1,61 +1,66 @@
+import numpy as np
 import pandas as pd
 
-def calcular_ranking_parejas_sets(parejas, resultados):
+COLUMNAS = ['Partidos Jugados', 'Puntos', 'Sets Ganados', 'Sets Perdidos', 'Diferencia de Sets']
+
+
+def tabla_posiciones_sets(equipo1, equipo2, sets1, sets2, num_parejas):
+    """
+    Aggregates a columnar results table into standings, fully vectorized.
+
+    Args:
+        equipo1, equipo2: int arrays with the pair index of each side, one entry per match
+        sets1, sets2: int arrays with the sets won by each side
+        num_parejas: Number of pairs (indices go from 0 to num_parejas - 1)
+
+    Returns:
+        (orden, columnas): pair indices sorted by the ranking criteria, and a dict
+        with one int array per column of COLUMNAS, indexed by pair
+    """
+    equipo1, equipo2 = np.asarray(equipo1), np.asarray(equipo2)
+    sets1, sets2 = np.asarray(sets1), np.asarray(sets2)
+
+    # Only matches where at least one team scored a set
+    jugado = (sets1 > 0) | (sets2 > 0)
+    equipo1, equipo2, sets1, sets2 = equipo1[jugado], equipo2[jugado], sets1[jugado], sets2[jugado]
+
+    def por_pareja(indices, valores=None):
+        return np.bincount(indices, weights=valores, minlength=num_parejas).astype(np.int64)
+
+    partidos = por_pareja(equipo1) + por_pareja(equipo2)
+    # 1 point for the side with more sets; no points for draws
+    puntos = por_pareja(equipo1, sets1 > sets2) + por_pareja(equipo2, sets2 > sets1)
+    ganados = por_pareja(equipo1, sets1) + por_pareja(equipo2, sets2)
+    perdidos = por_pareja(equipo1, sets2) + por_pareja(equipo2, sets1)
+    diferencia = ganados - perdidos
+
+    # lexsort: the last key is the primary one; stable, so ties keep registration order
+    orden = np.lexsort((-ganados, -diferencia, -puntos))
+    columnas = dict(zip(COLUMNAS, (partidos, puntos, ganados, perdidos, diferencia)))
+    return orden, columnas
+
+
+def calcular_ranking_parejas_sets(registro):
     """
     Calculates the tournament ranking based on set scores.
 
+    Args:
+        registro: RegistroPartidos of the group stage (participants are the pairs,
+                  in registration order)
+
     Ranking Criteria:
     1. Points (1 for Win, 0 for Loss)
     2. Sets Difference (Sets Won - Sets Lost)
     3. Sets Won (Total)
     """
-    # Initialize ranking data structure
-    ranking_data = {p: {
-        'Partidos Jugados': 0, # PJ
-        'Puntos': 0,         # P (1 point for a match win)
-        'Sets Ganados': 0,   # SG
-        'Sets Perdidos': 0,  # SP
-        'Diferencia de Sets': 0 # DS (SG - SP)
-    } for p in parejas}
-
-    for (p1, p2), (s1, s2) in resultados.items():
-        # Only process matches where at least one team scored a set
-        if s1 == 0 and s2 == 0:
-            continue
-
-        # Update Matches Played
-        ranking_data[p1]['Partidos Jugados'] += 1
-        ranking_data[p2]['Partidos Jugados'] += 1
-
-        # Update Sets
-        ranking_data[p1]['Sets Ganados'] += s1
-        ranking_data[p1]['Sets Perdidos'] += s2
-        ranking_data[p2]['Sets Ganados'] += s2
-        ranking_data[p2]['Sets Perdidos'] += s1
-
-        # Determine Winner and Update Points
-        if s1 > s2:
-            # p1 wins the match (more sets won)
-            ranking_data[p1]['Puntos'] += 1
-        elif s2 > s1:
-            # p2 wins the match (more sets won)
-            ranking_data[p2]['Puntos'] += 1
-        # No points awarded for draws (s1 == s2) as a match must typically have a winner
-
-    # Calculate Sets Difference (DS)
-    for p in parejas:
-        data = ranking_data[p]
-        data['Diferencia de Sets'] = data['Sets Ganados'] - data['Sets Perdidos']
-
-    # Convert to DataFrame and sort
-    df_ranking = pd.DataFrame.from_dict(ranking_data, orient='index')
-    df_ranking = df_ranking.rename_axis('Pareja').reset_index()
-
-    # Sort Ranking: 1. Puntos (desc), 2. Diferencia de Sets (desc), 3. Sets Ganados (desc)
-    df_ranking = df_ranking.sort_values(
-        by=['Puntos', 'Diferencia de Sets', 'Sets Ganados'],
-        ascending=[False, False, False]
-    ).reset_index(drop=True)
+    cargados = registro.cargados()
+    orden, columnas = tabla_posiciones_sets(
+        registro.lados[cargados, 0, 0], registro.lados[cargados, 1, 0],
+        registro.puntos[cargados, 0], registro.puntos[cargados, 1],
+        len(registro.participantes))
+
+    df_ranking = pd.DataFrame({'Pareja': np.asarray(registro.participantes, dtype=object)[orden],
+                               **{c: v[orden] for c, v in columnas.items()}})
     df_ranking.index = df_ranking.index + 1 # Use 1-based indexing for ranking display
 
-    return df_ranking
\ No newline at end of file
+    return df_ranking
@@ -0,0 +1,238 @@
+"""Torneos en curso compartidos por todas las sesiones del proceso.
+
+Streamlit corre cada navegador en su propia sesión (y su propio hilo);
+acá vive lo que comparten: los torneos por id, el pool de procesos de
+los motores y la cache de fixtures. Una sesión organizadora y cualquier
+cantidad de espectadores del mismo torneo ven el mismo RegistroPartidos
+y el leaderboard se calcula una vez por resultado nuevo, no por sesión.
+"""
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, Callable, List, Optional, Sequence, Tuple
+import numpy as np
+import pandas as pd
+from models.fixture_cache import FixtureCache, fixture_cache
+from models.match_store import RegistroPartidos
+from models.ranking import RankingIndividual
+from models.persistence import TorneosDB, torneos_db
+
+
+class TorneoCompartido:
+    """
+    Un torneo en curso: su registro de partidos y el leaderboard cacheado.
+
+    Todo pasa por el lock del torneo: los resultados entran por registrar(),
+    que actualiza el ranking individual incremental y sube 'version'; tabla()
+    recalcula el leaderboard solo si la versión cambió desde el último
+    cálculo, así que N sesiones (dispositivos del organizador o
+    espectadores) cuestan un cálculo por resultado.
+    """
+
+    def __init__(self, torneo_id: str, modo: str, registro: RegistroPartidos, sesion: Dict[str, Any] = None):
+        self.id = torneo_id
+        self.modo = modo
+        self.registro = registro
+        self.sesion = sesion or {}
+        self.version = 0
+        self._lock = threading.Lock()
+        self._ranking: Optional[RankingIndividual] = None  # se arma al primer pedido
+        self._tablas: Dict[Any, Tuple[int, pd.DataFrame]] = {}  # calcular -> (version, leaderboard)
+
+    def registrar(self, ronda: int, cancha: int, p1: int, p2: int) -> int:
+        """Carga (o corrige) un resultado; devuelve el id del partido"""
+        with self._lock:
+            fila = self.registro.registrar(ronda, cancha, p1, p2)
+            if self._ranking is not None:
+                # Solo se mueven los 4 jugadores del partido
+                self._ranking.actualizar(fila)
+            self.version += 1
+        return fila
+
+    def tabla(self, calcular: Callable[[RegistroPartidos], pd.DataFrame] = None) -> pd.DataFrame:
+        """
+        Leaderboard compartido: se calcula una vez por versión.
+
+        Args:
+            calcular: Ranking del modo (ej. calcular_ranking_parejas_sets);
+                      None = ranking individual incremental (americano, mixto)
+
+        Returns:
+            El mismo DataFrame para todas las sesiones (tratarlo como solo lectura)
+        """
+        with self._lock:
+            guardada = self._tablas.get(calcular)
+            if guardada is None or guardada[0] != self.version:
+                if calcular is None:
+                    if self._ranking is None:
+                        self._ranking = RankingIndividual(self.registro)
+                    tabla = self._ranking.tabla()
+                else:
+                    tabla = calcular(self.registro)
+                guardada = self._tablas[calcular] = (self.version, tabla)
+            return guardada[1]
+
+    def progreso(self) -> Tuple[int, int]:
+        """(partidos con resultado, partidos totales)"""
+        with self._lock:
+            return int(self.registro.cargado.sum()), len(self.registro)
+
+    def ronda_en_juego(self) -> Tuple[int, List[Tuple[int, str, str, Optional[Tuple[int, int]]]]]:
+        """
+        La primera ronda con partidos sin resultado, leída bajo el lock.
+
+        Returns:
+            (ronda, [(cancha, pareja1, pareja2, resultado o None), ...])
+        """
+        with self._lock:
+            registro = self.registro
+            ronda = registro.ronda_pendiente()
+            partidos = []
+            for fila in np.flatnonzero(registro.ronda == ronda):
+                resultado = (int(registro.puntos[fila, 0]), int(registro.puntos[fila, 1])) \
+                    if registro.cargado[fila] else None
+                partidos.append((int(registro.cancha[fila]), " & ".join(registro.nombres(fila, 0)),
+                                 " & ".join(registro.nombres(fila, 1)), resultado))
+            return ronda, partidos
+
+
+class RegistroTorneos:
+    """
+    Torneos por id, pool de motores y cache de fixtures de todo el proceso.
+
+    - obtener() devuelve el torneo en memoria o lo levanta de la base
+      (TorneosDB); los menos usados salen de memoria al pasar max_torneos,
+      sin perder nada porque cada resultado ya está encolado en la base.
+      Sin base (no se pudo abrir) no se publican torneos: crear() devuelve
+      None y cada sesión sigue con su propio registro.
+    - fixture() genera un fixture una sola vez aunque varias sesiones lo
+      pidan a la vez (las demás esperan y lo leen de la cache). Los locks
+      son un número fijo ('franjas'), elegidos por hash de la configuración.
+    - motores() es un ProcessPoolExecutor único: los torneos que generan a
+      la vez se reparten los CPUs en lugar de abrir un pool cada uno.
+    """
+
+    def __init__(self, db: TorneosDB = None, cache: FixtureCache = None,
+                 num_workers: int = None, max_torneos: int = 64, franjas: int = 16):
+        self._db = db
+        self.cache = cache or fixture_cache()
+        self.num_workers = num_workers or os.cpu_count() or 1
+        self.max_torneos = max_torneos
+        self._torneos: "OrderedDict[str, TorneoCompartido]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Un lock por franja, no por configuración: no crece con las configuraciones pedidas
+        self._generando = tuple(threading.Lock() for _ in range(franjas))
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    @property
+    def db(self) -> Optional[TorneosDB]:
+        if self._db is None:
+            self._db = torneos_db()
+        return self._db
+
+    def motores(self) -> ProcessPoolExecutor:
+        """Pool de procesos compartido por los motores (se crea al primer uso)"""
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.num_workers)
+            return self._pool
+
+    def fixture(self, modo: str, jugadores: Sequence[str], num_canchas: int,
+                generar: Callable[[], Any], seed=None, grupos: Tuple[int, ...] = None) -> Any:
+        """
+        Como FixtureCache.obtener, pero una sola generación por configuración:
+        si otra sesión ya está generando el mismo fixture, se espera a que
+        termine y se lee de la cache. Dos configuraciones distintas en la
+        misma franja también se esperan (raro con 16 franjas y el pool
+        compartido igual reparte los CPUs).
+        """
+        clave = (modo, grupos or (len(jugadores),), num_canchas, seed)
+        with self._generando[hash(clave) % len(self._generando)]:
+            return self.cache.obtener(modo, jugadores, num_canchas, generar, seed, grupos)
+
+    def _guardar_en_memoria(self, torneo: TorneoCompartido):
+        with self._lock:
+            self._torneos[torneo.id] = torneo
+            self._torneos.move_to_end(torneo.id)
+            while len(self._torneos) > self.max_torneos:
+                self._torneos.popitem(last=False)
+
+    def crear(self, modo: str, registro: RegistroPartidos,
+              sesion: Dict[str, Any] = None) -> Optional[TorneoCompartido]:
+        """
+        Publica un torneo recién generado y lo guarda en la base.
+
+        Args:
+            modo: Modo de juego (ej. "americano", "sets")
+            registro: RegistroPartidos del fixture (el de la sesión organizadora)
+            sesion: Claves de session_state para redibujarlo (ver TorneosDB.crear)
+
+        Returns:
+            El torneo, o None si no hay base (queda solo en la sesión)
+        """
+        db = self.db
+        if db is None:
+            return None
+        torneo_id = db.crear(modo, registro.fixture, registro.participantes, list(registro.ids), sesion)
+        torneo = TorneoCompartido(torneo_id, modo, registro, sesion)
+        self._guardar_en_memoria(torneo)
+        return torneo
+
+    def obtener(self, torneo_id: str) -> Optional[TorneoCompartido]:
+        """El torneo 'torneo_id', de memoria o de la base; None si no existe"""
+        with self._lock:
+            torneo = self._torneos.get(torneo_id)
+            if torneo is not None:
+                self._torneos.move_to_end(torneo_id)
+                return torneo
+
+        db = self.db
+        guardado = db.cargar(torneo_id) if db is not None else None
+        if guardado is None:
+            return None
+        registro = RegistroPartidos(guardado["fixture"], guardado["participantes"])
+        for (ronda, cancha), (p1, p2) in guardado["resultados"].items():
+            registro.registrar(ronda, cancha, p1, p2)
+
+        with self._lock:
+            # Otra sesión pudo haberlo levantado mientras leíamos: gana la primera
+            torneo = self._torneos.get(torneo_id)
+        if torneo is None:
+            torneo = TorneoCompartido(torneo_id, guardado["modo"], registro, guardado["sesion"])
+        self._guardar_en_memoria(torneo)
+        return torneo
+
+    def registrar(self, torneo_id: str, ronda: int, cancha: int, p1: int, p2: int) -> Optional[int]:
+        """
+        Carga un resultado en el torneo compartido y lo encola en la base
+        (sin esperar al disco).
+
+        Returns:
+            El id del partido, o None si el torneo no existe
+        """
+        torneo = self.obtener(torneo_id)
+        if torneo is None:
+            return None
+        fila = torneo.registrar(ronda, cancha, p1, p2)
+        if self.db is not None:
+            self.db.guardar_resultado(torneo_id, ronda, cancha, p1, p2)
+        return fila
+
+    def en_memoria(self) -> List[TorneoCompartido]:
+        """Torneos activos en este proceso, del más reciente al más viejo"""
+        with self._lock:
+            return list(reversed(self._torneos.values()))
+
+
+_registro = None
+_registro_lock = threading.Lock()
+
+
+def registro_torneos() -> RegistroTorneos:
+    """Registro compartido por todas las sesiones del proceso"""
+    global _registro
+    with _registro_lock:
+        if _registro is None:
+            _registro = RegistroTorneos()
+        return _registro
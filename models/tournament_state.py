@@ -0,0 +1,78 @@
+import numpy as np
+from typing import List, Dict, Iterable, Set, Tuple
+
+
+class TournamentState:
+    """
+    Array-backed statistics for a tournament being generated.
+
+    Players are mapped once to dense integer ids (their position in the
+    player list) and every counter lives in a NumPy array indexed by those
+    ids, so the scoring loops never hash player names.
+    """
+    def __init__(self, players: List[str]):
+        """
+        Args:
+            players: List of player names, id i corresponds to players[i]
+        """
+        self.players = list(players)
+        self.num_players = len(self.players)
+        self.index: Dict[str, int] = {p: i for i, p in enumerate(self.players)}
+
+        n = self.num_players
+        self.partner_count = np.zeros((n, n), dtype=np.int32)
+        self.opponent_count = np.zeros((n, n), dtype=np.int32)
+        self.games_played = np.zeros(n, dtype=np.int32)  # Valid games only
+        self.helper_games = np.zeros(n, dtype=np.int32)  # Helper games (don't count)
+        self.consecutive_rests = np.zeros(n, dtype=np.int32)
+        self.last_round_played = np.full(n, -1, dtype=np.int32)
+
+        # Players not yet faced / partnered, kept up to date by record_match
+        self.uncovered_opponents: List[Set[int]] = [set(range(n)) - {i} for i in range(n)]
+        self.uncovered_partners: List[Set[int]] = [set(range(n)) - {i} for i in range(n)]
+
+    def ids(self, names: Iterable[str]) -> List[int]:
+        """Translate player names to their integer ids"""
+        return [self.index[p] for p in names]
+
+    def names(self, ids: Iterable[int]) -> List[str]:
+        """Translate integer ids back to player names"""
+        return [self.players[i] for i in ids]
+
+    def record_match(self, match: Tuple[int, int, int, int], helpers: Iterable[int], round_num: int):
+        """Update counters after a match (p1, p2) vs (p3, p4) is scheduled"""
+        p1, p2, p3, p4 = match
+        helpers = set(helpers)
+
+        # Partners
+        self.partner_count[p1, p2] += 1
+        self.partner_count[p2, p1] += 1
+        self.partner_count[p3, p4] += 1
+        self.partner_count[p4, p3] += 1
+        self.uncovered_partners[p1].discard(p2)
+        self.uncovered_partners[p2].discard(p1)
+        self.uncovered_partners[p3].discard(p4)
+        self.uncovered_partners[p4].discard(p3)
+
+        # Opponents
+        for t1_player in (p1, p2):
+            for t2_player in (p3, p4):
+                self.opponent_count[t1_player, t2_player] += 1
+                self.opponent_count[t2_player, t1_player] += 1
+                self.uncovered_opponents[t1_player].discard(t2_player)
+                self.uncovered_opponents[t2_player].discard(t1_player)
+
+        # Games played
+        for p in match:
+            if p in helpers:
+                self.helper_games[p] += 1
+            else:
+                self.games_played[p] += 1
+            self.last_round_played[p] = round_num
+
+    def record_rests(self, resting: Iterable[int], playing: Iterable[int]):
+        """Update the consecutive rests counter after a round"""
+        for p in resting:
+            self.consecutive_rests[p] += 1
+        for p in playing:
+            self.consecutive_rests[p] = 0
@@ -0,0 +1,59 @@
+import streamlit as st
+from assets.helper_funcs import calcular_ranking_parejas, fragmento_cada
+from assets.theme import tarjeta_partido, fila_tarjetas
+from models.sets.All_pairs_sets import calcular_ranking_parejas_sets
+from models.tournament_registry import registro_torneos
+
+# Leaderboard de cada modo (se calcula una vez por resultado para todos los espectadores);
+# None = el ranking individual incremental del torneo compartido
+RANKING_POR_MODO = {
+    "parejas_fijas": calcular_ranking_parejas,
+    "americano": None,
+    "mixto": None,
+    "sets": calcular_ranking_parejas_sets,
+}
+
+TITULOS = {
+    "parejas_fijas": "Torneo Americano - Parejas Fijas",
+    "americano": "Torneo Americano",
+    "mixto": "Torneo Americano Mixto",
+    "sets": "Torneo por Sets",
+}
+
+NO_EXISTE = "❌ No existe el torneo que quieres ver."
+
+
+@fragmento_cada(10)
+def tablero(torneo_id):
+    """Progreso, ronda en juego y ranking; se refresca solo cada 10 s"""
+    # Entre refrescos el torneo puede dejar de estar (salió de memoria y no hay base)
+    torneo = registro_torneos().obtener(torneo_id)
+    if torneo is None:
+        st.error(NO_EXISTE)
+        return
+    cargados, total = torneo.progreso()
+    st.progress(cargados / total if total else 0.0, text=f"{cargados} de {total} partidos con resultado")
+
+    # Copia tomada bajo el lock del torneo: el organizador puede estar cargando resultados
+    ronda, partidos = torneo.ronda_en_juego()
+    st.subheader(f"Ronda {ronda}")
+    tarjetas = []
+    for cancha, pareja1, pareja2, resultado in partidos:
+        titulo = f"Cancha {cancha}" + (f" · {resultado[0]} - {resultado[1]}" if resultado else "")
+        tarjetas.append(tarjeta_partido(titulo, pareja1, pareja2))
+    fila_tarjetas(tarjetas)
+
+    st.subheader("Ranking")
+    # Mismo DataFrame para todas las sesiones que miran este torneo: solo lectura
+    st.dataframe(torneo.tabla(RANKING_POR_MODO[torneo.modo]), use_container_width=True, hide_index=True)
+
+
+def app():
+    """Vista de solo lectura de un torneo (?ver=<id>), sin login ni session_state del organizador"""
+    torneo_id = st.query_params.get("ver")
+    torneo = registro_torneos().obtener(torneo_id) if torneo_id else None
+    if torneo is None:
+        st.error(NO_EXISTE)
+        return
+    st.markdown(f'<div class="main-title">{TITULOS.get(torneo.modo, "Torneo")}</div>', unsafe_allow_html=True)
+    tablero(torneo_id)
@@ -50,64 +50,8 @@ def app():
         elif current_len > num_cards: 
             st.session_state.players = st.session_state.players[:num_cards]
             
-    # === ESTILOS ===
-    st.markdown("""
-    <style>
-        .main-title {
-            text-align: center;
-            font-size: 32px;
-            color: #6C13BF;
-            font-weight: 700;
-            margin-bottom: 40px;
-        }
+    # Estilos: assets/theme.py (se inyectan una vez por rerun en streamlit_app.py)
 
-        .player-label {
-            font-weight: 700 !important;
-            font-size: 20px !important;
-            color: #0B0B19 !important;
-        }
-
-        /* Input estilo tarjeta */
-        .stTextInput input {
-            background-color: #f7f7fb !important;
-            border-radius: 12px !important;
-            font-size: 18px !important;
-            padding: 18px 10px !important;
-            height: 45px !important;        /* un poco más alto */
-            color: #0B0B19 !important;
-            text-align: center !important;
-            font-weight: 500 !important;
-            border: 1px solid #ddd !important;
-            width: 95% !important;          /* solo un poco más angosto */
-            box-sizing: border-box !important;
-        }
-
-        .stTextInput input:focus {
-            border: 2px solid #6C13BF !important;
-            outline: none !important;
-        }
-
-        /* Espaciado entre columnas */
-        div[data-testid="column"] {
-            padding-left: 45px !important;
-            padding-right: 45px !important;
-        }
-
-        /* Botón principal */
-        .stButton button {
-            width: 100%;
-            background-color: #0B0B19;
-            color: white;
-            font-weight: 700;
-            font-size: 18px;
-            padding: 1em;
-            border-radius: 10px;
-            margin-top: 40px;
-        }
-    </style>
-    """, unsafe_allow_html=True)
-
-    
     # === ENTRADAS DE JUGADORES (REFECTORIZADO) ===
     cols_per_row = 4
     for i in range(0, num_cards, cols_per_row):
@@ -1,32 +1,114 @@
 import streamlit as st
-from models.AmericanoMixto.AllvsAll_MixtoV2 import AmericanoPadelTournament, generar_torneo_mixto,analyze_algorithm_results
-from assets.helper_funcs import initialize_vars, calcular_ranking_individual, render_nombre
-from assets.analyze_funcs import heatmap_parejas_mixtas,heatmap_descansos_por_ronda, heatmap_enfrentamientos
+from models.AmericanoMixto.AllvsAll_MixtoV2 import generar_torneo_mixto
+from assets.helper_funcs import initialize_vars, render_nombre, fragmento, ventana_rondas
+from assets.theme import tarjeta_partido, fila_tarjetas
+from assets.analyze_funcs import analyze_mixto_results
+from models.tournament_registry import registro_torneos
+from models.match_store import RegistroPartidos, registro_en_sesion
+from assets.persistencia import guardar_torneo, guardar_resultado, olvidar_torneo, ranking_torneo
 from collections import defaultdict
 import random
 import pandas as pd
 
-def app():
-    st.markdown('<div class="main-title"> Torneo Americano Mixto </div>', unsafe_allow_html=True)
+# -----------------------------------------------------
+# 1. FUNCIÓN CALLBACK PARA GUARDAR RESULTADOS AL INSTANTE
+# -----------------------------------------------------
+def actualizar_resultado(pareja1_key, pareja2_key, ronda, cancha):
+    """Callback para guardar los puntos en el registro de partidos (st.session_state.registro)."""
+    try:
+        val1 = st.session_state[pareja1_key]
+        val2 = st.session_state[pareja2_key]
+        # El partido se identifica por (ronda, cancha). Una sola escritura: el torneo
+        # compartido actualiza el ranking incremental y lo encola en la base
+        guardar_resultado(ronda, cancha, val1, val2)
+    except KeyError:
+        # Esto puede ocurrir si se llama antes de que se hayan inicializado las keys, ignorar
+        pass
+# -----------------------------------------------------
+
+
+@fragmento
+def ronda_mixto(ronda_data, puntos_partido):
+    """Tarjetas e inputs de una ronda (fragmento: se re-ejecuta sola al cargar un resultado)"""
+    st.markdown(f"### Ronda {ronda_data['ronda']}")
     
-    # -----------------------------------------------------
-    # 1. FUNCIÓN CALLBACK PARA GUARDAR RESULTADOS AL INSTANTE
-    # -----------------------------------------------------
-    def actualizar_resultado(pareja1_key, pareja2_key, pareja1_str, pareja2_str):
-        """Callback para guardar los puntos en st.session_state.resultados."""
-        try:
-            val1 = st.session_state[pareja1_key]
-            val2 = st.session_state[pareja2_key]
-            # La clave de resultados es un tuple de las parejas involucradas
-            st.session_state.resultados[(pareja1_str, pareja2_str)] = (val1, val2)
-        except KeyError:
-            # Esto puede ocurrir si se llama antes de que se hayan inicializado las keys, ignorar
-            pass
-    # -----------------------------------------------------
+    # Create columns for matches
+    num_partidos = len(ronda_data["partidos"])
+    if num_partidos > 0:
+        # Render player names
+        nombres = []
+        for partido in ronda_data["partidos"]:
+            ayudantes = partido.get("ayudantes", []) or []
+            nombres.append((" & ".join(render_nombre(j, ayudantes) for j in partido["pareja1"]),
+                            " & ".join(render_nombre(j, ayudantes) for j in partido["pareja2"])))
+
+        # Display match cards: un solo bloque HTML por ronda, los inputs debajo en columnas alineadas
+        fila_tarjetas([tarjeta_partido(f"Cancha {partido['cancha']}", pareja1, pareja2)
+                       for partido, (pareja1, pareja2) in zip(ronda_data["partidos"], nombres)])
+        cols = st.columns(num_partidos)
+        
+        for c_i, partido in enumerate(ronda_data["partidos"]):
+            pareja1, pareja2 = nombres[c_i]
+            cancha = partido["cancha"]
+            
+            with cols[c_i]:
+                # Score inputs with safe keys
+                raw_p1 = "_".join(partido["pareja1"])
+                raw_p2 = "_".join(partido["pareja2"])
+                
+                # Unique keys for the Streamlit widgets
+                key_p1 = f"score_r{ronda_data['ronda']}_m{c_i}_{raw_p1}_p1"
+                key_p2 = f"score_r{ronda_data['ronda']}_m{c_i}_{raw_p2}_p2"
+                
+                # 2. RECUPERAR VALORES GUARDADOS
+                # Usamos el valor por defecto 0, o el valor guardado para (ronda, cancha)
+                saved_s1, saved_s2 = registro_en_sesion(st.session_state).puntaje(ronda_data['ronda'], cancha)
+                
+                colA, colB = st.columns(2)
+                with colA:
+                    st.number_input(
+                        f"Puntos {pareja1}", 
+                        key=key_p1, 
+                        min_value=0,
+                        max_value=puntos_partido,
+                        value=saved_s1, # <-- Pasar el valor guardado
+                        on_change=actualizar_resultado, # <-- Usar callback
+                        kwargs={
+                            "pareja1_key": key_p1, 
+                            "pareja2_key": key_p2,
+                            "ronda": ronda_data['ronda'],
+                            "cancha": cancha
+                        }
+                    )
+                with colB:
+                    st.number_input(
+                        f"Puntos {pareja2}", 
+                        key=key_p2, 
+                        min_value=0,
+                        max_value=puntos_partido,
+                        value=saved_s2, # <-- Pasar el valor guardado
+                        on_change=actualizar_resultado, # <-- Usar callback
+                        kwargs={
+                            "pareja1_key": key_p1, 
+                            "pareja2_key": key_p2,
+                            "ronda": ronda_data['ronda'],
+                            "cancha": cancha
+                        }
+                    )
+                
+                # 3. ELIMINAR ASIGNACIÓN INMEDIATA.
+                # La asignación del resultado ya no es necesaria aquí
+                # porque el callback la maneja.
     
-    # Initialize resultados if not exists
-    if 'resultados' not in st.session_state:
-        st.session_state.resultados = {}
+    # Show resting players
+    if ronda_data["descansan"]:
+        st.info(f"Descansan: {', '.join(ronda_data['descansan'])}")
+    
+    st.markdown("---")
+
+
+def app():
+    st.markdown('<div class="main-title"> Torneo Americano Mixto </div>', unsafe_allow_html=True)
     
     # Get players and settings from session state
     male_players = st.session_state.hombres
@@ -48,170 +130,26 @@ def app():
     # Generate fixture ONLY if it doesn't exist or configuration changed
     if 'tournament_key' not in st.session_state or st.session_state.tournament_key != tournament_key:
         with st.spinner("Generando fixture optimizado..."):
-            out = generar_torneo_mixto(male_players, female_players, 
-                                        num_canchas, puntos_partido)
+            out = registro_torneos().fixture(
+                "mixto", male_players + female_players, num_canchas,
+                lambda: generar_torneo_mixto(male_players, female_players, num_canchas, puntos_partido),
+                grupos=(len(male_players), len(female_players)))
             st.session_state.fixture = out["rondas"]
             st.session_state.out = out
-            # NO BORRAMOS st.session_state.resultados aquí, sino solo si el torneo es nuevo.
-            # Al cambiar la llave del torneo, esto indica un torneo nuevo, así que lo borramos.
-            st.session_state.resultados = {}
+            # NO BORRAMOS los resultados aquí, sino solo si el torneo es nuevo.
+            # Al cambiar la llave del torneo, esto indica un torneo nuevo: registro vacío.
+            st.session_state.registro = RegistroPartidos(st.session_state.fixture, male_players + female_players)
+            st.session_state.pop("ronda_actual", None)
             st.session_state.tournament_key = tournament_key
+            guardar_torneo("mixto")
 
-    # Custom CSS
-    st.markdown("""
-        <style>
-        .main-title {
-        text-align: center;
-        font-size: 32px;
-        color: #6C13BF; /* Morado/Púrpura */
-        font-weight: 700;
-        margin-bottom: 40px;
-        }
-        .match-card {
-            background: linear-gradient(145deg, #ffffff, #f0f0f5);
-            border-radius: 18px;
-            padding: 22px;
-            margin-bottom: 25px;
-            box-shadow: 0 8px 20px rgba(0,0,0,0.15);
-            border: 1px solid rgba(108, 19, 191, 0.1);
-            transition: transform 0.15s ease, box-shadow 0.15s ease;
-        }
-        .match-card:hover {
-            transform: translateY(-2px);
-            box-shadow: 0 12px 28px rgba(0,0,0,0.2);
-        }
-        .match-title {
-            font-weight: 700;
-            font-size: 18px;
-            color: #0B0B19;
-            margin-bottom: 10px;
-            text-align: center;
-        }
-        .team-name {
-            font-weight: 600;
-            color: #0B0B19;
-            font-size: 16px;
-            text-align: center;
-            padding: 8px;
-        }
-        .vs {
-            font-weight: 800;
-            font-size: 20px;
-            color: #6C13BF;
-            text-align: center;
-            margin-top: 8px;
-            margin-bottom: 8px;
-        }
-        .stNumberInput input {
-            background-color: #5E3187 !important;
-            color: white !important;
-            font-weight: 700 !important;
-        }
-        .stNumberInput button {
-            color: white !important;
-        }
-        .stButton button {
-            width: 100%;
-            background-color: #0B0B19;
-            color: white;
-            font-weight: 700;
-            font-size: 18px;
-            padding: 1em;
-            border-radius: 10px;
-            margin-top: 20px;
-        }
-        </style>
-    """, unsafe_allow_html=True)
+    # Estilos: assets/theme.py (se inyectan una vez por rerun en streamlit_app.py)
 
-    # Display each round
-    for ronda_data in st.session_state.fixture:
-        st.markdown(f"### Ronda {ronda_data['ronda']}")
-        
-        # Create columns for matches
-        num_partidos = len(ronda_data["partidos"])
-        if num_partidos > 0:
-            cols = st.columns(num_partidos)
-            
-            for c_i, partido in enumerate(ronda_data["partidos"]):
-                ayudantes = partido.get("ayudantes", []) or []
-                
-                # Render player names
-                p1_render = [render_nombre(j, ayudantes) for j in partido["pareja1"]]
-                p2_render = [render_nombre(j, ayudantes) for j in partido["pareja2"]]
-                
-                pareja1 = " & ".join(p1_render)
-                pareja2 = " & ".join(p2_render)
-                
-                cancha = partido["cancha"]
-                
-                with cols[c_i]:
-                    # Display match card
-                    st.markdown(f"""
-                        <div class="match-card">
-                            <div class="match-title">Cancha {cancha}</div>
-                            <div class="team-name">{pareja1}</div>
-                            <div class="vs">VS</div>
-                            <div class="team-name">{pareja2}</div>
-                        </div>
-                    """, unsafe_allow_html=True)
-                    
-                    # Score inputs with safe keys
-                    raw_p1 = "_".join(partido["pareja1"])
-                    raw_p2 = "_".join(partido["pareja2"])
-                    
-                    # Unique keys for the Streamlit widgets
-                    key_p1 = f"score_r{ronda_data['ronda']}_m{c_i}_{raw_p1}_p1"
-                    key_p2 = f"score_r{ronda_data['ronda']}_m{c_i}_{raw_p2}_p2"
-                    
-                    # Unique match key for storing results (uses rendered names)
-                    pareja1_str = " & ".join(partido["pareja1"])
-                    pareja2_str = " & ".join(partido["pareja2"])
-                    
-                    # 2. RECUPERAR VALORES GUARDADOS
-                    # Usamos el valor por defecto 0, o el valor guardado
-                    saved_s1, saved_s2 = st.session_state.resultados.get((pareja1_str, pareja2_str), (0, 0))
-                    
-                    colA, colB = st.columns(2)
-                    with colA:
-                        st.number_input(
-                            f"Puntos {pareja1}", 
-                            key=key_p1, 
-                            min_value=0,
-                            max_value=puntos_partido,
-                            value=saved_s1, # <-- Pasar el valor guardado
-                            on_change=actualizar_resultado, # <-- Usar callback
-                            kwargs={
-                                "pareja1_key": key_p1, 
-                                "pareja2_key": key_p2,
-                                "pareja1_str": pareja1_str, 
-                                "pareja2_str": pareja2_str
-                            }
-                        )
-                    with colB:
-                        st.number_input(
-                            f"Puntos {pareja2}", 
-                            key=key_p2, 
-                            min_value=0,
-                            max_value=puntos_partido,
-                            value=saved_s2, # <-- Pasar el valor guardado
-                            on_change=actualizar_resultado, # <-- Usar callback
-                            kwargs={
-                                "pareja1_key": key_p1, 
-                                "pareja2_key": key_p2,
-                                "pareja1_str": pareja1_str, 
-                                "pareja2_str": pareja2_str
-                            }
-                        )
-                    
-                    # 3. ELIMINAR ASIGNACIÓN INMEDIATA.
-                    # La asignación (st.session_state.resultados = (score1, score2)) ya no es necesaria
-                    # porque el callback la maneja.
-        
-        # Show resting players
-        if ronda_data["descansan"]:
-            st.info(f"Descansan: {', '.join(ronda_data['descansan'])}")
-        
-        st.markdown("---")
+    # Display the current round and the next one: cada ronda es un fragmento,
+    # cargar un resultado no re-ejecuta la página
+    fixture = st.session_state.fixture
+    for idx in ventana_rondas(len(fixture), "ronda_actual", registro_en_sesion(st.session_state).ronda_pendiente()):
+        ronda_mixto(fixture[idx], puntos_partido)
     
     # Show summary
     if "out" in st.session_state and "resumen" in st.session_state.out:
@@ -219,8 +157,9 @@ def app():
         df_resumen = pd.DataFrame(st.session_state.out["resumen"])
         st.dataframe(df_resumen, use_container_width=True)
     
-    #analyze_algorithm_results(st.session_state.fixture,male_players, 
-    #    female_players)
+    # Análisis: solo se dibuja con el toggle activo y las figuras quedan en cache por fixture
+    if st.toggle("🔍 Ver análisis del fixture", key="ver_analisis_mixto"):
+        analyze_mixto_results(st.session_state.fixture, male_players, female_players)
     
     # Ranking buttons
     st.markdown("---")
@@ -231,7 +170,7 @@ def app():
         if st.button("👀 ¿Cómo va el ranking?", use_container_width=True):
             try:
                 # Calculate ranking
-                ranking = calcular_ranking_individual(st.session_state.resultados, st.session_state.fixture)
+                ranking = ranking_torneo()
                 
                 if ranking is not None and not ranking.empty:
                     st.session_state.ranking = ranking
@@ -246,7 +185,7 @@ def app():
         if st.button("🏆 Ver Resultados Finales", use_container_width=True):
             try:
                 # Calculate final ranking
-                ranking = calcular_ranking_individual(st.session_state.resultados, st.session_state.fixture)
+                ranking = ranking_torneo()
                 
                 if ranking is not None and not ranking.empty:
                     st.session_state.ranking = ranking
@@ -269,11 +208,12 @@ def app():
                 del st.session_state.fixture
             if 'out' in st.session_state:
                 del st.session_state.out
-            # Dejamos st.session_state.resultados para que se guarde el estado del fixture.
-            # OJO: Si borrabas st.session_state.resultados al volver, también perdías el estado.
+            # Dejamos st.session_state.registro para que se guarde el estado del fixture.
+            # OJO: Si borrabas el registro al volver, también perdías el estado.
             # Lo que quieres es que no se borre al *volver desde el ranking*.
             # Lo dejaré comentado, asumiendo que el usuario quiere borrar el fixture, pero no los resultados.
-            # if 'resultados' in st.session_state:
-            #     del st.session_state.resultados 
+            # if 'registro' in st.session_state:
+            #     del st.session_state.registro
+            olvidar_torneo()
             st.session_state.page = "players_setupMixto"
             st.rerun()
\ No newline at end of file
@@ -1,6 +1,71 @@
 import streamlit as st
-from assets.helper_funcs import generar_fixture_parejas
+from assets.helper_funcs import generar_fixture_parejas, fragmento, ventana_rondas
+from assets.theme import tarjeta_partido, fila_tarjetas
 from models.sets.All_pairs_sets import calcular_ranking_parejas_sets
+from models.tournament_registry import registro_torneos
+from models.match_store import RegistroPartidos, registro_en_sesion
+from assets.persistencia import guardar_torneo, guardar_resultado, olvidar_torneo, ranking_torneo
+
+# 🔄 FUNCIÓN CALLBACK: Actualiza el registro de partidos (Fase de Grupos)
+def actualizar_resultado_sets(ronda, cancha, k1, k2):
+    """Lee los valores de los number_input (usando sus keys) y los guarda en el partido (ronda, cancha)."""
+    val1 = st.session_state.get(k1, 0)
+    val2 = st.session_state.get(k2, 0)
+    guardar_resultado(ronda, cancha, val1, val2)
+    # El ranking y la final están fuera del fragmento de la ronda (ver ronda_sets)
+    st.session_state.sets_resultado_nuevo = True
+
+
+@fragmento
+def ronda_sets(i, ronda):
+    """Tarjetas e inputs de una ronda de la fase de grupos (fragmento: se re-ejecuta sola)"""
+    st.subheader(f"Ronda {i}")
+    # Las tarjetas de la ronda van en un solo bloque HTML; debajo, los inputs en columnas alineadas
+    fila_tarjetas([tarjeta_partido(f"Cancha {c_i+1}", p1, p2) for c_i, (p1, p2) in enumerate(ronda)])
+    cols = st.columns(len(ronda))
+
+    for c_i, match in enumerate(ronda):
+        p1, p2 = match
+        with cols[c_i]:
+            colA, colB = st.columns(2)
+            
+            # Keys
+            match_key = f"{p1}_{p2}_ronda_{i}_cancha_{c_i}"
+            score1_key = f"{match_key}_p1"
+            score2_key = f"{match_key}_p2"
+            
+            # Recuperar valor guardado o 0
+            # El registro identifica el partido por (ronda, cancha)
+            saved_s1, saved_s2 = registro_en_sesion(st.session_state).puntaje(i, c_i + 1)
+
+
+            with colA:
+                st.number_input(
+                    f"Sets {p1}", 
+                    key=score1_key, 
+                    min_value=0, 
+                    value=saved_s1, # Usa el valor guardado
+                    label_visibility="collapsed",
+                    on_change=actualizar_resultado_sets, # ✅ CALLBACK GRUPOS P1
+                    kwargs={"ronda": i, "cancha": c_i + 1, "k1": score1_key, "k2": score2_key}
+                )
+            with colB:
+                st.number_input(
+                    f"Sets {p2}", 
+                    key=score2_key, 
+                    min_value=0, 
+                    value=saved_s2, # Usa el valor guardado
+                    label_visibility="collapsed",
+                    on_change=actualizar_resultado_sets, # ✅ CALLBACK GRUPOS P2
+                    kwargs={"ronda": i, "cancha": c_i + 1, "k1": score1_key, "k2": score2_key}
+                )
+
+    # El ranking y la final dependen de todos los resultados: solo con esas vistas abiertas
+    # un resultado nuevo re-ejecuta la página entera
+    if st.session_state.pop("sets_resultado_nuevo", False) and (
+            st.session_state.get("show_ranking") or st.session_state.get("show_final")):
+        st.rerun()
+
 
 def app():
     st.markdown('<div class="main-title"> Torneo por Sets </div>', unsafe_allow_html=True)    
@@ -14,7 +79,6 @@ def app():
     # 1. 📌 FIX DE SEGURIDAD Y PREPARACIÓN DE VARIABLES
     # Garantiza que estas variables existan antes de ser usadas por el resto del script
     if 'parejas' not in st.session_state: st.session_state.parejas = st.session_state.players
-    if 'resultados' not in st.session_state: st.session_state.resultados = {}
     if 'fixture' not in st.session_state: st.session_state.fixture = []
     if 'show_final' not in st.session_state: st.session_state.show_final = False
     if 'show_ranking' not in st.session_state: st.session_state.show_ranking = False # NUEVO ESTADO PARA EL RANKING
@@ -22,14 +86,7 @@ def app():
     
     parejas = st.session_state.parejas
     
-    # 2. 🔄 FUNCIÓN CALLBACK: Actualiza el diccionario 'resultados' (Fase de Grupos)
-    def actualizar_resultado_sets(p1, p2, k1, k2):
-        """Lee los valores de los number_input (usando sus keys) y actualiza el diccionario maestro."""
-        val1 = st.session_state.get(k1, 0)
-        val2 = st.session_state.get(k2, 0)
-        st.session_state.resultados[(p1, p2)] = (val1, val2)
-        
-    # 3. 🏆 FUNCIÓN CALLBACK: Actualiza el resultado de la Final
+    # 2. 🏆 FUNCIÓN CALLBACK: Actualiza el resultado de la Final
     def actualizar_final_score(k1, k2):
         """Actualiza la variable específica de la final y el estado de session."""
         val1 = st.session_state.get(k1, 0)
@@ -40,157 +97,24 @@ def app():
     tournament_key = f"parejas_fijas_{len(parejas)}_{num_canchas}_{num_sets}_sets"
     if 'tournament_key' not in st.session_state or st.session_state.tournament_key != tournament_key:
         with st.spinner("Generando fixture optimizado..."):
-            st.session_state.fixture = generar_fixture_parejas(parejas,num_canchas)
-            st.session_state.resultados = {}
+            st.session_state.fixture = registro_torneos().fixture(
+                "sets", parejas, num_canchas, lambda: generar_fixture_parejas(parejas, num_canchas))
+            st.session_state.registro = RegistroPartidos(st.session_state.fixture, parejas)
+            st.session_state.pop("ronda_actual", None)
             st.session_state.parejas = parejas
             st.session_state.tournament_key = tournament_key
+            guardar_torneo("sets")
             
-    # --- Estilos CSS (Se mantienen sin cambios) ---
-    st.markdown("""
-        <style>
-        .main-title {
-            text-align: center;
-            font-size: 32px;
-            color: #6C13BF; /* Morado/Púrpura */
-            font-weight: 700;
-            margin-bottom: 40px;
-        }
-        .match-card {
-            background-color: #f7f7fb;
-            border-radius: 15px;
-            padding: 20px;
-            margin-bottom: 25px;
-            box-shadow: 0 2px 6px rgba(0,0,0,0.07);
-        }
-        .final-match-card {
-            background-color: #5E3187; 
-            color: white;
-            border-radius: 15px;
-            padding: 20px;
-            margin-bottom: 25px;
-            box-shadow: 0 5px 15px rgba(0,0,0,0.3);
-        }
-        .match-title {
-            font-weight: 700;
-            font-size: 18px;
-            color: #0B0B19;
-            margin-bottom: 10px;
-        }
-        .final-title {
-            font-weight: 700;
-            font-size: 24px;
-            color: white;
-            margin-bottom: 10px;
-            text-align: center;
-        }
-        .team-name {
-            font-weight: 600;
-            color: #0B0B19;
-            font-size: 16px;
-            text-align: center;
-        }
-        .final-team-name {
-            font-weight: 700;
-            color: white;
-            font-size: 20px;
-            text-align: center;
-        }
-        .vs {
-            font-weight: 800;
-            font-size: 20px;
-            color: #6C13BF;
-            text-align: center;
-            margin-top: 8px;
-            margin-bottom: 8px;
-        }
-        .final-vs {
-            font-weight: 800;
-            font-size: 24px;
-            color: #00CED1; /* CAMBIO: Color turquesa estilizado */
-            text-align: center;
-            margin-top: 15px;
-            margin-bottom: 15px;
-        }
-        /* Ajuste para que los number_input sean menos disruptivos visualmente */
-        /* Nota: Streamlit aplica sus propios estilos, estos son hacks CSS */
-        div[data-testid="stForm"] div.stNumberInput input { 
-            text-align: center;
-            font-weight: 700;
-        }
-        .stNumberInput input {
-            background-color: #5E3187 !important;
-            color: white !important;                 /* makes the number white */
-            font-weight: 700 !important;             /* makes it bold */
-        }
-                        
-        .stNumberInput button {
-        color: white !important;           /* color de los signos + y - */
-        }
-        /* === BOTÓN === */
-        .stButton button {
-            width: 100%;
-            background-color: #0B0B19;
-            color: white;
-            font-weight: 700;
-            font-size: 18px;
-            padding: 1em;
-            border-radius: 10px;
-            margin-top: 40px;
-        }
-        </style>
-    """, unsafe_allow_html=True)
+    # Estilos: assets/theme.py (se inyectan una vez por rerun en streamlit_app.py)
     
     # ----------------------------------------------------------------------
     # FASE DE GRUPOS (FIXTURE)
     # ----------------------------------------------------------------------
-    for i, ronda in enumerate(st.session_state.fixture, start=1):
-        st.subheader(f"Ronda {i}")
-        cols = st.columns(len(ronda))
-
-        for c_i, match in enumerate(ronda):
-            p1, p2 = match
-            with cols[c_i]:
-                st.markdown(f"""
-                    <div class="match-card">
-                        <div class="match-title">Cancha {c_i+1}</div>
-                        <div class="team-name">{p1}</div>
-                        <div class="vs">VS</div>
-                        <div class="team-name">{p2}</div>
-                    </div>
-                """, unsafe_allow_html=True)
-
-                colA, colB = st.columns(2)
-                
-                # Keys
-                match_key = f"{p1}_{p2}_ronda_{i}_cancha_{c_i}"
-                score1_key = f"{match_key}_p1"
-                score2_key = f"{match_key}_p2"
-                
-                # Recuperar valor guardado o 0
-                # st.session_state.resultados usa tuplas inmutables como clave
-                saved_s1, saved_s2 = st.session_state.resultados.get(tuple(sorted((p1, p2))), (0, 0))
-
-
-                with colA:
-                    st.number_input(
-                        f"Sets {p1}", 
-                        key=score1_key, 
-                        min_value=0, 
-                        value=saved_s1, # Usa el valor guardado
-                        label_visibility="collapsed",
-                        on_change=actualizar_resultado_sets, # ✅ CALLBACK GRUPOS P1
-                        kwargs={"p1": p1, "p2": p2, "k1": score1_key, "k2": score2_key}
-                    )
-                with colB:
-                    st.number_input(
-                        f"Sets {p2}", 
-                        key=score2_key, 
-                        min_value=0, 
-                        value=saved_s2, # Usa el valor guardado
-                        label_visibility="collapsed",
-                        on_change=actualizar_resultado_sets, # ✅ CALLBACK GRUPOS P2
-                        kwargs={"p1": p1, "p2": p2, "k1": score1_key, "k2": score2_key}
-                    )
+    # Solo la ronda actual y la siguiente; cada una es un fragmento:
+    # cargar un resultado no re-ejecuta la página
+    fixture = st.session_state.fixture
+    for idx in ventana_rondas(len(fixture), "ronda_actual", registro_en_sesion(st.session_state).ronda_pendiente()):
+        ronda_sets(idx + 1, fixture[idx])
 
     # ----------------------------------------------------------------------
     # BOTONES DE RANKING Y FINAL (EN COLUMNAS)
@@ -208,7 +132,7 @@ def app():
         # Lógica para botón de la Final
         df_ranking_temp = None
         try:
-            df_ranking_temp = calcular_ranking_parejas_sets(parejas, st.session_state.resultados)
+            df_ranking_temp = ranking_torneo(calcular_ranking_parejas_sets)
         except Exception:
             pass # Si hay error, df_ranking_temp será None
 
@@ -226,7 +150,7 @@ def app():
         st.info(f"Regla: 1 Punto por partido ganado. Desempate por Diferencia de Sets (SG - SP).")
         
         try:
-            df_ranking = calcular_ranking_parejas_sets(parejas, st.session_state.resultados)
+            df_ranking = ranking_torneo(calcular_ranking_parejas_sets)
             
             col_config = {
                 'Pareja': st.column_config.TextColumn("Pareja"), # Asegura que la columna Pareja sea TextColumn
@@ -255,7 +179,7 @@ def app():
     # 1. Calcular el ranking de la fase de grupos para obtener los 2 finalistas
     df_ranking_final = None
     try:
-        df_ranking_final = calcular_ranking_parejas_sets(parejas, st.session_state.resultados)
+        df_ranking_final = ranking_torneo(calcular_ranking_parejas_sets)
     except Exception:
         df_ranking_final = None # Se mantiene la lógica de error
 
@@ -347,14 +271,15 @@ def app():
                 del st.session_state.tournament_key
             if 'fixture' in st.session_state:
                 del st.session_state.fixture
-            if 'resultados' in st.session_state:
-                del st.session_state.resultados
+            if 'registro' in st.session_state:
+                del st.session_state.registro
             if 'show_final' in st.session_state:
                 del st.session_state.show_final
             if 'final_match_scores' in st.session_state:
                 del st.session_state.final_match_scores
             if 'show_ranking' in st.session_state: # Limpiar el nuevo estado
                 del st.session_state.show_ranking
+            olvidar_torneo()
                 
             st.session_state.page = "players_setup"
             st.rerun()
@@ -363,7 +288,7 @@ def app():
         if st.button("🏆 Ver Resultados Finales", use_container_width=True):
             try:
                 # Calculate final ranking (based on group stage)
-                df_ranking = calcular_ranking_parejas_sets(parejas, st.session_state.resultados)
+                df_ranking = ranking_torneo(calcular_ranking_parejas_sets)
                 
                 if df_ranking is not None and not df_ranking.empty:
                     st.session_state.ranking = df_ranking
@@ -1,6 +1,7 @@
 import streamlit as st
 import pandas as pd
 from assets.show_rankings import define_ranking_items
+from assets.persistencia import olvidar_torneo
 
 
 def app():
@@ -13,6 +14,12 @@ def app():
     # --- Estilos Podio ---
     col2, col1, col3 = st.columns([1, 1, 1])
     define_ranking_items(df,col1,col2,col3)
+
+    # Exportar los resultados cargados (ronda, cancha, parejas y puntos)
+    if "registro" in st.session_state and len(st.session_state.registro):
+        st.download_button("⬇️ Descargar resultados (CSV)",
+                           st.session_state.registro.tabla().to_csv(index=False).encode("utf-8"),
+                           file_name="resultados.csv", mime="text/csv")
     
 
     col2, col1, col3, col4 = st.columns([1, 1, 1, 1])
@@ -27,6 +34,7 @@ def app():
             st.rerun()
     with col4:
         if st.button("Empezar Nuevo Torneo"):
+            olvidar_torneo()
             for key in list(st.session_state.keys()):
                 del st.session_state[key]
             st.session_state.page = "home"
@@ -3,159 +3,31 @@ from assets.auth import check_login
 import os,importlib
 from assets.sidebar import sidebar_style
 from assets.helper_funcs import initialize_vars
+from assets.theme import aplicar_tema
+from assets.persistencia import restaurar_torneo
 st.set_page_config(page_title="PlayZone Padel App",page_icon=":tennis:", layout="wide")
 
-hide_streamlit_style = """
-    <style>
-    #MainMenu {visibility: hidden;}
-    footer {visibility: hidden;}
-    [data-testid="stSidebarNav"] {display: none;}
-    </style>
-"""
-st.markdown(hide_streamlit_style, unsafe_allow_html=True)
+# Una sola hoja de estilos por rerun (armada una vez por proceso en assets/theme.py)
+if "page" not in st.session_state:
+    st.session_state.page = "home"  # Start with the homepage    
+# ?ver=<id>: vista de espectadores, solo lectura y sin login
+if "ver" in st.query_params:
+    aplicar_tema("espectador")
+    importlib.import_module("pages.espectador").app()
+    st.stop()
 if not check_login():
+    aplicar_tema("login")
     st.stop()
+# Sesión nueva con ?torneo=<id> (refresh, reconexión, reinicio): se retoma desde la base
+restaurar_torneo()
+aplicar_tema(st.session_state.page, st.session_state.get("mod"))
 
 # Cargar la lista de páginas desde la carpeta "pages"
 pages_list = ["home"] + [f.replace(".py", "") for f in os.listdir("pages") if f.endswith(".py")]
-if "page" not in st.session_state:
-    st.session_state.page = "home"  # Start with the homepage    
 
 def load_page(page_name):
     if page_name == "home":
 
-        st.markdown("""
-        <style>
-        .main-title {
-            text-align: center;
-            font-size: 36px;
-            color: #6C13BF;
-            font-weight: 700;
-            margin-bottom: 50px;
-        }
-
-        /* === ALTURA UNIFORME PARA TODOS LOS INPUTS === */
-
-        /* Number Input Container - Forzar altura total */
-        .stNumberInput {
-            margin-bottom: 25px !important;
-        }
-
-        .stNumberInput > div {
-            height: 52px !important;
-            display: flex !important;
-            align-items: center !important;
-        }
-
-        /* Number Input - Campo de texto */
-        .stNumberInput input {
-            height: 52px !important;
-            min-height: 52px !important;
-            max-height: 52px !important;
-            width: 100% !important;
-            padding: 0 18px !important;
-            font-size: 20px !important;
-            border-radius: 10px !important;
-            background-color: #f7f7fb !important;
-            line-height: 52px !important;
-            box-sizing: border-box !important;
-        }
-
-        /* Number Input - Botones +/- */
-        .stNumberInput button {
-            height: 52px !important;
-            min-height: 52px !important;
-            max-height: 52px !important;
-            color: white !important;
-            display: flex !important;
-            align-items: center !important;
-            justify-content: center !important;
-        }
-
-        /* Contenedor de los botones */
-        .stNumberInput > div > div {
-            height: 52px !important;
-            display: flex !important;
-            align-items: stretch !important;
-        }
-
-        /* === SELECTBOX IGUALADOS === */
-        .stSelectbox {
-            margin-bottom: 25px !important;
-        }
-
-        div[data-baseweb="select"] {
-            height: 52px !important;
-            min-height: 52px !important;
-            max-height: 52px !important;
-        }
-
-        div[data-baseweb="select"] > div {
-            height: 52px !important;
-            min-height: 52px !important;
-            max-height: 52px !important;
-            padding: 0 18px !important;
-            font-size: 20px !important;
-            border-radius: 10px !important;
-            background-color: #f7f7fb !important;
-            display: flex !important;
-            align-items: center !important;
-            width: 100% !important;
-            box-sizing: border-box !important;
-        }
-
-        /* === LABELS MÁS GRANDES Y EN NEGRILLA === */
-        label, .stSelectbox label, .stNumberInput label {
-            font-size: 24px !important;
-            font-weight: 700 !important;
-            color: #0B0B19 !important;
-            margin-bottom: 6px !important;
-        }
-        
-        /* Forzar negrilla en todos los labels */
-        div[data-testid="stNumberInput"] label,
-        div[data-testid="stSelectbox"] label {
-            font-weight: 700 !important;
-        }
-
-        /* === RESUMEN DEL TORNEO === */
-        .tournament-summary {
-            background-color: #f0e6ff;
-            border-left: 4px solid #6C13BF;
-            border-radius: 8px;
-            padding: 20px 25px;
-            margin: 35px 0 25px 0;
-        }
-
-        .summary-text {
-            color: #0B0B19;
-            font-size: 18px;
-            line-height: 1.6;
-            margin: 0;
-        }
-
-        .summary-text strong {
-            color: #6C13BF;
-            font-weight: 700;
-        }
-
-        /* === BOTÓN === */
-        .stButton button {
-            width: 100%;
-            background-color: #0B0B19;
-            color: white;
-            font-weight: 700;
-            font-size: 18px;
-            padding: 1em;
-            border-radius: 10px;
-            margin-top: 20px;
-        }
-
-        div[data-testid="column"] { padding: 0 30px !important; } 
-        section.main > div { padding-top: 30px; }
-        </style>
-""", unsafe_allow_html=True)
-
         # Título centrado
         st.markdown('<div class="main-title">🏆 PlayZone Padel App</div>', unsafe_allow_html=True)
 